@@ -0,0 +1 @@
+"""Offline benchmarks run through the ``bench`` command."""
@@ -0,0 +1,290 @@
+"""Synthetic RSS/Atom feed server and an end-to-end ingest throughput benchmark.
+
+The server runs in its own process, so its CPU time does not compete with the ingest
+being measured. Feeds are generated deterministically from the seed; latency, error rate
+and ETag/304 handling are configurable per run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from pathlib import Path
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from xml.sax.saxutils import escape
+
+import requests
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..feeds.rss_reader import fetch_rss
+from ..metrics import METRICS, quantile
+from ..pipeline import PipelineOptions, run_pipeline
+from ..storage.db import init_db
+from ..storage.repository import upsert_articles
+from .serving import git_commit, serve_in_process
+from .storage import _VOCABULARY
+
+MODES = ("run", "ingest")
+_FEED_PATH = re.compile(r"^/feeds/(\d+)\.(xml|atom)$")
+_PUBLISHED_BASE = datetime(2025, 6, 30, 12, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True, frozen=True)
+class FeedServerConfig:
+    feeds: int = 200
+    items: int = 50
+    payload_bytes: int = 600
+    latency_ms: float = 50.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    # Fraction of feeds served as Atom instead of RSS 2.0.
+    atom_fraction: float = 0.25
+    # Send ETags and answer matching If-None-Match requests with 304.
+    etag: bool = True
+    seed: int = 0
+
+    def is_atom(self, index: int) -> bool:
+        return (index * 37 % 100) < self.atom_fraction * 100
+
+    def feed_url(self, base_url: str, index: int) -> str:
+        return f"{base_url}/feeds/{index}.{'atom' if self.is_atom(index) else 'xml'}"
+
+
+def _payload(rng: random.Random, size: int) -> str:
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(_VOCABULARY)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def render_feed(config: FeedServerConfig, index: int) -> bytes:
+    """Build feed ``index``: ``config.items`` entries, newest first, one hour apart."""
+    rng = random.Random(f"{config.seed}-{index}")
+    title = f"Synthetic feed {index}"
+    entries = []
+    for item in range(config.items):
+        link = f"https://feed-{index}.example/items/{item}"
+        published = _PUBLISHED_BASE - timedelta(hours=item)
+        entry_title = escape(" ".join(rng.choices(_VOCABULARY, k=6)).capitalize())
+        payload = _payload(rng, config.payload_bytes)
+        if config.is_atom(index):
+            entries.append(
+                f'<entry><title>{entry_title}</title><link href="{link}"/><id>{link}</id>'
+                f"<updated>{published.isoformat()}</updated><summary>{payload}</summary></entry>"
+            )
+        else:
+            entries.append(
+                f"<item><title>{entry_title}</title><link>{link}</link>"
+                f"<guid>synthetic-{index}-{item}</guid>"
+                f"<pubDate>{format_datetime(published)}</pubDate>"
+                f"<description>{payload}</description></item>"
+            )
+    if config.is_atom(index):
+        document = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<feed xmlns="http://www.w3.org/2005/Atom"><title>{title}</title>'
+            f"<id>https://feed-{index}.example/</id>"
+            f"<updated>{_PUBLISHED_BASE.isoformat()}</updated>{''.join(entries)}</feed>"
+        )
+    else:
+        document = (
+            '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+            f"<title>{title}</title><link>https://feed-{index}.example/</link>"
+            f"<description>{title}</description>{''.join(entries)}</channel></rss>"
+        )
+    return document.encode("utf-8")
+
+
+class FeedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: FeedServerConfig):
+        super().__init__(address, _FeedHandler)
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._bodies: dict[int, tuple[bytes, str]] = {}
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "bytes": 0}
+
+    def draw(self) -> tuple[float, bool]:
+        """Pick this request's delay in seconds and whether it fails."""
+        with self._lock:
+            delay = max(0.0, self._rng.gauss(self.config.latency_ms, self.config.jitter_ms))
+            return delay / 1000, self._rng.random() < self.config.error_rate
+
+    def body(self, index: int) -> tuple[bytes, str]:
+        with self._lock:
+            if index not in self._bodies:
+                data = render_feed(self.config, index)
+                self._bodies[index] = (data, f'"{hashlib.sha256(data).hexdigest()[:16]}"')
+            return self._bodies[index]
+
+    def count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += value
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    server: FeedServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/_stats":
+            stats = json.dumps(self.server.snapshot()).encode()
+            self._send(HTTPStatus.OK, stats, "application/json")
+            return
+        match = _FEED_PATH.match(self.path)
+        if match is None or int(match.group(1)) >= self.server.config.feeds:
+            self._send(HTTPStatus.NOT_FOUND, b"not found", "text/plain")
+            return
+
+        self.server.count("requests")
+        delay, fail = self.server.draw()
+        time.sleep(delay)
+        if fail:
+            self.server.count("errors")
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, b"injected failure", "text/plain")
+            return
+        body, etag = self.server.body(int(match.group(1)))
+        if self.server.config.etag and self.headers.get("If-None-Match") == etag:
+            self.server.count("not_modified")
+            self._send(HTTPStatus.NOT_MODIFIED, b"", None, etag)
+            return
+        self.server.count("ok")
+        self.server.count("bytes", len(body))
+        content_type = "application/atom+xml" if match.group(2) == "atom" else "application/rss+xml"
+        self._send(HTTPStatus.OK, body, content_type, etag if self.server.config.etag else None)
+
+    def _send(
+        self, status: int, body: bytes, content_type: str | None, etag: str | None = None
+    ) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere.
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _fetch_latencies(report: dict) -> list[float]:
+    # One feed_fetch timing per feed label; a feed fetched twice contributes its mean.
+    return sorted(
+        timing["total_seconds"] / timing["count"]
+        for timing in report["timings"]
+        if timing["name"] == "feed_fetch"
+    )
+
+
+def _ingest(
+    mode: str,
+    session_factory: sessionmaker[Session],
+    urls: list[str],
+    etags: dict[str, str],
+    fetch_concurrency: int,
+    timeout: int,
+) -> tuple[int, int, int]:
+    if mode == "ingest":
+        items = fetch_rss(urls, timeout=timeout, etags=etags)
+        with session_factory() as session:
+            new, duplicates = upsert_articles(session, items)
+        return len(items), new, duplicates
+    options = PipelineOptions(
+        urls=urls, fetch_concurrency=fetch_concurrency, timeout=timeout, etags=etags
+    )
+    result = asyncio.run(run_pipeline(session_factory, options))
+    return result.retrieved, result.new, result.duplicates
+
+
+def run_ingest_benchmark(
+    config: FeedServerConfig,
+    mode: str = "run",
+    db_path: Path | None = None,
+    fetch_concurrency: int = 8,
+    timeout: int = 15,
+) -> dict:
+    """Ingest every synthetic feed through ``mode`` and return throughput figures.
+
+    The figures describe the first, cold pass. With ETags enabled, a second pass revalidates
+    every feed with the stored ETags and is timed separately as ``revisit_seconds``.
+    """
+    with tempfile.TemporaryDirectory() as tmp, serve_in_process(FeedServer, config) as base_url:
+        session_factory = init_db(str(db_path or Path(tmp) / "bench.db"))
+        urls = [config.feed_url(base_url, index) for index in range(config.feeds)]
+        etags: dict[str, str] = {}
+        enabled_here = not METRICS.enabled
+        if enabled_here:
+            METRICS.enable()
+        started = time.perf_counter()
+        try:
+            retrieved, new, duplicates = _ingest(
+                mode, session_factory, urls, etags, fetch_concurrency, timeout
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            metrics = METRICS.report()
+            if enabled_here:
+                METRICS.disable()
+        revisit = None
+        if config.etag:
+            started = time.perf_counter()
+            _ingest(mode, session_factory, urls, etags, fetch_concurrency, timeout)
+            revisit = round(time.perf_counter() - started, 3)
+        server_stats = requests.get(f"{base_url}/_stats", timeout=timeout).json()
+        session_factory.kw["bind"].dispose()
+
+    latencies = _fetch_latencies(metrics)
+    failed = sum(c["value"] for c in metrics["counters"] if c["name"] == "feed_errors")
+    return {
+        "benchmark": "ingest",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "mode": mode,
+        "fetch_concurrency": fetch_concurrency if mode == "run" else 1,
+        "config": asdict(config),
+        "elapsed_seconds": round(elapsed, 3),
+        "revisit_seconds": revisit,
+        "feeds_ok": len(latencies) - int(failed),
+        "feeds_failed": int(failed),
+        "items_retrieved": retrieved,
+        "items_new": new,
+        "items_duplicate": duplicates,
+        "feeds_per_second": round(config.feeds / elapsed, 2),
+        "items_per_second": round(retrieved / elapsed, 2),
+        "fetch_p50_ms": round(quantile(latencies, 0.5) * 1000, 2) if latencies else None,
+        "fetch_p95_ms": round(quantile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "server": server_stats,
+    }
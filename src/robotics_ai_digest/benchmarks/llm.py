@@ -0,0 +1,308 @@
+"""Fake OpenAI-compatible Responses API and a summarization load test against it.
+
+The server answers ``POST /v1/responses`` like the real API, with log-normal latency,
+injected 5xx and 429 responses, an optional requests-per-minute limit (429 with
+``Retry-After``) and a share of outputs that are not the JSON the summarizer expects.
+It bills every 200 response, so the load test can compare what the provider would
+charge with the cost the summarizer reports.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import random
+import threading
+import time
+import uuid
+
+import openai
+import requests
+
+from ..metrics import quantile
+from ..summarization.cost_estimator import usage_cost
+from ..summarization.openai_summarizer import OpenAISummarizer
+from .serving import git_commit, serve_in_process
+from .storage import _VOCABULARY
+
+_RESPONSES_PATHS = ("/v1/responses", "/responses")
+
+
+@dataclass(slots=True, frozen=True)
+class FakeOpenAIConfig:
+    # Median latency; the spread is log-normal, so a few calls are much slower.
+    latency_ms: float = 400.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    # Requests per minute before answering 429; 0 disables the limit.
+    rpm: int = 0
+    invalid_rate: float = 0.0
+    seed: int = 0
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: FakeOpenAIConfig):
+        super().__init__(address, _FakeOpenAIHandler)
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        # Token bucket refilled at rpm/60 per second, holding at most one second of requests.
+        self._capacity = max(1.0, config.rpm / 60)
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+        self.stats = {
+            "requests": 0,
+            "ok": 0,
+            "invalid": 0,
+            "errors": 0,
+            "throttled": 0,
+            "rate_limited": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+        }
+
+    def admit(self) -> float:
+        """Take a rate-limit token; return 0, or the seconds until one is available."""
+        if not self.config.rpm:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            rate = self.config.rpm / 60
+            self._tokens = min(self._capacity, self._tokens + (now - self._refilled_at) * rate)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / rate
+
+    def draw(self) -> tuple[float, str]:
+        """Pick the delay in seconds and the outcome: ok, invalid, error or throttled."""
+        config = self.config
+        with self._lock:
+            delay = config.latency_ms * math.exp(self._rng.gauss(0, config.latency_sigma))
+            roll = self._rng.random()
+        outcome = "ok"
+        for name, rate in (
+            ("error", config.error_rate),
+            ("throttled", config.throttle_rate),
+            ("invalid", config.invalid_rate),
+        ):
+            if roll < rate:
+                outcome = name
+                break
+            roll -= rate
+        return delay / 1000, outcome
+
+    def summary_text(self) -> str:
+        with self._lock:
+            words = self._rng.choices(_VOCABULARY, k=90)
+            bullets = [" ".join(self._rng.choices(_VOCABULARY, k=8)) for _ in range(3)]
+        return json.dumps({"summary": " ".join(words), "bullets": bullets})
+
+    def count(self, **values: int) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self.stats[key] += value
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    server: FakeOpenAIServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/_stats":
+            self._json(HTTPStatus.OK, self.server.snapshot())
+        else:
+            self._error(HTTPStatus.NOT_FOUND, "not_found", "Unknown path")
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path not in _RESPONSES_PATHS:
+            self._error(HTTPStatus.NOT_FOUND, "not_found", "Unknown path")
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            self._error(HTTPStatus.BAD_REQUEST, "invalid_request_error", "Body is not JSON")
+            return
+
+        self.server.count(requests=1)
+        wait = self.server.admit()
+        if wait:
+            self.server.count(rate_limited=1)
+            self._error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "rate_limit_exceeded",
+                "Rate limit reached",
+                {"Retry-After": f"{wait:.3f}"},
+            )
+            return
+        delay, outcome = self.server.draw()
+        time.sleep(delay)
+        if outcome == "error":
+            self.server.count(errors=1)
+            self._error(HTTPStatus.INTERNAL_SERVER_ERROR, "server_error", "Injected failure")
+            return
+        if outcome == "throttled":
+            self.server.count(throttled=1)
+            self._error(HTTPStatus.TOO_MANY_REQUESTS, "rate_limit_exceeded", "Injected 429")
+            return
+
+        text = "Voici le resume demande." if outcome == "invalid" else self.server.summary_text()
+        prompt = f"{request.get('instructions') or ''}{request.get('input') or ''}"
+        input_tokens, output_tokens = _estimate_tokens(prompt), _estimate_tokens(text)
+        self.server.count(
+            ok=int(outcome == "ok"),
+            invalid=int(outcome == "invalid"),
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+        )
+        self._json(
+            HTTPStatus.OK,
+            _response_payload(request.get("model"), text, input_tokens, output_tokens),
+        )
+
+    def _json(self, status: int, payload: object, headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(
+        self, status: int, code: str, message: str, headers: dict[str, str] | None = None
+    ) -> None:
+        error = {"message": message, "type": code, "code": code, "param": None}
+        self._json(status, {"error": error}, headers)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+def _response_payload(model: str | None, text: str, input_tokens: int, output_tokens: int) -> dict:
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "status": "completed",
+        "model": model,
+        "output": [
+            {
+                "id": f"msg_{uuid.uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 0},
+        },
+    }
+
+
+def _failure_kind(exc: Exception) -> str:
+    cause = exc.__cause__
+    if isinstance(cause, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(cause, openai.APIStatusError):
+        return "server_error"
+    if isinstance(cause, (openai.APIConnectionError, openai.APITimeoutError)):
+        return "connection"
+    if isinstance(cause, ValueError):
+        return "invalid_output"
+    return "other"
+
+
+def _articles(count: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    return [
+        (
+            " ".join(rng.choices(_VOCABULARY, k=8)).capitalize(),
+            " ".join(rng.choices(_VOCABULARY, k=rng.randint(60, 300))),
+        )
+        for _ in range(count)
+    ]
+
+
+def run_summarize_load_test(
+    config: FakeOpenAIConfig,
+    requests_count: int = 200,
+    concurrency: int = 8,
+    model: str = "gpt-4.1-mini",
+    max_retries: int = 2,
+) -> dict:
+    """Summarize synthetic articles through ``OpenAISummarizer`` against a fake server."""
+    with serve_in_process(FakeOpenAIServer, config) as base_url:
+        summarizer = OpenAISummarizer(
+            model=model, base_url=f"{base_url}/v1", api_key="fake-key", max_retries=max_retries
+        )
+
+        def call(article: tuple[str, str]) -> tuple[float, float | None, str | None]:
+            started = time.perf_counter()
+            try:
+                result = summarizer.summarize(*article)
+            except Exception as exc:  # noqa: BLE001
+                return time.perf_counter() - started, None, _failure_kind(exc)
+            return time.perf_counter() - started, result["usage"]["cost_usd"], None
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            outcomes = list(pool.map(call, _articles(requests_count, config.seed)))
+        elapsed = time.perf_counter() - started
+        server = requests.get(f"{base_url}/_stats", timeout=10).json()
+
+    latencies = sorted(latency for latency, _, _ in outcomes)
+    failures: dict[str, int] = {}
+    for _, _, kind in outcomes:
+        if kind is not None:
+            failures[kind] = failures.get(kind, 0) + 1
+    completed = requests_count - sum(failures.values())
+    accounted = sum(cost for _, cost, _ in outcomes if cost is not None)
+    billed = usage_cost(server["input_tokens"], server["output_tokens"], model)
+    return {
+        "benchmark": "summarize",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "model": model,
+        "concurrency": concurrency,
+        "max_retries": max_retries,
+        "config": asdict(config),
+        "requests": requests_count,
+        "completed": completed,
+        "failures": failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "summaries_per_second": round(completed / elapsed, 2),
+        "latency_p50_ms": round(quantile(latencies, 0.5) * 1000, 1),
+        "latency_p95_ms": round(quantile(latencies, 0.95) * 1000, 1),
+        "latency_p99_ms": round(quantile(latencies, 0.99) * 1000, 1),
+        # HTTP attempts beyond one per summary, i.e. the client's automatic retries.
+        "retries": server["requests"] - requests_count,
+        "accounted_cost_usd": round(accounted, 6),
+        "billed_cost_usd": round(billed, 6),
+        "unaccounted_cost_usd": round(billed - accounted, 6),
+        "server": server,
+    }
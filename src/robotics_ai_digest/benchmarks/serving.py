@@ -0,0 +1,57 @@
+"""Run a benchmark HTTP server in a child process, away from the code being measured."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from http.server import HTTPServer
+import multiprocessing
+import subprocess
+
+# A server class taking ``(address, config)``; it must be importable for "spawn".
+ServerFactory = Callable[[tuple[str, int], object], HTTPServer]
+
+
+def _serve(
+    server_class: ServerFactory,
+    config: object,
+    host: str,
+    port: int,
+    ports: multiprocessing.Queue,
+) -> None:
+    server = server_class((host, port), config)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+@contextmanager
+def serve_in_process(
+    server_class: ServerFactory, config: object, host: str = "127.0.0.1", port: int = 0
+) -> Iterator[str]:
+    """Start ``server_class((host, port), config)`` in a spawned process; yield its base URL."""
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    process = context.Process(
+        target=_serve, args=(server_class, config, host, port, ports), daemon=True
+    )
+    process.start()
+    try:
+        yield f"http://{host}:{ports.get(timeout=60)}"
+    finally:
+        process.terminate()
+        process.join(timeout=5)
+
+
+def git_commit() -> str | None:
+    """Short hash of the checked-out commit, to tell results of different commits apart."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
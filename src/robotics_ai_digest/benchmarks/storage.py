@@ -0,0 +1,375 @@
+"""Repository query benchmarks against synthetic databases of 10k to 10M articles.
+
+Generated databases are deterministic for a given size and seed, and are cached in a data
+directory so runs on different commits time the same rows. Each run works on a copy, so the
+rows, aggregates and caches its upserts and digests write never reach the cached file. Every SQL statement an operation
+issues is checked with ``EXPLAIN QUERY PLAN``: a full scan of ``articles`` or
+``article_summaries``, or a sort where the operation should read an index in order,
+is reported as a plan problem.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+import json
+from pathlib import Path
+import platform
+import random
+import re
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..digest.output import write_daily_digest
+from ..storage.db import init_db
+from ..storage.models import Article, ArticleSummary
+from ..storage.repository import (
+    get_articles_for_date,
+    get_articles_missing_ai_summary,
+    get_recent_articles,
+    upsert_articles,
+)
+from .serving import git_commit
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+OPERATIONS = (
+    "upsert_articles",
+    "get_recent_articles",
+    "get_recent_articles_by_source",
+    "get_articles_for_date",
+    "get_articles_missing_ai_summary",
+    "write_daily_digest",
+)
+END_DATE = date(2025, 6, 30)
+HISTORY_DAYS = 3 * 365
+SOURCE_COUNT = 40
+SUMMARY_COVERAGE = 0.6
+UPSERT_BATCH = 200
+_ROW_BATCH = 5_000
+_NEW_LINK_PREFIX = "https://bench.invalid/new/"
+_VOCABULARY_TEXT = """
+    robot humanoid gripper manipulation policy diffusion transformer dataset benchmark
+    simulation sim2real locomotion quadruped drone autonomy perception lidar slam planning
+    control reinforcement learning imitation vision language model foundation agent
+    warehouse surgical exoskeleton actuator sensor tactile dexterous navigation mapping
+    open-source startup funding release paper safety evaluation hardware compute edge
+"""
+_VOCABULARY = _VOCABULARY_TEXT.split()
+# Bare scans of the big tables, as opposed to "SCAN articles USING INDEX ...".
+_FULL_SCAN = re.compile(r"^SCAN (articles|article_summaries)$")
+_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def parse_size(text: str) -> int:
+    """Parse ``10000``, ``10k`` or ``1m``."""
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+
+def _source_name(index: int) -> str:
+    return f"Source {index:02d}"
+
+
+def _synthetic_rows(count: int, seed: int) -> Iterator[tuple[dict, dict | None]]:
+    """Yield ``(article, summary)`` rows with Zipf-like sources and growing daily volume."""
+    rng = random.Random(seed)
+    sources = list(range(SOURCE_COUNT))
+    weights = [1 / (rank + 1) for rank in sources]
+    end = datetime(END_DATE.year, END_DATE.month, END_DATE.day, 23, 59, tzinfo=timezone.utc)
+    for article_id in range(1, count + 1):
+        source = rng.choices(sources, weights)[0]
+        # sqrt() skews towards recent days: volume grows linearly over the history.
+        days_back = HISTORY_DAYS * (1 - rng.random() ** 0.5)
+        published = end - timedelta(days=days_back, minutes=rng.randrange(24 * 60))
+        link = f"https://source-{source:02d}.example/articles/{article_id}"
+        article = {
+            "id": article_id,
+            "title": " ".join(rng.choices(_VOCABULARY, k=rng.randint(4, 10))).capitalize(),
+            "link": link,
+            "guid": link,
+            # A few feeds omit publication dates.
+            "published": None if rng.random() < 0.02 else published,
+            "summary": " ".join(rng.choices(_VOCABULARY, k=rng.randint(20, 60))),
+            "source": _source_name(source),
+            "created_at": published + timedelta(minutes=rng.randint(5, 600)),
+        }
+        # Older articles are mostly summarized; the last week is the pending backlog.
+        coverage = SUMMARY_COVERAGE if days_back > 7 else 0.1
+        summary = None
+        if rng.random() < coverage:
+            summary = {
+                "article_id": article_id,
+                "summary_ai": " ".join(rng.choices(_VOCABULARY, k=80)),
+                "bullets_ai": json.dumps(["Point one", "Point two", "Point three"]),
+                "summarized_at": article["created_at"] + timedelta(hours=1),
+                "input_tokens": rng.randint(200, 1200),
+                "output_tokens": rng.randint(150, 250),
+                "cost_usd": 0.0008,
+            }
+        yield article, summary
+
+
+def generate_database(db_path: Path, count: int, seed: int = 0) -> sessionmaker[Session]:
+    """Create (or reuse) a synthetic database with ``count`` articles."""
+    ready = db_path.with_suffix(".ready")
+    if ready.exists():
+        return init_db(str(db_path))
+    db_path.unlink(missing_ok=True)
+    session_factory = init_db(str(db_path))
+    engine: Engine = session_factory.kw["bind"]
+    articles: list[dict] = []
+    summaries: list[dict] = []
+
+    def flush(connection: Connection) -> None:
+        if articles:
+            connection.execute(insert(Article.__table__), articles)
+        if summaries:
+            connection.execute(insert(ArticleSummary.__table__), summaries)
+        articles.clear()
+        summaries.clear()
+
+    # Core bulk inserts skip the ingest-time aggregates; reopening below backfills them.
+    with engine.begin() as connection:
+        for article, summary in _synthetic_rows(count, seed):
+            articles.append(article)
+            if summary is not None:
+                summaries.append(summary)
+            if len(articles) >= _ROW_BATCH:
+                flush(connection)
+        flush(connection)
+        connection.exec_driver_sql("ANALYZE")
+    engine.dispose()
+    # Backfilled now, or the first reuse of the cached file would do it.
+    session_factory = init_db(str(db_path))
+    ready.touch()
+    return session_factory
+
+
+@dataclass(slots=True)
+class OperationResult:
+    size: int
+    operation: str
+    repeat: int
+    min_ms: float
+    median_ms: float
+    max_ms: float
+    rows: int
+    plan: list[str] = field(default_factory=list)
+    plan_problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.plan_problems
+
+
+@contextmanager
+def _capture_statements(engine: Engine) -> Iterator[list[tuple[str, object]]]:
+    statements: list[tuple[str, object]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, executemany) -> None:
+        # Only reads and INSERT ... SELECT have plans worth checking.
+        upper = statement.lstrip().upper()
+        if executemany or not (upper.startswith("SELECT") or " SELECT " in upper):
+            return
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def explain(engine: Engine, statements: list[tuple[str, object]]) -> list[str]:
+    """Return the query plan lines of each distinct captured statement."""
+    plan: list[str] = []
+    seen: set[str] = set()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for statement, parameters in statements:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan.extend(row[3] for row in cursor.fetchall())
+    finally:
+        connection.close()
+    return plan
+
+
+def plan_problems(plan: list[str], allow_sort: bool = True) -> list[str]:
+    problems = [line for line in plan if _FULL_SCAN.match(line)]
+    if not allow_sort:
+        problems.extend(line for line in plan if line == _SORT)
+    return problems
+
+
+def _busiest_day(session: Session) -> date:
+    day = func.date(Article.published)
+    # Reads the day index only; the window is the last month of the synthetic history.
+    stmt = (
+        select(day)
+        .where(day >= (END_DATE - timedelta(days=30)).isoformat())
+        .group_by(day)
+        .order_by(func.count().desc(), day.desc())
+        .limit(1)
+    )
+    return date.fromisoformat(session.scalar(stmt) or END_DATE.isoformat())
+
+
+def _new_items(offset: int) -> list[dict]:
+    published = datetime(END_DATE.year, END_DATE.month, END_DATE.day, 12, tzinfo=timezone.utc)
+    return [
+        {
+            "title": f"Benchmark article {offset + index}",
+            "link": f"{_NEW_LINK_PREFIX}{offset + index}",
+            "published": published,
+            "source": _source_name(index % SOURCE_COUNT),
+        }
+        for index in range(UPSERT_BATCH)
+    ]
+
+
+def _time(
+    session_factory: sessionmaker[Session],
+    size: int,
+    operation: str,
+    call: Callable[[Session, int], int],
+    repeat: int,
+    allow_sort: bool = True,
+) -> OperationResult:
+    engine: Engine = session_factory.kw["bind"]
+    timings: list[float] = []
+    rows = 0
+    with _capture_statements(engine) as statements:
+        for attempt in range(repeat):
+            with session_factory() as session:
+                started = time.perf_counter()
+                rows = call(session, attempt)
+                timings.append((time.perf_counter() - started) * 1000)
+    plan = explain(engine, statements)
+    return OperationResult(
+        size=size,
+        operation=operation,
+        repeat=repeat,
+        min_ms=round(min(timings), 3),
+        median_ms=round(statistics.median(timings), 3),
+        max_ms=round(max(timings), 3),
+        rows=rows,
+        plan=plan,
+        plan_problems=plan_problems(plan, allow_sort),
+    )
+
+
+def benchmark_database(
+    session_factory: sessionmaker[Session], size: int, repeat: int = 5
+) -> list[OperationResult]:
+    """Time every operation; upserts and digests write to the database, so pass a copy."""
+    with session_factory() as session:
+        day = _busiest_day(session)
+        stored_links = list(
+            session.scalars(select(Article.link).order_by(Article.id).limit(UPSERT_BATCH // 2))
+        )
+    busiest_source = _source_name(0)
+
+    def upsert(session: Session, attempt: int) -> int:
+        # Half new links, half links already stored.
+        items = _new_items(attempt * UPSERT_BATCH)
+        items[UPSERT_BATCH // 2 :] = [{"link": link, "source": "dup"} for link in stored_links]
+        new, duplicates = upsert_articles(session, items)
+        return new + duplicates
+
+    results = [
+        _time(session_factory, size, "upsert_articles", upsert, repeat),
+        _time(
+            session_factory,
+            size,
+            "get_recent_articles",
+            lambda session, _: len(get_recent_articles(session, limit=50)),
+            repeat,
+            allow_sort=False,
+        ),
+        _time(
+            session_factory,
+            size,
+            "get_recent_articles_by_source",
+            lambda session, _: len(get_recent_articles(session, limit=50, source=busiest_source)),
+            repeat,
+            allow_sort=False,
+        ),
+        _time(
+            session_factory,
+            size,
+            "get_articles_for_date",
+            lambda session, _: len(get_articles_for_date(session, day)),
+            repeat,
+        ),
+        _time(
+            session_factory,
+            size,
+            "get_articles_missing_ai_summary",
+            lambda session, _: len(get_articles_missing_ai_summary(session, limit=50)),
+            repeat,
+            allow_sort=False,
+        ),
+    ]
+    with tempfile.TemporaryDirectory(prefix="bench-digest-") as out_dir:
+
+        def render(session: Session, attempt: int) -> int:
+            # What the digest command runs: the first attempt renders every article, later
+            # ones reuse the fragments it cached, as scheduled runs do.
+            paths = write_daily_digest(session, day, Path(out_dir) / str(attempt))
+            return sum(path.stat().st_size for path in paths)
+
+        results.append(_time(session_factory, size, "write_daily_digest", render, repeat))
+    return results
+
+
+def _copy_database(source: Path, target: Path) -> None:
+    _remove_database(target)
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst)
+
+
+def _remove_database(path: Path) -> None:
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def run_storage_benchmarks(
+    sizes: list[int], data_dir: Path, repeat: int = 5, seed: int = 0
+) -> dict:
+    """Benchmark each size and return a JSON-serializable report."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    results: list[OperationResult] = []
+    for size in sizes:
+        cached = data_dir / f"synthetic_{size}_{seed}.db"
+        generate_database(cached, size, seed).kw["bind"].dispose()
+        work = cached.with_name(f"{cached.stem}.run.db")
+        _copy_database(cached, work)
+        session_factory = init_db(str(work))
+        try:
+            results.extend(benchmark_database(session_factory, size, repeat))
+        finally:
+            session_factory.kw["bind"].dispose()
+            _remove_database(work)
+    return {
+        "benchmark": "storage",
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "seed": seed,
+        "results": [{**asdict(result), "ok": result.ok} for result in results],
+    }
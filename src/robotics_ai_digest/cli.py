@@ -1,30 +1,161 @@
 import argparse
-from collections import OrderedDict
-from datetime import date
+import asyncio
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timedelta, timezone
 import json
 import os
+from http.server import ThreadingHTTPServer
 from pathlib import Path
+import sys
+from xml.etree import ElementTree
 
 from dotenv import load_dotenv
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
 
 from . import __version__
-from .digest.renderer_md import render_digest
+from .benchmarks.feeds import MODES, FeedServer, FeedServerConfig, run_ingest_benchmark
+from .benchmarks.llm import FakeOpenAIConfig, FakeOpenAIServer, run_summarize_load_test
+from .benchmarks.storage import parse_size, run_storage_benchmarks
+from .digest.manifest import DigestManifest
+from .digest.output import (
+    FORMATS,
+    PERIODS,
+    bucket_start,
+    digest_path,
+    period_bounds,
+    write_atomic,
+    write_daily_digest,
+    write_range_digests,
+)
+from .feeds.fulltext import MAX_SOURCE_CHARS, FetchOptions, PageCache, fetch_pages, source_text
+from .feeds.opml import parse_opml, render_opml
 from .feeds.rss_reader import fetch_rss
-from .storage.db import init_db
+from .feeds.snapshots import INDEX_NAME, ReplayStats, SnapshotWriter, replay_items
+from .feeds.sharding import parse_shard, select_shard
+from .metrics import METRICS
+from .pipeline import PipelineOptions, run_pipeline
+from .profiling import PROFILE_MODES, run_profiled, should_profile
+from .server import make_server
+from .storage.archive import archive_articles, archive_dir, archive_path, with_archives
+from .storage.db import compact_database, init_db
+from .storage.models import Article
 from .storage.repository import (
-    get_articles_for_date,
+    add_feeds,
+    get_articles_by_ids,
     get_articles_missing_ai_summary,
-    get_recent_articles,
+    get_feeds,
+    get_article_page,
+    get_changed_buckets,
+    get_summary_candidates,
     save_ai_summary,
+    set_feed_enabled,
     upsert_articles,
 )
+from .storage.search import rebuild_search_index, search_articles
+from .storage.stats import (
+    StatsRow,
+    get_daily_stats,
+    get_stats_by_source,
+    get_stats_total,
+    rebuild_stats,
+)
+from .storage.trending import get_trending_terms, rebuild_trending
 from .summarization.cost_estimator import (
     DEFAULT_EXPECTED_OUTPUT_TOKENS,
     count_tokens,
     estimate_api_cost,
 )
+from .summarization.extractive_summarizer import EXTRACTIVE_MODEL, ExtractiveSummarizer
 from .summarization.mock_summarizer import MockSummarizer
 from .summarization.openai_summarizer import OpenAISummarizer, build_summarization_prompt
+from .summarization.planner import (
+    DEFAULT_KEYWORDS,
+    PriorityWeights,
+    fit_to_budget,
+    plan_summaries,
+)
+from .summarization.router import ModelRouter, Route, parse_route
+from .summarization.summarizer import Summarizer
+from .transfer import TRANSFER_FORMATS, export_articles, import_articles, iter_import_records
+
+
+def _shard_arg(value: str) -> tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _formats_arg(value: str) -> tuple[str, ...]:
+    formats = tuple(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    unknown = [fmt for fmt in formats if fmt not in FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"expected a comma-separated subset of {','.join(FORMATS)}, got {value!r}"
+        )
+    return formats
+
+
+def _source_weight_arg(value: str) -> tuple[str, float]:
+    name, sep, weight = value.rpartition("=")
+    try:
+        if not sep or not name.strip():
+            raise ValueError
+        return name.strip(), float(weight)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected NAME=WEIGHT, got {value!r}") from exc
+
+
+def _route_arg(value: str) -> Route:
+    try:
+        return parse_route(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _add_feed_source_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--rss", nargs="+", default=None, help="RSS feed URLs (default: enabled registry feeds)"
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard_arg,
+        default=None,
+        help="Only crawl feeds in shard i of N (0-based, e.g. 0/4)",
+    )
+
+
+def _add_snapshot_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--snapshot-dir",
+        default=None,
+        help="Archive raw feed responses here for later 'ingest --replay'",
+    )
+
+
+def _add_page_fetch_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--page-cache", default="data/pages", help="Directory of cached article page text"
+    )
+    parser.add_argument(
+        "--page-concurrency", type=int, default=16, help="Concurrent article page downloads"
+    )
+    parser.add_argument(
+        "--per-host", type=int, default=2, help="Concurrent page downloads per host"
+    )
+    parser.add_argument(
+        "--host-delay",
+        type=float,
+        default=1.0,
+        help="Minimum seconds between requests to the same host",
+    )
+
+
+def _fetch_options(args: argparse.Namespace) -> FetchOptions:
+    return FetchOptions(
+        concurrency=args.page_concurrency, per_host=args.per_host, host_delay=args.host_delay
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -32,6 +163,32 @@ def build_parser() -> argparse.ArgumentParser:
         prog="robotics_ai_digest",
         description="CLI for the robotics-ai-digest portfolio project.",
     )
+    parser.add_argument(
+        "--metrics-json", default=None, help="Write per-stage timings and counters as JSON"
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        default=None,
+        help="Write per-stage metrics as a Prometheus textfile (node_exporter collector)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile the command with cProfile (cpu), tracemalloc (memory) or both (all)",
+    )
+    parser.add_argument(
+        "--profile-dir", default="profiles", help="Directory for .pstats files and summaries"
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=20, help="Hotspots and allocation sites to list"
+    )
+    parser.add_argument(
+        "--profile-sample",
+        type=float,
+        default=1.0,
+        help="Fraction of runs to profile, e.g. 0.1 from cron",
+    )
     subparsers = parser.add_subparsers(dest="command")
 
     subparsers.add_parser("version", help="Show package version")
@@ -39,60 +196,473 @@ def build_parser() -> argparse.ArgumentParser:
     fetch_parser.add_argument("--rss", nargs="+", required=True, help="RSS feed URLs")
     ingest_parser = subparsers.add_parser("ingest", help="Fetch RSS and persist new items")
     ingest_parser.add_argument("--db", required=True, help="Path to SQLite database")
-    ingest_parser.add_argument("--rss", nargs="+", required=True, help="RSS feed URLs")
+    _add_feed_source_args(ingest_parser)
+    _add_snapshot_arg(ingest_parser)
+    ingest_parser.add_argument(
+        "--replay",
+        default=None,
+        help="Ingest archived responses from this snapshot directory instead of fetching",
+    )
+    ingest_parser.add_argument(
+        "--replay-from", default=None, help="Replay responses fetched at/after this ISO time"
+    )
+    ingest_parser.add_argument(
+        "--replay-to", default=None, help="Replay responses fetched before this ISO time"
+    )
     list_parser = subparsers.add_parser("list", help="List recent stored articles")
     list_parser.add_argument("--db", required=True, help="Path to SQLite database")
     list_parser.add_argument("--limit", type=int, default=10, help="Maximum number of articles to show")
     list_parser.add_argument("--source", default=None, help="Filter by source name")
+    list_parser.add_argument(
+        "--cursor", default=None, help="Continue after a previous page's 'Next cursor'"
+    )
     run_parser = subparsers.add_parser("run", help="Ingest RSS feeds then list recent articles")
     run_parser.add_argument("--db", required=True, help="Path to SQLite database")
-    run_parser.add_argument("--rss", nargs="+", required=True, help="RSS feed URLs")
+    _add_feed_source_args(run_parser)
+    _add_snapshot_arg(run_parser)
     run_parser.add_argument("--limit", type=int, default=10, help="Maximum number of articles to show")
     run_parser.add_argument("--source", default=None, help="Filter by source name")
+    run_parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run fetch/parse/upsert/summarize/digest as concurrent asyncio stages",
+    )
+    run_parser.add_argument(
+        "--concurrency", type=int, default=8, help="Concurrent feed downloads (with --pipeline)"
+    )
+    run_parser.add_argument(
+        "--summarize", action="store_true", help="Summarize new articles (with --pipeline)"
+    )
+    run_parser.add_argument("--model", default="gpt-4.1-mini", help="OpenAI model name")
+    run_parser.add_argument(
+        "--base-url", default=None, help="OpenAI-compatible API base URL, e.g. a local fake"
+    )
+    run_parser.add_argument(
+        "--full-text",
+        action="store_true",
+        help="Summarize full article pages instead of feed teasers (with --summarize)",
+    )
+    _add_page_fetch_args(run_parser)
+    run_parser.add_argument(
+        "--digest-out", default=None, help="Render the day's digest here (with --pipeline)"
+    )
+    run_parser.add_argument(
+        "--digest-date", default=None, help="Digest date in YYYY-MM-DD format (default: today)"
+    )
     digest_parser = subparsers.add_parser("digest", help="Generate markdown digest for a given date")
     digest_parser.add_argument("--db", required=True, help="Path to SQLite database")
-    digest_parser.add_argument("--date", required=True, help="Date in YYYY-MM-DD format")
+    digest_parser.add_argument("--date", default=None, help="Date in YYYY-MM-DD format")
     digest_parser.add_argument("--out", required=True, help="Output directory for markdown digest")
+    digest_parser.add_argument(
+        "--from", dest="date_from", default=None, help="Range start (YYYY-MM-DD), with --to"
+    )
+    digest_parser.add_argument(
+        "--to", dest="date_to", default=None, help="Range end (YYYY-MM-DD), inclusive"
+    )
+    digest_parser.add_argument(
+        "--period",
+        choices=PERIODS,
+        default="day",
+        help="One digest per day, ISO week or month (range mode)",
+    )
+    digest_parser.add_argument(
+        "--workers", type=int, default=None, help="Render processes (default: CPU count)"
+    )
+    digest_parser.add_argument(
+        "--changed-since",
+        default=None,
+        help="Only rebuild dates with articles ingested or summarized since this ISO time (UTC)",
+    )
+    digest_parser.add_argument(
+        "--force", action="store_true", help="Rewrite digests even if their rows are unchanged"
+    )
+    digest_parser.add_argument(
+        "--format",
+        dest="formats",
+        type=_formats_arg,
+        default=("md",),
+        help="Comma-separated output formats rendered in one pass: md, html, json (JSON Feed)",
+    )
+    digest_parser.add_argument(
+        "--trending",
+        type=int,
+        default=0,
+        help="Add a Trending section with this many rising terms (default: off)",
+    )
+    trending_parser = subparsers.add_parser("trending", help="Show the top rising terms")
+    trending_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    trending_parser.add_argument(
+        "--date", default=None, help="Last day of the window, YYYY-MM-DD (default: today)"
+    )
+    trending_parser.add_argument("--days", type=int, default=1, help="Window length in days")
+    trending_parser.add_argument("--limit", type=int, default=10, help="Number of terms")
+    trending_parser.add_argument(
+        "--rebuild", action="store_true", help="Recount terms over all stored articles first"
+    )
     summarize_parser = subparsers.add_parser(
         "summarize", help="Generate AI summaries for articles missing them"
     )
     summarize_parser.add_argument("--db", required=True, help="Path to SQLite database")
-    summarize_parser.add_argument("--limit", type=int, default=10, help="Maximum number of articles")
+    summarize_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of articles (default: 10, or no cap with --budget-usd)",
+    )
     summarize_parser.add_argument("--model", default="gpt-4.1-mini", help="OpenAI model name")
+    summarize_parser.add_argument(
+        "--base-url", default=None, help="OpenAI-compatible API base URL, e.g. a local fake"
+    )
     summarize_parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Estimate token usage/cost only, without API calls or DB writes",
     )
+    summarize_parser.add_argument(
+        "--full-text",
+        action="store_true",
+        help="Fetch article pages (cached) and summarize their main text, not feed teasers",
+    )
+    _add_page_fetch_args(summarize_parser)
+    summarize_parser.add_argument(
+        "--route",
+        type=_route_arg,
+        action="append",
+        default=[],
+        metavar="MODEL[<=TOKENS][@SOURCE,...]",
+        help="Send matching articles to MODEL ('extractive' skips the API); first match wins, "
+        "unmatched articles use --model (repeatable)",
+    )
+    summarize_parser.add_argument(
+        "--budget-usd",
+        type=float,
+        default=None,
+        help="Pick the highest-priority articles whose estimated total cost fits this cap",
+    )
+    summarize_parser.add_argument(
+        "--source-weight",
+        type=_source_weight_arg,
+        action="append",
+        default=[],
+        metavar="NAME=WEIGHT",
+        help="Priority multiplier for one source with --budget-usd (repeatable)",
+    )
+    summarize_parser.add_argument(
+        "--keywords",
+        default=None,
+        help="Comma-separated title keywords that raise priority with --budget-usd",
+    )
+    summarize_parser.add_argument(
+        "--half-life-days",
+        type=float,
+        default=3.0,
+        help="Days for an article's recency priority to halve with --budget-usd",
+    )
+    enrich_parser = subparsers.add_parser(
+        "enrich", help="Prefetch full article pages for articles awaiting a summary"
+    )
+    enrich_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    enrich_parser.add_argument(
+        "--limit", type=int, default=1000, help="Maximum number of articles"
+    )
+    _add_page_fetch_args(enrich_parser)
     summaries_parser = subparsers.add_parser(
         "summaries", help="Show stored AI summaries from the database"
     )
     summaries_parser.add_argument("--db", required=True, help="Path to SQLite database")
     summaries_parser.add_argument("--limit", type=int, default=10, help="Maximum number of summaries")
+    summaries_parser.add_argument(
+        "--cursor", default=None, help="Continue after a previous page's 'Next cursor'"
+    )
+    search_parser = subparsers.add_parser("search", help="Full-text search stored articles")
+    search_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    search_parser.add_argument(
+        "--query", required=True, help='FTS5 query, e.g. humanoid OR "diffusion policy"'
+    )
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum number of results")
+    search_parser.add_argument("--source", default=None, help="Filter by source name")
+    search_parser.add_argument("--from", dest="date_from", default=None, help="YYYY-MM-DD")
+    search_parser.add_argument("--to", dest="date_to", default=None, help="YYYY-MM-DD")
+    search_parser.add_argument(
+        "--rebuild", action="store_true", help="Rebuild the search index before querying"
+    )
+    feeds_parser = subparsers.add_parser("feeds", help="Manage the feed registry")
+    feeds_subparsers = feeds_parser.add_subparsers(dest="feeds_command", required=True)
+    feeds_list_parser = feeds_subparsers.add_parser("list", help="List registered feeds")
+    feeds_list_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    feeds_add_parser = feeds_subparsers.add_parser("add", help="Register feed URLs")
+    feeds_add_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    feeds_add_parser.add_argument("--rss", nargs="+", required=True, help="RSS feed URLs")
+    feeds_import_parser = feeds_subparsers.add_parser("import", help="Import feeds from OPML")
+    feeds_import_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    feeds_import_parser.add_argument("--opml", required=True, help="Path to OPML file")
+    feeds_export_parser = feeds_subparsers.add_parser("export", help="Export feeds to OPML")
+    feeds_export_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    feeds_export_parser.add_argument("--out", required=True, help="Output OPML file path")
+    for action in ("enable", "disable"):
+        toggle_parser = feeds_subparsers.add_parser(action, help=f"{action.capitalize()} a feed")
+        toggle_parser.add_argument("--db", required=True, help="Path to SQLite database")
+        toggle_parser.add_argument("--url", required=True, help="Registered feed URL")
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show article, summary coverage and cost totals"
+    )
+    stats_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    stats_parser.add_argument(
+        "--days", type=int, default=7, help="Per-day rows to show, counting back from today"
+    )
+    stats_parser.add_argument("--source", default=None, help="Filter by source name")
+    stats_parser.add_argument("--json", action="store_true", help="Print JSON for dashboards")
+    stats_parser.add_argument(
+        "--rebuild", action="store_true", help="Recompute the aggregates from scratch first"
+    )
+    serve_parser = subparsers.add_parser("serve", help="Serve articles and digests over HTTP")
+    serve_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    serve_parser.add_argument(
+        "--cache-size", type=int, default=256, help="Cached responses kept between DB changes"
+    )
+    serve_parser.add_argument("--verbose", action="store_true", help="Log every request")
+    archive_parser = subparsers.add_parser(
+        "archive", help="Move old articles into per-month archive databases"
+    )
+    archive_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    archive_parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=365,
+        help="Archive articles published more than this many days ago",
+    )
+    archive_parser.add_argument(
+        "--dry-run", action="store_true", help="Only print what would be archived"
+    )
+    compact_parser = subparsers.add_parser(
+        "compact", help="ANALYZE and VACUUM the database to keep it small and fast"
+    )
+    compact_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    compact_parser.add_argument(
+        "--analyze-only", action="store_true", help="Refresh planner statistics without VACUUM"
+    )
+    compact_parser.add_argument(
+        "--archives", action="store_true", help="Compact the monthly archive databases too"
+    )
+    export_parser = subparsers.add_parser(
+        "export", help="Stream articles and summaries to NDJSON, CSV or Parquet"
+    )
+    export_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    export_parser.add_argument(
+        "--out", required=True, help="Output file; a .gz suffix compresses NDJSON/CSV"
+    )
+    export_parser.add_argument(
+        "--format",
+        choices=TRANSFER_FORMATS,
+        help="Output format (default: from the file name, else ndjson)",
+    )
+    export_parser.add_argument(
+        "--since",
+        help="Only articles ingested or summarized at/after this ISO datetime (UTC if naive)",
+    )
+    export_parser.add_argument(
+        "--watermark-file",
+        help="Read --since from this file when not given, and store the new watermark in it",
+    )
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk-load articles and summaries from an export file"
+    )
+    import_parser.add_argument("--db", required=True, help="Path to SQLite database")
+    import_parser.add_argument("--in", dest="input", required=True, help="Export file to load")
+    import_parser.add_argument(
+        "--format",
+        choices=TRANSFER_FORMATS,
+        help="Input format (default: from the file name, else ndjson)",
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=500, help="Rows inserted per transaction"
+    )
+    bench_parser = subparsers.add_parser("bench", help="Run offline performance benchmarks")
+    bench_subparsers = bench_parser.add_subparsers(dest="bench_command", required=True)
+    storage_bench_parser = bench_subparsers.add_parser(
+        "storage", help="Time repository queries on synthetic databases"
+    )
+    storage_bench_parser.add_argument(
+        "--sizes",
+        default="10k,100k,1m,10m",
+        help="Comma-separated article counts, e.g. 10k,100k,1m",
+    )
+    storage_bench_parser.add_argument(
+        "--data-dir", default="data/bench", help="Where generated databases are cached"
+    )
+    storage_bench_parser.add_argument("--repeat", type=int, default=5, help="Runs per operation")
+    storage_bench_parser.add_argument("--seed", type=int, default=0, help="Data generator seed")
+    storage_bench_parser.add_argument(
+        "--out", default=None, help="Write the JSON results here for comparison across commits"
+    )
+    ingest_bench_parser = bench_subparsers.add_parser(
+        "ingest", help="Measure ingest throughput against a local synthetic feed server"
+    )
+    ingest_bench_parser.add_argument(
+        "--mode", choices=MODES, default="run", help="Pipelined 'run' or sequential 'ingest'"
+    )
+    ingest_bench_parser.add_argument(
+        "--concurrency", type=int, default=8, help="Parallel downloads in 'run' mode"
+    )
+    ingest_bench_parser.add_argument(
+        "--db", default=None, help="Ingest into this database (default: a fresh temporary one)"
+    )
+    ingest_bench_parser.add_argument("--out", default=None, help="Write the JSON results here")
+    feed_server_parser = bench_subparsers.add_parser(
+        "feed-server", help="Serve synthetic feeds at /feeds/<n>.xml|.atom until interrupted"
+    )
+    feed_server_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    feed_server_parser.add_argument("--port", type=int, default=8001, help="Bind port")
+    for feed_parser in (ingest_bench_parser, feed_server_parser):
+        feed_parser.add_argument("--feeds", type=int, default=200, help="Number of feeds")
+        feed_parser.add_argument("--items", type=int, default=50, help="Items per feed")
+        feed_parser.add_argument(
+            "--payload-bytes", type=int, default=600, help="Description size per item"
+        )
+        feed_parser.add_argument(
+            "--latency-ms", type=float, default=50.0, help="Mean response delay"
+        )
+        feed_parser.add_argument(
+            "--jitter-ms", type=float, default=20.0, help="Standard deviation of the delay"
+        )
+        feed_parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Fraction of requests answered 503"
+        )
+        feed_parser.add_argument(
+            "--atom-fraction", type=float, default=0.25, help="Fraction of feeds served as Atom"
+        )
+        feed_parser.add_argument(
+            "--no-etag", action="store_true", help="Disable ETag headers and 304 responses"
+        )
+        feed_parser.add_argument("--seed", type=int, default=0, help="Content generator seed")
+    llm_bench_parser = bench_subparsers.add_parser(
+        "summarize", help="Load-test OpenAISummarizer against a local fake OpenAI server"
+    )
+    llm_bench_parser.add_argument("--requests", type=int, default=200, help="Summaries to request")
+    llm_bench_parser.add_argument("--concurrency", type=int, default=8, help="Parallel requests")
+    llm_bench_parser.add_argument("--model", default="gpt-4.1-mini", help="Model name to price")
+    llm_bench_parser.add_argument(
+        "--max-retries", type=int, default=2, help="Client retries on 429/5xx"
+    )
+    llm_bench_parser.add_argument("--out", default=None, help="Write the JSON results here")
+    llm_server_parser = bench_subparsers.add_parser(
+        "llm-server", help="Serve a fake OpenAI Responses API until interrupted"
+    )
+    llm_server_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    llm_server_parser.add_argument("--port", type=int, default=8002, help="Bind port")
+    for llm_parser in (llm_bench_parser, llm_server_parser):
+        llm_parser.add_argument(
+            "--latency-ms", type=float, default=400.0, help="Median response delay"
+        )
+        llm_parser.add_argument(
+            "--latency-sigma", type=float, default=0.5, help="Log-normal spread of the delay"
+        )
+        llm_parser.add_argument(
+            "--error-rate", type=float, default=0.0, help="Fraction of requests answered 500"
+        )
+        llm_parser.add_argument(
+            "--throttle-rate", type=float, default=0.0, help="Fraction answered 429 at random"
+        )
+        llm_parser.add_argument(
+            "--rpm", type=int, default=0, help="Requests per minute before 429 (0: unlimited)"
+        )
+        llm_parser.add_argument(
+            "--invalid-rate", type=float, default=0.0, help="Fraction of non-JSON outputs"
+        )
+        llm_parser.add_argument("--seed", type=int, default=0, help="Random seed")
 
     return parser
 
 
+def _resolve_feed_urls(
+    args: argparse.Namespace, session_factory: sessionmaker[Session]
+) -> list[str] | None:
+    """Return the feed URLs for this run, or None when no feed source is configured."""
+    if args.rss:
+        urls = list(args.rss)
+    else:
+        with session_factory() as session:
+            urls = [feed.url for feed in get_feeds(session, enabled_only=True)]
+        if not urls:
+            return None
+    if args.shard is not None:
+        index, total = args.shard
+        urls = select_shard(urls, index, total)
+    return urls
+
+
 def handler_ingest(args: argparse.Namespace) -> int:
+    if getattr(args, "replay", None):
+        return _replay_ingest(args)
     try:
         session_factory = init_db(args.db)
-        items = fetch_rss(args.rss)
+        urls = _resolve_feed_urls(args, session_factory)
+        if urls is None:
+            print("No feeds to ingest. Pass --rss or register feeds with 'feeds add/import'.")
+            return 1
+        if args.snapshot_dir:
+            with SnapshotWriter(Path(args.snapshot_dir)) as snapshots:
+                items = fetch_rss(urls, snapshots=snapshots)
+        else:
+            items = fetch_rss(urls)
         with session_factory() as session:
             nb_new, nb_duplicates = upsert_articles(session, items)
     except Exception as exc:  # noqa: BLE001
         print(f"Ingestion failed: {exc}")
         return 1
 
+    print(f"Feeds: {len(urls)}")
     print(f"Total retrieved: {len(items)}")
     print(f"New: {nb_new}")
     print(f"Duplicates: {nb_duplicates}")
     return 0
 
 
-def handler_list(args: argparse.Namespace) -> int:
+def _replay_ingest(args: argparse.Namespace) -> int:
+    try:
+        since = datetime.fromisoformat(args.replay_from) if args.replay_from else None
+        until = datetime.fromisoformat(args.replay_to) if args.replay_to else None
+    except ValueError:
+        print("Invalid --replay-from/--replay-to. Use an ISO datetime, e.g. 2025-02-10T06:00:00.")
+        return 1
+    root = Path(args.replay)
+    if not (root / INDEX_NAME).exists():
+        print(f"No snapshot index found in {root}")
+        return 1
+
     session_factory = init_db(args.db)
+    stats = ReplayStats()
+    new = duplicates = 0
+    urls = set(args.rss) if args.rss else None
     with session_factory() as session:
-        articles = get_recent_articles(session, limit=args.limit, source=args.source)
+        for items in replay_items(root, since, until, urls, stats=stats, shard=args.shard):
+            batch_new, batch_duplicates = upsert_articles(session, items)
+            new += batch_new
+            duplicates += batch_duplicates
+
+    print(f"Snapshots: {stats.snapshots} ({stats.failed} failed)")
+    print(f"Total retrieved: {stats.retrieved}")
+    print(f"New: {new}")
+    print(f"Duplicates: {duplicates}")
+    return 0
+
+
+def handler_list(args: argparse.Namespace) -> int:
+    session_factory = init_db(args.db)
+    try:
+        with session_factory() as session:
+            page = get_article_page(
+                session,
+                limit=args.limit,
+                source=args.source,
+                cursor=getattr(args, "cursor", None),
+            )
+    except ValueError as exc:
+        print(str(exc))
+        return 1
+    articles = page.rows
 
     print(f"Showing {len(articles)} most recent articles")
     if not articles:
@@ -101,8 +671,7 @@ def handler_list(args: argparse.Namespace) -> int:
 
     grouped: OrderedDict[tuple[str, str], list[str]] = OrderedDict()
     for article in articles:
-        dt = article.published or article.created_at
-        date_label = dt.date().isoformat()
+        date_label = article.effective_at.date().isoformat()
         key = (date_label, article.source)
         grouped.setdefault(key, []).append(article.title)
 
@@ -110,6 +679,8 @@ def handler_list(args: argparse.Namespace) -> int:
         print(f"[{date_label}] {source_name}")
         for title in titles:
             print(f"  - {title}")
+    if page.next_cursor:
+        print(f"Next cursor: {page.next_cursor}")
     return 0
 
 
@@ -119,7 +690,10 @@ def handler_run(args: argparse.Namespace) -> int:
         db_parent.mkdir(parents=True, exist_ok=True)
 
     print(f"Ingesting feeds into {args.db}...")
-    ingest_code = handler_ingest(args)
+    if args.pipeline:
+        ingest_code = _run_pipeline(args)
+    else:
+        ingest_code = handler_ingest(args)
     if ingest_code != 0:
         return ingest_code
 
@@ -127,48 +701,202 @@ def handler_run(args: argparse.Namespace) -> int:
     return handler_list(args)
 
 
+def _run_pipeline(args: argparse.Namespace) -> int:
+    try:
+        digest_date = (
+            date.fromisoformat(args.digest_date)
+            if args.digest_date
+            else datetime.now(timezone.utc).date()
+        )
+    except ValueError:
+        print("Invalid date format. Use YYYY-MM-DD.")
+        return 1
+
+    try:
+        session_factory = init_db(args.db)
+        urls = _resolve_feed_urls(args, session_factory)
+        if urls is None:
+            print("No feeds to ingest. Pass --rss or register feeds with 'feeds add/import'.")
+            return 1
+        if args.summarize:
+            load_dotenv()
+        options = PipelineOptions(
+            urls=urls,
+            fetch_concurrency=args.concurrency,
+            summarizer=_build_summarizer(args.model, args.base_url) if args.summarize else None,
+            digest_date=digest_date,
+            digest_out=Path(args.digest_out) if args.digest_out else None,
+            page_cache=PageCache(Path(args.page_cache)) if args.full_text else None,
+            page_fetch=_fetch_options(args),
+            snapshots=SnapshotWriter(Path(args.snapshot_dir)) if args.snapshot_dir else None,
+        )
+        try:
+            result = asyncio.run(run_pipeline(session_factory, options))
+        finally:
+            if options.snapshots is not None:
+                options.snapshots.close()
+    except Exception as exc:  # noqa: BLE001
+        print(f"Pipeline failed: {exc}")
+        return 1
+
+    print(f"Feeds: {len(urls)} ({result.feeds_failed} failed)")
+    print(f"Total retrieved: {result.retrieved}")
+    print(f"New: {result.new}")
+    print(f"Duplicates: {result.duplicates}")
+    if args.summarize:
+        print(f"Summarized: {result.summarized} ({result.summarize_failures} failed)")
+    if result.pages is not None:
+        pages = result.pages
+        print(f"Pages: {pages.fetched} fetched, {pages.cached} cached, {pages.failed} failed")
+    if result.digest_path is not None:
+        print(f"Digest: {result.digest_path}")
+    return 1 if result.summarize_failures else 0
+
+
+def _optional_date(value: str | None) -> date | None:
+    return date.fromisoformat(value) if value else None
+
+
 def handler_digest(args: argparse.Namespace) -> int:
+    if bool(args.date_from) != bool(args.date_to) or (args.date and args.date_from):
+        print("Pass either --date or both --from and --to.")
+        return 1
+    if not (args.date or args.date_from or args.changed_since):
+        print("Pass --date, --from/--to or --changed-since.")
+        return 1
     try:
-        target_date = date.fromisoformat(args.date)
+        start = _optional_date(args.date or args.date_from)
+        end = _optional_date(args.date or args.date_to)
+        since = datetime.fromisoformat(args.changed_since) if args.changed_since else None
     except ValueError:
         print("Invalid date format. Use YYYY-MM-DD.")
         return 1
+    if start and end and start > end:
+        print("--from must not be after --to.")
+        return 1
 
+    session_factory = init_db(args.db)
     out_dir = Path(args.out)
-    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = None if args.force else DigestManifest.load(out_dir)
+    changed = None
+    if since is not None:
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        with session_factory() as session:
+            changed = get_changed_buckets(session, since, args.period)
+        if not changed:
+            print(f"No digests changed since {args.changed_since}")
+            return 0
+        start = start or bucket_start(args.period, min(changed))
+        end = end or bucket_start(args.period, max(changed))
 
-    session_factory = init_db(args.db)
-    with session_factory() as session:
-        articles = get_articles_for_date(session, target_date)
+    bounds = period_bounds(args.period, start, end)
+    with with_archives(session_factory, args.db, *bounds) as archived, archived() as session:
+        if since is None and args.period == "day" and start == end:
+            written = write_daily_digest(
+                session,
+                start,
+                out_dir,
+                manifest=manifest,
+                formats=args.formats,
+                trending=args.trending,
+            )
+            if not written:
+                for fmt in args.formats:
+                    print(f"Unchanged: {digest_path(out_dir, start.isoformat(), fmt)}")
+            for output_path in written:
+                print(str(output_path))
+            return 0
 
-    content = render_digest(target_date, articles)
-    output_path = out_dir / f"digest_{target_date.isoformat()}.md"
-    output_path.write_text(content, encoding="utf-8")
-    print(str(output_path))
+        result = write_range_digests(
+            session,
+            start,
+            end,
+            out_dir,
+            period=args.period,
+            workers=args.workers,
+            manifest=manifest,
+            buckets=changed,
+            formats=args.formats,
+            trending=args.trending,
+        )
+    for output_path in result.written:
+        print(str(output_path))
+    print(f"Generated {len(result.written)} digests ({len(result.skipped)} unchanged)")
     return 0
 
 
+def _build_summarizer(model: str, base_url: str | None = None) -> Summarizer:
+    if base_url:
+        # Local stand-ins ignore the key, but the client insists on one.
+        return OpenAISummarizer(
+            model=model, base_url=base_url, api_key=os.getenv("OPENAI_API_KEY") or "local"
+        )
+    if os.getenv("OPENAI_API_KEY"):
+        return OpenAISummarizer(model=model)
+    print("Warning: OPENAI_API_KEY not set. Using MockSummarizer.")
+    return MockSummarizer()
+
+
 def handler_summarize(args: argparse.Namespace) -> int:
     load_dotenv()
-    api_key = os.getenv("OPENAI_API_KEY")
 
+    if args.budget_usd is not None and args.budget_usd <= 0:
+        print("Error: --budget-usd must be positive")
+        return 1
+
+    router = ModelRouter(args.route, args.model)
     session_factory = init_db(args.db)
     with session_factory() as session:
-        articles = get_articles_missing_ai_summary(session, limit=args.limit)
+        if args.budget_usd is None:
+            articles = get_articles_missing_ai_summary(
+                session, limit=10 if args.limit is None else args.limit
+            )
+        else:
+            articles = _plan_budget(args, session, router)
 
     if not articles:
         print("No articles to summarize.")
         return 0
 
-    estimated_input_tokens = 0
-    expected_output_tokens_total = 0
-    estimated_cost_total = 0.0
-    for article in articles:
-        source_text = article.summary or article.title
-        prompt = build_summarization_prompt(article.title, source_text)
-        estimated_input_tokens += count_tokens(prompt, model=args.model)
-        expected_output_tokens_total += DEFAULT_EXPECTED_OUTPUT_TOKENS
-        estimated_cost_total += estimate_api_cost(prompt, model=args.model)
+    pages: dict[str, str] = {}
+    if args.full_text:
+        pages = _fetch_article_pages(args, [article.link for article in articles])
+    texts = {
+        article.id: source_text(article.title, article.summary, pages.get(article.link))
+        for article in articles
+    }
+
+    prompts = {
+        article.id: build_summarization_prompt(article.title, texts[article.id])
+        for article in articles
+    }
+    tokens = {
+        article.id: count_tokens(prompts[article.id], model=args.model) for article in articles
+    }
+    models = {
+        article.id: router.model_for(tokens[article.id], article.source) for article in articles
+    }
+    costs = {
+        article.id: 0.0
+        if models[article.id] == EXTRACTIVE_MODEL
+        else estimate_api_cost(prompts[article.id], model=models[article.id])
+        for article in articles
+    }
+    if args.budget_usd is not None:
+        # Exact token counts rarely exceed the plan's estimates; this guards the cap anyway.
+        articles = fit_to_budget(
+            articles, [costs[article.id] for article in articles], args.budget_usd
+        )
+
+    routed = [article for article in articles if models[article.id] != EXTRACTIVE_MODEL]
+    estimated_input_tokens = sum(tokens[article.id] for article in routed)
+    expected_output_tokens_total = DEFAULT_EXPECTED_OUTPUT_TOKENS * len(routed)
+    estimated_cost_total = sum(costs[article.id] for article in articles)
+
+    if args.route:
+        counts = Counter(models[article.id] for article in articles)
+        print("Routes: " + ", ".join(f"{model} {count}" for model, count in counts.most_common()))
 
     print(f"Estimated input tokens: {estimated_input_tokens}")
     print(f"Estimated output tokens: {expected_output_tokens_total}")
@@ -179,20 +907,28 @@ def handler_summarize(args: argparse.Namespace) -> int:
         print("Dry-run enabled: no API calls, no database writes.")
         return 0
 
-    if api_key:
-        summarizer = OpenAISummarizer(model=args.model)
-    else:
-        print("Warning: OPENAI_API_KEY not set. Using MockSummarizer.")
-        summarizer = MockSummarizer()
-
+    summarizers: dict[str, Summarizer] = {}
     total = len(articles)
     failures = 0
     for index, article in enumerate(articles, start=1):
+        model = models[article.id]
+        if model not in summarizers:
+            summarizers[model] = (
+                ExtractiveSummarizer()
+                if model == EXTRACTIVE_MODEL
+                else _build_summarizer(model, args.base_url)
+            )
         try:
-            source_text = article.summary or article.title
-            result = summarizer.summarize(article.title, source_text)
+            result = summarizers[model].summarize(article.title, texts[article.id])
             with session_factory() as session:
-                save_ai_summary(session, article.id, result["summary"], result["bullets"])
+                save_ai_summary(
+                    session,
+                    article.id,
+                    result["summary"],
+                    result["bullets"],
+                    model=result.get("model"),
+                    **result.get("usage", {}),
+                )
             print(f"[{index}/{total}] summarized article #{article.id}")
         except Exception as exc:  # noqa: BLE001
             failures += 1
@@ -201,38 +937,476 @@ def handler_summarize(args: argparse.Namespace) -> int:
     return 1 if failures else 0
 
 
-def handler_summaries(args: argparse.Namespace) -> int:
+def _plan_budget(
+    args: argparse.Namespace, session: Session, router: ModelRouter
+) -> list[Article]:
+    keywords = DEFAULT_KEYWORDS
+    if args.keywords is not None:
+        keywords = frozenset(word.strip() for word in args.keywords.split(",") if word.strip())
+    weights = PriorityWeights(
+        half_life_days=args.half_life_days,
+        source_weights=dict(args.source_weight),
+        keywords=keywords,
+    )
+    plan = plan_summaries(
+        get_summary_candidates(session),
+        args.budget_usd,
+        model=args.model,
+        weights=weights,
+        max_articles=args.limit,
+        # Page text is unknown until fetched: plan for the longest text we would send.
+        source_chars=MAX_SOURCE_CHARS if args.full_text else None,
+        router=router if args.route else None,
+    )
+    print(
+        f"Budget plan: {len(plan.selected)} of {plan.candidates} articles, "
+        f"estimated ${plan.estimated_cost_usd:.6f} of ${plan.budget_usd:.6f}"
+    )
+    return get_articles_by_ids(session, [candidate.id for candidate in plan.selected])
+
+
+def _fetch_article_pages(args: argparse.Namespace, links: list[str]) -> dict[str, str]:
+    pages, stats = fetch_pages(links, PageCache(Path(args.page_cache)), _fetch_options(args))
+    print(
+        f"Full text: {len(pages)} of {len(links)} pages "
+        f"({stats.fetched} fetched, {stats.cached} cached, {stats.failed} failed)"
+    )
+    return pages
+
+
+def handler_enrich(args: argparse.Namespace) -> int:
     session_factory = init_db(args.db)
     with session_factory() as session:
-        articles = get_recent_articles(session, limit=args.limit)
+        articles = get_articles_missing_ai_summary(session, limit=args.limit)
+    if not articles:
+        print("No articles awaiting a summary.")
+        return 0
+    _fetch_article_pages(args, [article.link for article in articles])
+    return 0
+
 
-    with_summaries = [a for a in articles if a.ai_summary_record is not None]
+def handler_summaries(args: argparse.Namespace) -> int:
+    session_factory = init_db(args.db)
+    try:
+        with session_factory() as session:
+            page = get_article_page(
+                session, limit=args.limit, summarized_only=True, cursor=args.cursor
+            )
+    except ValueError as exc:
+        print(str(exc))
+        return 1
+
+    with_summaries = page.rows
     print(f"Showing {len(with_summaries)} AI summaries")
     if not with_summaries:
         print("No AI summaries found.")
         return 0
 
     for article in with_summaries:
-        record = article.ai_summary_record
-        assert record is not None
+        assert article.summarized_at is not None and article.bullets_ai is not None
         print(f"- [{article.id}] {article.title}")
         print(f"  Source: {article.source}")
-        print(f"  Summarized at: {record.summarized_at.isoformat()}")
-        print(f"  Summary: {record.summary_ai}")
+        print(f"  Summarized at: {article.summarized_at.isoformat()}")
+        print(f"  Summary: {article.summary_ai}")
         try:
-            bullets = json.loads(record.bullets_ai)
+            bullets = json.loads(article.bullets_ai)
         except json.JSONDecodeError:
             bullets = []
         if isinstance(bullets, list):
             for bullet in bullets:
                 print(f"  * {bullet}")
+    if page.next_cursor:
+        print(f"Next cursor: {page.next_cursor}")
     return 0
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
+def handler_search(args: argparse.Namespace) -> int:
+    try:
+        date_from = _optional_date(args.date_from)
+        date_to = _optional_date(args.date_to)
+    except ValueError:
+        print("Invalid date format. Use YYYY-MM-DD.")
+        return 1
+
+    session_factory = init_db(args.db)
+    # Open-ended ranges attach every archived month, so archived articles are found too.
+    bounds = (date_from or date.min, date_to or date.max)
+    try:
+        with (
+            with_archives(session_factory, args.db, *bounds) as archived,
+            archived() as session,
+        ):
+            if args.rebuild:
+                rebuild_search_index(session)
+            hits = search_articles(
+                session,
+                args.query,
+                limit=args.limit,
+                source=args.source,
+                start=date_from,
+                end=date_to,
+            )
+    except OperationalError as exc:
+        print(f"Search failed: {exc.orig}")
+        return 1
+
+    print(f"Found {len(hits)} results for: {args.query}")
+    for hit in hits:
+        article = hit.article
+        print(f"- [{article.id}] {article.title}")
+        print(f"  {article.source} | {article.effective_at.date().isoformat()} | {article.link}")
+        print(f"  {' '.join(hit.snippet.split())}")
+    return 0
+
+
+def handler_feeds(args: argparse.Namespace) -> int:
+    session_factory = init_db(args.db)
+    with session_factory() as session:
+        if args.feeds_command == "list":
+            feeds = get_feeds(session)
+            print(f"Registered feeds: {len(feeds)}")
+            for feed in feeds:
+                status = "enabled" if feed.enabled else "disabled"
+                print(f"- [{status}] {feed.url} ({feed.title or 'untitled'})")
+            return 0
+        if args.feeds_command == "add":
+            nb_new, nb_duplicates = add_feeds(session, [(url, None) for url in args.rss])
+            print(f"New: {nb_new}")
+            print(f"Duplicates: {nb_duplicates}")
+            return 0
+        if args.feeds_command == "import":
+            try:
+                entries = parse_opml(args.opml)
+            except (OSError, ElementTree.ParseError) as exc:
+                print(f"OPML import failed: {exc}")
+                return 1
+            nb_new, nb_duplicates = add_feeds(session, entries)
+            print(f"Feeds in OPML: {len(entries)}")
+            print(f"New: {nb_new}")
+            print(f"Duplicates: {nb_duplicates}")
+            return 0
+        if args.feeds_command == "export":
+            entries = [(feed.url, feed.title) for feed in get_feeds(session)]
+            output_path = Path(args.out)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(render_opml(entries), encoding="utf-8")
+            print(str(output_path))
+            return 0
+
+        enabled = args.feeds_command == "enable"
+        if not set_feed_enabled(session, args.url, enabled):
+            print(f"Unknown feed: {args.url}")
+            return 1
+        print(f"{'Enabled' if enabled else 'Disabled'}: {args.url}")
+        return 0
+
+
+def handler_trending(args: argparse.Namespace) -> int:
+    try:
+        end = _optional_date(args.date) or date.today()
+    except ValueError:
+        print("Invalid date format. Use YYYY-MM-DD.")
+        return 1
+    days = max(args.days, 1)
+    session_factory = init_db(args.db)
+    with session_factory() as session:
+        if args.rebuild:
+            rebuild_trending(session)
+        terms = get_trending_terms(session, end, days=days, limit=args.limit)
+
+    start = end - timedelta(days=days - 1)
+    print(f"Trending {start.isoformat()}..{end.isoformat()}: {len(terms)} terms")
+    for term in terms:
+        print(f"- {term.term}: {term.count} articles (baseline {term.baseline:.1f})")
+    return 0
+
+
+def _stats_json(row: StatsRow) -> dict:
+    return {
+        "articles": row.articles,
+        "summarized": row.summarized,
+        "coverage": round(row.coverage, 4),
+        "input_tokens": row.input_tokens,
+        "output_tokens": row.output_tokens,
+        "cost_usd": round(row.cost_usd, 6),
+    }
 
+
+def handler_stats(args: argparse.Namespace) -> int:
+    session_factory = init_db(args.db)
+    since = date.today() - timedelta(days=max(args.days, 1) - 1)
+    with session_factory() as session:
+        if args.rebuild:
+            rebuild_stats(session)
+        total = get_stats_total(session, args.source)
+        by_source = [] if args.source else get_stats_by_source(session)
+        daily = get_daily_stats(session, since, args.source) if args.days > 0 else []
+
+    if args.json:
+        payload = {
+            "total": _stats_json(total),
+            "sources": {row.key: _stats_json(row) for row in by_source},
+            "days": {row.key: _stats_json(row) for row in daily},
+        }
+        print(json.dumps(payload, indent=2))
+        return 0
+
+    print(f"Articles: {total.articles}")
+    print(f"Summarized: {total.summarized} ({total.coverage:.1%})")
+    print(f"Tokens: {total.input_tokens} in / {total.output_tokens} out")
+    print(f"Cost to date (USD): ${total.cost_usd:.6f}")
+    if by_source:
+        print("By source:")
+        for row in by_source:
+            print(
+                f"- {row.key}: {row.articles} articles, {row.summarized} summarized, "
+                f"${row.cost_usd:.6f}"
+            )
+    if daily:
+        print(f"Last {args.days} days:")
+        for row in daily:
+            print(f"- {row.key}: {row.articles} articles, {row.summarized} summarized")
+    return 0
+
+
+def handler_serve(args: argparse.Namespace) -> int:
+    session_factory = init_db(args.db)
+    try:
+        server = make_server(
+            session_factory, args.host, args.port, args.cache_size, verbose=args.verbose
+        )
+    except OSError as exc:
+        print(f"Cannot bind {args.host}:{args.port}: {exc}")
+        return 1
+    host, port = server.server_address[:2]
+    print(f"Serving {args.db} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def handler_archive(args: argparse.Namespace) -> int:
+    if args.older_than_days < 1:
+        print("--older-than-days must be at least 1.")
+        return 1
+    session_factory = init_db(args.db)
+    before = date.today() - timedelta(days=args.older_than_days)
+    counts = archive_articles(session_factory, args.db, before, dry_run=args.dry_run)
+    verb = "Would archive" if args.dry_run else "Archived"
+    for month, count in counts.items():
+        print(f"- {month}: {count} articles -> {archive_path(args.db, month)}")
+    print(f"{verb} {sum(counts.values())} articles published before {before.isoformat()}")
+    return 0
+
+
+def handler_compact(args: argparse.Namespace) -> int:
+    init_db(args.db)
+    paths = [Path(args.db)]
+    if args.archives:
+        paths.extend(sorted(archive_dir(args.db).glob("*.db")))
+    for path in paths:
+        size_before = path.stat().st_size
+        compact_database(str(path), vacuum=not args.analyze_only)
+        print(f"{path}: {size_before} -> {path.stat().st_size} bytes")
+    return 0
+
+
+def handler_export(args: argparse.Namespace) -> int:
+    watermark_path = Path(args.watermark_file) if args.watermark_file else None
+    since_text = args.since
+    if since_text is None and watermark_path is not None and watermark_path.exists():
+        since_text = watermark_path.read_text(encoding="utf-8").strip() or None
+    try:
+        since = datetime.fromisoformat(since_text) if since_text else None
+    except ValueError:
+        print("Invalid --since. Use an ISO datetime, e.g. 2025-02-10T06:00:00.")
+        return 1
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    session_factory = init_db(args.db)
+    try:
+        with session_factory() as session:
+            result = export_articles(session, out, args.format, since)
+    except RuntimeError as exc:
+        print(exc)
+        return 1
+    print(f"Exported {result.rows} articles to {out}")
+    watermark = result.watermark or since
+    if watermark is not None:
+        print(f"Watermark: {watermark.isoformat()}")
+        if watermark_path is not None:
+            write_atomic(watermark_path, [f"{watermark.isoformat()}\n"])
+    return 0
+
+
+def handler_import(args: argparse.Namespace) -> int:
+    path = Path(args.input)
+    if not path.exists():
+        print(f"File not found: {path}")
+        return 1
+    if args.batch_size < 1:
+        print("--batch-size must be at least 1.")
+        return 1
+    session_factory = init_db(args.db)
+    try:
+        with session_factory() as session:
+            records = iter_import_records(path, args.format)
+            result = import_articles(session, records, args.batch_size)
+    except (RuntimeError, ValueError) as exc:
+        print(f"Import failed: {exc}")
+        return 1
+    print(
+        f"Read {result.rows} records: {result.new} new articles, "
+        f"{result.duplicates} already stored, {result.summaries} summaries added"
+    )
+    return 0
+
+
+def _write_bench_report(report: dict, out: str | None) -> None:
+    if out:
+        write_atomic(Path(out), [json.dumps(report, indent=2), "\n"])
+        print(f"Results: {out}")
+
+
+def _serve_until_interrupted(server: ThreadingHTTPServer) -> None:
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _bench_llm(args: argparse.Namespace) -> int:
+    config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        rpm=args.rpm,
+        invalid_rate=args.invalid_rate,
+        seed=args.seed,
+    )
+    if args.bench_command == "llm-server":
+        try:
+            server = FakeOpenAIServer((args.host, args.port), config)
+        except OSError as exc:
+            print(f"Cannot bind {args.host}:{args.port}: {exc}")
+            return 1
+        host, port = server.server_address[:2]
+        print(f"Fake OpenAI API on http://{host}:{port}/v1 (use summarize --base-url)")
+        _serve_until_interrupted(server)
+        return 0
+
+    report = run_summarize_load_test(
+        config,
+        requests_count=max(args.requests, 1),
+        concurrency=max(args.concurrency, 1),
+        model=args.model,
+        max_retries=args.max_retries,
+    )
+    failures = ", ".join(f"{kind} {count}" for kind, count in report["failures"].items())
+    print(
+        f"Summaries: {report['completed']}/{report['requests']} in {report['elapsed_seconds']} s "
+        f"({report['summaries_per_second']}/s); failures: {failures or 'none'}"
+    )
+    print(
+        f"Latency: p50 {report['latency_p50_ms']} ms, p95 {report['latency_p95_ms']} ms, "
+        f"p99 {report['latency_p99_ms']} ms; retries: {report['retries']}"
+    )
+    print(
+        f"Cost (USD): billed ${report['billed_cost_usd']:.6f}, "
+        f"accounted ${report['accounted_cost_usd']:.6f}, "
+        f"unaccounted ${report['unaccounted_cost_usd']:.6f}"
+    )
+    _write_bench_report(report, args.out)
+    return 0
+
+
+def handler_bench(args: argparse.Namespace) -> int:
+    if args.bench_command == "storage":
+        try:
+            sizes = [parse_size(size) for size in args.sizes.split(",")]
+        except ValueError:
+            print("Invalid --sizes. Use e.g. 10k,100k,1m.")
+            return 1
+        report = run_storage_benchmarks(
+            sizes, Path(args.data_dir), repeat=max(args.repeat, 1), seed=args.seed
+        )
+        problems = 0
+        for result in report["results"]:
+            status = "ok" if result["ok"] else "PLAN: " + "; ".join(result["plan_problems"])
+            problems += not result["ok"]
+            print(
+                f"{result['size']:>10} {result['operation']:<32} "
+                f"median {result['median_ms']:>9.3f} ms  min {result['min_ms']:>9.3f} ms  {status}"
+            )
+        _write_bench_report(report, args.out)
+        return 1 if problems else 0
+
+    if args.bench_command in ("summarize", "llm-server"):
+        return _bench_llm(args)
+
+    config = FeedServerConfig(
+        feeds=args.feeds,
+        items=args.items,
+        payload_bytes=args.payload_bytes,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        atom_fraction=args.atom_fraction,
+        etag=not args.no_etag,
+        seed=args.seed,
+    )
+    if args.bench_command == "feed-server":
+        try:
+            server = FeedServer((args.host, args.port), config)
+        except OSError as exc:
+            print(f"Cannot bind {args.host}:{args.port}: {exc}")
+            return 1
+        host, port = server.server_address[:2]
+        print(f"Serving {config.feeds} feeds at http://{host}:{port}/feeds/<n>.xml (or .atom)")
+        _serve_until_interrupted(server)
+        return 0
+
+    report = run_ingest_benchmark(
+        config,
+        mode=args.mode,
+        db_path=Path(args.db) if args.db else None,
+        fetch_concurrency=max(args.concurrency, 1),
+    )
+    print(
+        f"Feeds: {report['feeds_ok']} ok, {report['feeds_failed']} failed "
+        f"in {report['elapsed_seconds']} s ({report['feeds_per_second']} feeds/s)"
+    )
+    print(
+        f"Items: {report['items_retrieved']} retrieved, {report['items_new']} new "
+        f"({report['items_per_second']} items/s)"
+    )
+    print(f"Fetch latency: p50 {report['fetch_p50_ms']} ms, p95 {report['fetch_p95_ms']} ms")
+    if report["revisit_seconds"] is not None:
+        print(
+            f"Revisit: {report['server']['not_modified']} not modified "
+            f"in {report['revisit_seconds']} s"
+        )
+    print(f"Peak RSS: {report['peak_rss_mb']} MB")
+    _write_bench_report(report, args.out)
+    return 0
+
+
+def _write_metrics(args: argparse.Namespace) -> None:
+    if args.metrics_json:
+        write_atomic(Path(args.metrics_json), [METRICS.to_json()])
+    if args.metrics_prom:
+        write_atomic(Path(args.metrics_prom), [METRICS.to_prometheus()])
+
+
+def _run_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
     if args.command == "version":
         print(__version__)
         return 0
@@ -240,7 +1414,7 @@ def main(argv: list[str] | None = None) -> int:
         items = fetch_rss(args.rss)
         print(f"Total items: {len(items)}")
         for item in items[:5]:
-            print(f"- {item.get('title')}")
+            print(f"- {item.title}")
         return 0
     if args.command == "ingest":
         return handler_ingest(args)
@@ -254,6 +1428,61 @@ def main(argv: list[str] | None = None) -> int:
         return handler_summarize(args)
     if args.command == "summaries":
         return handler_summaries(args)
+    if args.command == "search":
+        return handler_search(args)
+    if args.command == "feeds":
+        return handler_feeds(args)
+    if args.command == "trending":
+        return handler_trending(args)
+    if args.command == "stats":
+        return handler_stats(args)
+    if args.command == "serve":
+        return handler_serve(args)
+    if args.command == "archive":
+        return handler_archive(args)
+    if args.command == "compact":
+        return handler_compact(args)
+    if args.command == "enrich":
+        return handler_enrich(args)
+    if args.command == "export":
+        return handler_export(args)
+    if args.command == "import":
+        return handler_import(args)
+    if args.command == "bench":
+        return handler_bench(args)
 
     parser.print_help()
     return 0
+
+
+def _run_maybe_profiled(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    if args.profile is None or not should_profile(args.profile_sample):
+        return _run_command(parser, args)
+    exit_code, report = run_profiled(
+        lambda: _run_command(parser, args),
+        Path(args.profile_dir),
+        args.command or "help",
+        cpu=args.profile in ("cpu", "all"),
+        memory=args.profile in ("memory", "all"),
+        top=args.profile_top,
+    )
+    # stderr, so machine-readable output such as ``stats --json`` stays parseable.
+    print(f"Profile summary: {report.summary_path}", file=sys.stderr)
+    return exit_code
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not 0 <= args.profile_sample <= 1:
+        parser.error("--profile-sample must be between 0 and 1")
+    if not (args.metrics_json or args.metrics_prom):
+        return _run_maybe_profiled(parser, args)
+
+    METRICS.enable()
+    try:
+        with METRICS.span("command", command=args.command):
+            return _run_maybe_profiled(parser, args)
+    finally:
+        METRICS.disable()
+        _write_metrics(args)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+
+MANIFEST_NAME = ".digest_manifest.json"
+# Bump when rendering changes so every digest is regenerated once.
+DIGEST_FORMAT_VERSION = 1
+
+
+class DigestManifest:
+    """Per-file fingerprints of the rows each generated digest was rendered from."""
+
+    def __init__(self, path: Path, entries: dict[str, dict] | None = None):
+        self.path = path
+        self.entries: dict[str, dict] = entries or {}
+
+    @classmethod
+    def load(cls, out_dir: Path) -> DigestManifest:
+        path = out_dir / MANIFEST_NAME
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            entries = {}
+        return cls(path, entries if isinstance(entries, dict) else {})
+
+    @staticmethod
+    def versioned(fingerprint: str) -> str:
+        return f"v{DIGEST_FORMAT_VERSION}:{fingerprint}"
+
+    def is_current(self, output_path: Path, fingerprint: str) -> bool:
+        entry = self.entries.get(output_path.name)
+        return (
+            entry is not None
+            and entry.get("fingerprint") == self.versioned(fingerprint)
+            and output_path.exists()
+        )
+
+    def record(self, output_path: Path, fingerprint: str) -> None:
+        self.entries[output_path.name] = {
+            "fingerprint": self.versioned(fingerprint),
+            "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(self.path)
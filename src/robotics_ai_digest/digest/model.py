@@ -0,0 +1,114 @@
+"""Format-neutral view of a digest, shared by the Markdown, HTML and JSON Feed renderers.
+
+``iter_digest_chunks`` walks the grouped articles once and asks every formatter for its
+piece of each event, so several output formats cost a single query and a single pass.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, datetime, timezone
+from functools import cached_property
+import json
+from typing import Protocol
+
+from robotics_ai_digest.storage.models import Article
+from robotics_ai_digest.storage.rows import ArticleRow, as_article_row
+from robotics_ai_digest.storage.trending import TrendingTerm
+
+DIGEST_TITLE = "Robotics & AI Digest"
+SourceGroups = Iterable[tuple[str, Iterable[ArticleRow | Article]]]
+
+
+def _normalize_summary(summary: str | None, max_len: int = 240) -> str | None:
+    if not summary:
+        return None
+    one_line = " ".join(summary.split())
+    if len(one_line) <= max_len:
+        return one_line
+    return f"{one_line[: max_len - 3]}..."
+
+
+def utc_stamp(value: datetime) -> str:
+    """ISO 8601 with a ``Z`` suffix; naive datetimes are taken to be UTC, as stored."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return f"{value.isoformat()}Z"
+
+
+class DigestArticle:
+    """One article as every format sees it; derived fields are computed on first use.
+
+    Laziness matters for Markdown: articles served from the fragment cache never parse
+    their bullets or normalize their summary.
+    """
+
+    def __init__(self, row: ArticleRow):
+        self.row = row
+
+    @property
+    def title(self) -> str:
+        return self.row.title or "(untitled)"
+
+    @cached_property
+    def summary(self) -> str | None:
+        row = self.row
+        return _normalize_summary(row.summary_ai if row.summary_ai is not None else row.summary)
+
+    @cached_property
+    def bullets(self) -> list | None:
+        """Parsed AI bullets; None when there are none, ``[]`` when they fail to parse."""
+        if not self.row.bullets_ai:
+            return None
+        try:
+            bullets = json.loads(self.row.bullets_ai)
+        except json.JSONDecodeError:
+            return []
+        return bullets if isinstance(bullets, list) else None
+
+
+class DigestFormatter(Protocol):
+    def header(self, label: str, trending: Sequence[TrendingTerm]) -> str: ...
+
+    def begin_source(self, source: str) -> str: ...
+
+    def article(self, article: DigestArticle) -> str: ...
+
+    def end_source(self, source: str) -> str: ...
+
+    def footer(self, total: int, sources: int, generated_at: str) -> str: ...
+
+
+def iter_digest_chunks(
+    formatters: Sequence[DigestFormatter],
+    date: date,
+    groups: SourceGroups,
+    generated_at: datetime | None = None,
+    label: str | None = None,
+    trending: Sequence[TrendingTerm] = (),
+) -> Iterator[tuple[int, str]]:
+    """Yield ``(formatter index, chunk)`` pairs from one traversal of ``groups``.
+
+    A non-empty ``trending`` list is rendered as a section right below the heading.
+    """
+    heading = label or date.isoformat()
+    for index, formatter in enumerate(formatters):
+        yield index, formatter.header(heading, trending)
+
+    total = 0
+    sources = 0
+    for source, source_articles in groups:
+        sources += 1
+        for index, formatter in enumerate(formatters):
+            yield index, formatter.begin_source(source)
+        for article in source_articles:
+            total += 1
+            entry = DigestArticle(as_article_row(article))
+            for index, formatter in enumerate(formatters):
+                yield index, formatter.article(entry)
+        for index, formatter in enumerate(formatters):
+            yield index, formatter.end_source(source)
+
+    stamp = (generated_at or datetime.now(timezone.utc)).isoformat().replace("+00:00", "Z")
+    for index, formatter in enumerate(formatters):
+        yield index, formatter.footer(total, sources, stamp)
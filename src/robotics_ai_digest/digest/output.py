@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+from typing import IO
+
+from sqlalchemy.orm import Session
+
+from robotics_ai_digest.digest.manifest import DigestManifest
+from robotics_ai_digest.digest.model import DigestFormatter, SourceGroups, iter_digest_chunks
+from robotics_ai_digest.digest.renderer_html import HtmlFormatter
+from robotics_ai_digest.digest.renderer_json import JsonFeedFormatter
+from robotics_ai_digest.digest.renderer_md import (
+    FRAGMENT_FORMAT_VERSION,
+    MarkdownFormatter,
+    group_consecutive_by_source,
+)
+from robotics_ai_digest.metrics import METRICS
+from robotics_ai_digest.storage.fragments import save_fragments
+from robotics_ai_digest.storage.repository import (
+    get_bucket_fingerprints,
+    iter_article_rows_for_date,
+    iter_article_rows_for_range,
+)
+from robotics_ai_digest.storage.rows import ArticleRow
+from robotics_ai_digest.storage.trending import TrendingTerm, get_trending_terms
+
+PERIODS = ("day", "week", "month")
+# Output formats double as file extensions.
+FORMATS = ("md", "html", "json")
+_EMPTY_FINGERPRINT = hashlib.sha256().hexdigest()
+
+FragmentCallback = Callable[[int, str], None]
+_FORMATTERS: dict[str, Callable[[FragmentCallback], DigestFormatter]] = {
+    "md": MarkdownFormatter,
+    "html": lambda _: HtmlFormatter(),
+    "json": lambda _: JsonFeedFormatter(),
+}
+
+
+def digest_path(out_dir: Path, label: str, fmt: str = "md") -> Path:
+    return out_dir / f"digest_{label}.{fmt}"
+
+
+def digest_paths(out_dir: Path, label: str, formats: Sequence[str]) -> dict[str, Path]:
+    return {fmt: digest_path(out_dir, label, fmt) for fmt in formats}
+
+
+def period_bounds(period: str, start: date, end: date) -> tuple[date, date]:
+    """Widen ``[start, end]`` so the first and last weeks/months are complete."""
+    if period == "week":
+        return start - timedelta(days=start.weekday()), end + timedelta(days=6 - end.weekday())
+    if period == "month":
+        next_month = (end.replace(day=1) + timedelta(days=32)).replace(day=1)
+        return start.replace(day=1), next_month - timedelta(days=1)
+    return start, end
+
+
+def bucket_start(period: str, bucket: str) -> date:
+    return date.fromisoformat(f"{bucket}-01" if period == "month" else bucket)
+
+
+def bucket_days(period: str, bucket: str) -> int:
+    start = bucket_start(period, bucket)
+    return (period_bounds(period, start, start)[1] - start).days + 1
+
+
+def bucket_label(period: str, bucket: str) -> str:
+    if period == "week":
+        year, week, _ = date.fromisoformat(bucket).isocalendar()
+        return f"{year}-W{week:02d}"
+    return bucket
+
+
+@contextmanager
+def atomic_writer(path: Path, binary: bool = False) -> Iterator[IO]:
+    """Write to a sibling temp file that is renamed over ``path`` only on success."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8") as handle:
+            yield handle
+        # mkstemp creates 0600 files; match what a plain write_text() would produce.
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: Path, chunks: Iterable[str]) -> None:
+    """Stream chunks into a sibling temp file, then rename it over ``path``."""
+    with atomic_writer(path) as handle:
+        handle.writelines(chunks)
+
+
+def write_digest_files(
+    paths: dict[str, Path],
+    day: date,
+    groups: SourceGroups,
+    label: str | None = None,
+    on_fragment: FragmentCallback | None = None,
+    trending: Sequence[TrendingTerm] = (),
+) -> list[Path]:
+    """Render every format in ``paths`` from a single pass over ``groups``."""
+    formats = list(paths)
+    formatters = [_FORMATTERS[fmt](on_fragment) for fmt in formats]
+    chunks = iter_digest_chunks(formatters, day, groups, label=label, trending=trending)
+    with ExitStack() as stack:
+        handles = [stack.enter_context(atomic_writer(paths[fmt])) for fmt in formats]
+        for index, chunk in chunks:
+            handles[index].write(chunk)
+    return list(paths.values())
+
+
+@dataclass
+class DigestRunResult:
+    written: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+
+
+def render_digest_text(
+    fmt: str,
+    day: date,
+    groups: SourceGroups,
+    label: str | None = None,
+    trending: Sequence[TrendingTerm] = (),
+) -> str:
+    """Render one format in memory; cached Markdown fragments are used but not stored."""
+    chunks = iter_digest_chunks(
+        [_FORMATTERS[fmt](None)], day, groups, label=label, trending=trending
+    )
+    return "".join(chunk for _, chunk in chunks)
+
+
+def bucket_trending(session: Session, period: str, bucket: str, limit: int) -> list[TrendingTerm]:
+    """Top rising terms over a bucket's own days; [] when ``limit`` is 0."""
+    if limit <= 0:
+        return []
+    days = bucket_days(period, bucket)
+    end = bucket_start(period, bucket) + timedelta(days=days - 1)
+    return get_trending_terms(session, end, days=days, limit=limit)
+
+
+def _with_trending(fingerprint: str, trending: Sequence[TrendingTerm]) -> str:
+    # Trending compares against earlier days, so a bucket can change without its own rows.
+    if not trending:
+        return fingerprint
+    terms = ";".join(f"{term.term}:{term.count}:{term.baseline:.4f}" for term in trending)
+    return hashlib.sha256(f"{fingerprint}|{terms}".encode()).hexdigest()
+
+
+def _is_current(manifest: DigestManifest, paths: dict[str, Path], fingerprint: str) -> bool:
+    return all(manifest.is_current(path, fingerprint) for path in paths.values())
+
+
+def write_daily_digest(
+    session: Session,
+    target_date: date,
+    out_dir: Path,
+    manifest: DigestManifest | None = None,
+    formats: Sequence[str] = ("md",),
+    trending: int = 0,
+) -> list[Path]:
+    """Write one day's digest in each format; with a manifest, return [] when unchanged.
+
+    ``trending`` > 0 adds a section with that many rising terms.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    day = target_date.isoformat()
+    paths = digest_paths(out_dir, day, formats)
+    terms = bucket_trending(session, "day", day, trending)
+    fingerprint = _EMPTY_FINGERPRINT
+    if manifest is not None:
+        fingerprint = get_bucket_fingerprints(session, target_date, target_date).get(
+            day, _EMPTY_FINGERPRINT
+        )
+        fingerprint = _with_trending(fingerprint, terms)
+        if _is_current(manifest, paths, fingerprint):
+            return []
+
+    rows = iter_article_rows_for_date(session, target_date, FRAGMENT_FORMAT_VERSION)
+    fragments: dict[int, str] = {}
+    with METRICS.span("digest_render", period="day"):
+        written = write_digest_files(
+            paths,
+            target_date,
+            group_consecutive_by_source(rows),
+            on_fragment=fragments.__setitem__,
+            trending=terms,
+        )
+    save_fragments(session, fragments, FRAGMENT_FORMAT_VERSION)
+    if manifest is not None:
+        for path in written:
+            manifest.record(path, fingerprint)
+        manifest.save()
+    return written
+
+
+def render_bucket_files(
+    paths: dict[str, Path],
+    day: date,
+    label: str,
+    rows: list[ArticleRow],
+    trending: Sequence[TrendingTerm] = (),
+) -> tuple[list[Path], dict[int, str]]:
+    """Write one bucket's digests; returns newly rendered fragments for the caller to cache.
+
+    Module-level so it can be pickled into worker processes, which have no DB access.
+    """
+    fragments: dict[int, str] = {}
+    groups = group_consecutive_by_source(rows)
+    with METRICS.span("digest_render", period="range"):
+        written = write_digest_files(
+            paths, day, groups, label, on_fragment=fragments.__setitem__, trending=trending
+        )
+    return written, fragments
+
+
+def _iter_buckets(
+    pairs: Iterable[tuple[str, ArticleRow]],
+) -> Iterator[tuple[str, list[ArticleRow]]]:
+    current: str | None = None
+    rows: list[ArticleRow] = []
+    for bucket, row in pairs:
+        if bucket != current:
+            if current is not None:
+                yield current, rows
+            current, rows = bucket, []
+        rows.append(row)
+    if current is not None:
+        yield current, rows
+
+
+def write_range_digests(
+    session: Session,
+    start: date,
+    end: date,
+    out_dir: Path,
+    period: str = "day",
+    workers: int | None = None,
+    manifest: DigestManifest | None = None,
+    buckets: Collection[str] | None = None,
+    formats: Sequence[str] = ("md",),
+    trending: int = 0,
+) -> DigestRunResult:
+    """Render one digest per day/week/month with articles, from a single streaming query.
+
+    Buckets are handed to a process pool as soon as the query moves past them; at most
+    ``2 * workers`` buckets are held in memory at once. With a manifest, buckets whose
+    rows are unchanged since the last run are skipped; ``buckets`` limits the run further.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    start, end = period_bounds(period, start, end)
+    result = DigestRunResult()
+    trends: dict[str, list[TrendingTerm]] = {}
+
+    def terms_for(bucket: str) -> list[TrendingTerm]:
+        if bucket not in trends:
+            trends[bucket] = bucket_trending(session, period, bucket, trending)
+        return trends[bucket]
+
+    fingerprints: dict[str, str] = {}
+    if manifest is not None:
+        fingerprints = get_bucket_fingerprints(session, start, end, period)
+        stale: set[str] = set()
+        for bucket in sorted(fingerprints):
+            if buckets is not None and bucket not in buckets:
+                continue
+            paths = digest_paths(out_dir, bucket_label(period, bucket), formats)
+            fingerprints[bucket] = _with_trending(fingerprints[bucket], terms_for(bucket))
+            if _is_current(manifest, paths, fingerprints[bucket]):
+                result.skipped.extend(paths.values())
+            else:
+                stale.add(bucket)
+        buckets = stale
+    if buckets is not None and not buckets:
+        return result
+
+    rows = iter_article_rows_for_range(
+        session, start, end, period, buckets, fragment_version=FRAGMENT_FORMAT_VERSION
+    )
+    # Cache misses are saved once the streaming query is finished; SQLite would otherwise
+    # have to commit while the read cursor is still open.
+    fragments: dict[int, str] = {}
+
+    def jobs() -> Iterator[tuple[str, tuple]]:
+        for bucket, bucket_rows in _iter_buckets(rows):
+            label = bucket_label(period, bucket)
+            paths = digest_paths(out_dir, label, formats)
+            day = bucket_start(period, bucket)
+            yield bucket, (paths, day, label, bucket_rows, terms_for(bucket))
+
+    def done(bucket: str, rendered: tuple[list[Path], dict[int, str]]) -> None:
+        written, new_fragments = rendered
+        fragments.update(new_fragments)
+        result.written.extend(written)
+        if manifest is not None:
+            for path in written:
+                manifest.record(path, fingerprints[bucket])
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers == 1:
+            for bucket, job in jobs():
+                done(bucket, render_bucket_files(*job))
+            return result
+
+        pending: deque[tuple[str, Future[tuple[list[Path], dict[int, str]]]]] = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for bucket, job in jobs():
+                pending.append((bucket, pool.submit(render_bucket_files, *job)))
+                if len(pending) >= 2 * workers:
+                    bucket_done, future = pending.popleft()
+                    done(bucket_done, future.result())
+            for bucket_done, future in pending:
+                done(bucket_done, future.result())
+        return result
+    finally:
+        save_fragments(session, fragments, FRAGMENT_FORMAT_VERSION)
+        if manifest is not None:
+            manifest.save()
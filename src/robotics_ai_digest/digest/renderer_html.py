@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from html import escape
+
+from robotics_ai_digest.digest.model import DIGEST_TITLE, DigestArticle
+from robotics_ai_digest.storage.trending import TrendingTerm
+
+
+class HtmlFormatter:
+    """Standalone HTML page with one section per source."""
+
+    def header(self, label: str, trending: Sequence[TrendingTerm]) -> str:
+        title = escape(f"{DIGEST_TITLE} \u2014 {label}")
+        heading = (
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{title}</title>\n</head>\n<body>\n<h1>{title}</h1>\n"
+        )
+        if not trending:
+            return heading
+        items = "".join(
+            f"<li>{escape(term.term)} <small>{term.count} ({term.change:+.0f})</small></li>\n"
+            for term in trending
+        )
+        section = '<section class="trending">\n<h2>Trending</h2>\n<ul>\n'
+        return f"{heading}{section}{items}</ul>\n</section>\n"
+
+    def begin_source(self, source: str) -> str:
+        return f"<section>\n<h2>{escape(source)}</h2>\n<ul>\n"
+
+    def article(self, article: DigestArticle) -> str:
+        row = article.row
+        parts = [f'<li><a href="{escape(row.link)}">{escape(article.title)}</a>']
+        if row.published:
+            stamp = row.published.strftime("%Y-%m-%d %H:%M")
+            parts.append(f'<br><time datetime="{row.published.isoformat()}">{stamp}</time>')
+        if article.summary:
+            parts.append(f"<p>{escape(article.summary)}</p>")
+        if article.bullets:
+            items = "".join(f"<li>{escape(str(bullet))}</li>" for bullet in article.bullets)
+            parts.append(f"<ul>{items}</ul>")
+        parts.append("</li>\n")
+        return "".join(parts)
+
+    def end_source(self, source: str) -> str:
+        return "</ul>\n</section>\n"
+
+    def footer(self, total: int, sources: int, generated_at: str) -> str:
+        return (
+            f"<footer>\n<p>Total articles: {total}</p>\n<p>Sources count: {sources}</p>\n"
+            f"<p>Generated at: {generated_at}</p>\n</footer>\n</body>\n</html>\n"
+        )
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+import json
+
+from robotics_ai_digest.digest.model import DIGEST_TITLE, DigestArticle, utc_stamp
+from robotics_ai_digest.storage.trending import TrendingTerm
+
+JSON_FEED_VERSION = "https://jsonfeed.org/version/1.1"
+
+
+def _dumps(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+class JsonFeedFormatter:
+    """JSON Feed 1.1 document, streamed item by item.
+
+    Digest totals and trending terms go in ``_digest``/``_trending`` extension objects, as
+    the spec allows.
+    """
+
+    def __init__(self) -> None:
+        self._items = 0
+
+    def header(self, label: str, trending: Sequence[TrendingTerm]) -> str:
+        title = _dumps(f"{DIGEST_TITLE} \u2014 {label}")
+        extension = ""
+        if trending:
+            terms = [
+                {"term": term.term, "count": term.count, "baseline": round(term.baseline, 2)}
+                for term in trending
+            ]
+            # Extension values must be objects, never bare lists.
+            extension = f'  "_trending": {_dumps({"terms": terms})},\n'
+        return (
+            f'{{\n  "version": "{JSON_FEED_VERSION}",\n  "title": {title},\n{extension}  "items": ['
+        )
+
+    def begin_source(self, source: str) -> str:
+        return ""
+
+    def article(self, article: DigestArticle) -> str:
+        row = article.row
+        lines = [article.summary] if article.summary else []
+        lines.extend(f"- {bullet}" for bullet in article.bullets or [])
+        item = {
+            "id": row.guid or row.link,
+            "url": row.link,
+            "title": article.title,
+            "content_text": "\n".join(lines) or article.title,
+            "tags": [row.source],
+        }
+        if row.published:
+            item["date_published"] = utc_stamp(row.published)
+        separator = "," if self._items else ""
+        self._items += 1
+        return f"{separator}\n    {_dumps(item)}"
+
+    def end_source(self, source: str) -> str:
+        return ""
+
+    def footer(self, total: int, sources: int, generated_at: str) -> str:
+        meta = {"total_articles": total, "sources_count": sources, "generated_at": generated_at}
+        return f'\n  ],\n  "_digest": {_dumps(meta)}\n}}\n'
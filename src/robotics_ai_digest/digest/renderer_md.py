@@ -1,57 +1,114 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from datetime import date, datetime, timezone
-import json
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date, datetime
+from itertools import groupby
 
+from robotics_ai_digest.digest.model import (
+    DIGEST_TITLE,
+    DigestArticle,
+    SourceGroups,
+    iter_digest_chunks,
+)
 from robotics_ai_digest.storage.models import Article
+from robotics_ai_digest.storage.rows import ArticleRow
+from robotics_ai_digest.storage.trending import TrendingTerm
 
+# Bump whenever _article_lines changes so cached fragments are re-rendered.
+FRAGMENT_FORMAT_VERSION = 1
 
-def _normalize_summary(summary: str | None, max_len: int = 240) -> str | None:
-    if not summary:
-        return None
-    one_line = " ".join(summary.split())
-    if len(one_line) <= max_len:
-        return one_line
-    return f"{one_line[: max_len - 3]}..."
 
-
-def render_digest(date: date, articles: list[Article]) -> str:
-    lines: list[str] = [f"# Robotics & AI Digest \u2014 {date.isoformat()}", ""]
-
-    grouped: OrderedDict[str, list[Article]] = OrderedDict()
+def group_by_source(articles: Iterable[ArticleRow | Article]) -> SourceGroups:
+    """Group in first-seen source order; holds every article in memory."""
+    grouped: OrderedDict[str, list[ArticleRow | Article]] = OrderedDict()
     for article in articles:
         grouped.setdefault(article.source, []).append(article)
+    return grouped.items()
+
+
+def group_consecutive_by_source(articles: Iterable[ArticleRow | Article]) -> SourceGroups:
+    """Stream groups from input that is already ordered source by source."""
+    return groupby(articles, key=lambda article: article.source)
+
+
+def _article_lines(article: DigestArticle) -> Iterator[str]:
+    yield f"- **[{article.title}]({article.row.link})**"
+    if article.row.published:
+        yield f"  - Published: {article.row.published.strftime('%Y-%m-%d %H:%M')}"
+    if article.summary:
+        yield f"  - Summary: {article.summary}"
+    if article.bullets is not None:
+        yield "  - Bullets:"
+        for bullet in article.bullets:
+            yield f"    - {bullet}"
+
+
+def render_fragment(article: DigestArticle) -> str:
+    return "".join(f"{line}\n" for line in _article_lines(article))
+
+
+class MarkdownFormatter:
+    """Markdown digest; reuses cached per-article fragments and reports fresh ones."""
+
+    def __init__(self, on_fragment: Callable[[int, str], None] | None = None):
+        self.on_fragment = on_fragment
+
+    def header(self, label: str, trending: Sequence[TrendingTerm]) -> str:
+        heading = f"# {DIGEST_TITLE} \u2014 {label}\n\n"
+        if not trending:
+            return heading
+        lines = "".join(
+            f"- {term.term}: {term.count} articles ({term.change:+.0f})\n" for term in trending
+        )
+        return f"{heading}## Trending\n\n{lines}\n"
+
+    def begin_source(self, source: str) -> str:
+        return f"## {source}\n\n"
+
+    def article(self, article: DigestArticle) -> str:
+        if article.row.fragment is not None:
+            return article.row.fragment
+        fragment = render_fragment(article)
+        if self.on_fragment is not None:
+            self.on_fragment(article.row.id, fragment)
+        return fragment
+
+    def end_source(self, source: str) -> str:
+        return "\n"
+
+    def footer(self, total: int, sources: int, generated_at: str) -> str:
+        return (
+            f"---\nTotal articles: {total}\nSources count: {sources}\n"
+            f"Generated at: {generated_at}\n"
+        )
+
+
+def iter_digest(
+    date: date,
+    groups: SourceGroups,
+    generated_at: datetime | None = None,
+    label: str | None = None,
+    on_fragment: Callable[[int, str], None] | None = None,
+    trending: Sequence[TrendingTerm] = (),
+) -> Iterator[str]:
+    """Yield the Markdown digest in chunks as source groups are consumed.
+
+    ``label`` overrides the heading date, e.g. ``2025-W07`` for weekly roll-ups. Articles
+    carrying a cached ``fragment`` are emitted as-is; freshly rendered fragments are
+    reported to ``on_fragment`` so callers can cache them.
+    """
+    formatter = MarkdownFormatter(on_fragment)
+    chunks = iter_digest_chunks([formatter], date, groups, generated_at, label, trending)
+    for _, chunk in chunks:
+        yield chunk
+
 
-    for source, source_articles in grouped.items():
-        lines.append(f"## {source}")
-        lines.append("")
-        for article in source_articles:
-            title = article.title or "(untitled)"
-            lines.append(f"- **[{title}]({article.link})**")
-            if article.published:
-                lines.append(f"  - Published: {article.published.strftime('%Y-%m-%d %H:%M')}")
-            ai_record = article.ai_summary_record
-            summary_text = ai_record.summary_ai if ai_record else article.summary
-            summary = _normalize_summary(summary_text)
-            if summary:
-                lines.append(f"  - Summary: {summary}")
-            if ai_record and ai_record.bullets_ai:
-                try:
-                    bullets = json.loads(ai_record.bullets_ai)
-                except json.JSONDecodeError:
-                    bullets = []
-                if isinstance(bullets, list):
-                    lines.append("  - Bullets:")
-                    for bullet in bullets:
-                        lines.append(f"    - {bullet}")
-        lines.append("")
-
-    lines.append("---")
-    lines.append(f"Total articles: {len(articles)}")
-    lines.append(f"Sources count: {len(grouped)}")
-    generated_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    lines.append(f"Generated at: {generated_at}")
-    lines.append("")
-
-    return "\n".join(lines)
+def render_digest(
+    date: date,
+    articles: Iterable[ArticleRow | Article],
+    generated_at: datetime | None = None,
+    trending: Sequence[TrendingTerm] = (),
+) -> str:
+    groups = group_by_source(articles)
+    return "".join(iter_digest(date, groups, generated_at=generated_at, trending=trending))
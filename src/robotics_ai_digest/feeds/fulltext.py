@@ -0,0 +1,307 @@
+"""Full-text enrichment: fetch article pages, extract their main text and cache it on disk.
+
+Feed summaries are often a single teaser line. Pages are fetched concurrently, but never
+more than ``per_host`` at a time, and requests to the same host start at least
+``host_delay`` seconds apart. The extracted text is cached as gzip'd JSON under the
+SHA-256 of the canonical link, so a page is downloaded once across runs, whatever
+tracking parameters its feed appends. Pages that are permanently gone (4xx) are cached
+empty; timeouts, 429s and 5xx responses are retried on the next run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import gzip
+import hashlib
+from html.parser import HTMLParser
+import json
+from pathlib import Path
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from .. import __version__
+from ..digest.output import atomic_writer
+from ..metrics import METRICS
+
+USER_AGENT = f"robotics-ai-digest/{__version__} (+full-text enrichment)"
+# Roughly 2k tokens: enough for a faithful summary without paying for a whole long read.
+MAX_SOURCE_CHARS = 8_000
+_TRACKING_PARAM = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref_src)$", re.IGNORECASE)
+_SKIP_TAGS = frozenset(
+    {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form"}
+)
+_BLOCK_TAGS = frozenset(
+    {"p", "div", "section", "li", "pre", "blockquote", "figcaption", "td", "br", "h1", "h2", "h3"}
+)
+_MAIN_TAGS = frozenset({"article", "main"})
+# Shorter blocks are menus, bylines and share buttons rather than prose.
+_MIN_BLOCK_CHARS = 40
+_MIN_MAIN_CHARS = 200
+_local = threading.local()
+
+
+def canonical_link(url: str) -> str:
+    """Normalize a link so that tracking and cosmetic variants share one cache entry."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    default_port = {"http": 80, "https": 443}.get(scheme)
+    if parts.port and parts.port != default_port:
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAM.match(key)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class _MainTextParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        # (inside <article>/<main>, text) per block of running text.
+        self.blocks: list[tuple[bool, str]] = []
+        self._parts: list[str] = []
+        self._skip = 0
+        self._main = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _SKIP_TAGS:
+            self.flush()
+            self._skip += 1
+        elif tag in _BLOCK_TAGS or tag in _MAIN_TAGS:
+            self.flush()
+            self._main += tag in _MAIN_TAGS
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS or tag in _MAIN_TAGS:
+            self.flush()
+            if tag in _MAIN_TAGS:
+                self._main = max(0, self._main - 1)
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip:
+            self._parts.append(data)
+
+    def flush(self) -> None:
+        text = " ".join("".join(self._parts).split())
+        self._parts.clear()
+        if text:
+            self.blocks.append((self._main > 0, text))
+
+
+def extract_main_text(html: str) -> str:
+    """Paragraph-like text of a page, preferring its ``<article>`` or ``<main>`` element."""
+    parser = _MainTextParser()
+    parser.feed(html)
+    parser.close()
+    parser.flush()
+    blocks = [(in_main, text) for in_main, text in parser.blocks if len(text) >= _MIN_BLOCK_CHARS]
+    main = [text for in_main, text in blocks if in_main]
+    chosen = main if sum(map(len, main)) >= _MIN_MAIN_CHARS else [text for _, text in blocks]
+    return "\n\n".join(chosen)
+
+
+def source_text(
+    title: str,
+    feed_summary: str | None,
+    page_text: str | None = None,
+    max_chars: int = MAX_SOURCE_CHARS,
+) -> str:
+    """What to summarize: the page's main text when it beats the feed teaser, else the teaser."""
+    if page_text and len(page_text) > len(feed_summary or ""):
+        return page_text[:max_chars]
+    return feed_summary or title
+
+
+@dataclass(slots=True, frozen=True)
+class CachedPage:
+    link: str
+    # Final URL after redirects.
+    url: str
+    status: int
+    fetched_at: str
+    text: str
+
+
+class PageCache:
+    """Extracted page text on disk, one gzip'd JSON file per canonical link."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, link: str) -> Path:
+        digest = hashlib.sha256(canonical_link(link).encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json.gz"
+
+    def get(self, link: str) -> CachedPage | None:
+        try:
+            return CachedPage(**json.loads(gzip.decompress(self.path(link).read_bytes())))
+        except (OSError, EOFError, ValueError, TypeError):
+            # Missing, truncated or corrupt entries are simply fetched (again).
+            return None
+
+    def put(self, page: CachedPage) -> None:
+        path = self.path(page.link)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(asdict(page), ensure_ascii=False).encode("utf-8")
+        with atomic_writer(path, binary=True) as handle:
+            handle.write(gzip.compress(payload))
+
+
+def _http() -> requests.Session:
+    # One keep-alive session per worker thread; requests sessions are not thread-safe.
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def _known_encoding(name: str | None) -> str:
+    # Servers send made-up charsets; decoding with one would raise LookupError.
+    try:
+        return codecs.lookup(name or "utf-8").name
+    except LookupError:
+        return "utf-8"
+
+
+def fetch_page(link: str, timeout: int = 15, max_bytes: int = 2_000_000) -> CachedPage:
+    """Download one page and extract its text; raises on errors worth retrying later."""
+    host = urlsplit(link).netloc
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    try:
+        with (
+            METRICS.span("page_fetch", host=host),
+            _http().get(link, timeout=timeout, stream=True) as response,
+        ):
+            status = response.status_code
+            if status == 429 or status >= 500:
+                response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if status >= 400 or "html" not in content_type.lower():
+                return CachedPage(canonical_link(link), response.url, status, fetched_at, "")
+            body = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                body += chunk
+                if len(body) >= max_bytes:
+                    break
+            # requests assumes ISO-8859-1 when no charset is given; HTML is mostly UTF-8.
+            encoding = response.encoding if "charset" in content_type.lower() else "utf-8"
+    except requests.RequestException:
+        METRICS.count("page_errors", host=host)
+        raise
+    METRICS.count("page_bytes", len(body), host=host)
+    try:
+        text = extract_main_text(bytes(body).decode(_known_encoding(encoding), errors="replace"))
+    except Exception:  # noqa: BLE001
+        # Retrying would fail the same way: cache the page empty rather than abort the run.
+        METRICS.count("page_errors", host=host)
+        text = ""
+    return CachedPage(canonical_link(link), response.url, status, fetched_at, text)
+
+
+@dataclass(slots=True, frozen=True)
+class FetchOptions:
+    concurrency: int = 16
+    per_host: int = 2
+    # Minimum seconds between the starts of two requests to the same host.
+    host_delay: float = 1.0
+    timeout: int = 15
+    max_bytes: int = 2_000_000
+
+
+@dataclass(slots=True)
+class FetchStats:
+    cached: int = 0
+    fetched: int = 0
+    failed: int = 0
+
+
+@dataclass(slots=True)
+class _Host:
+    slots: asyncio.Semaphore
+    next_start: float = 0.0
+
+
+class PageFetcher:
+    """Fetch pages concurrently, politely per host, through a ``PageCache``.
+
+    Create it inside the event loop it is used from. Concurrent requests for the same
+    canonical link share one download.
+    """
+
+    def __init__(self, cache: PageCache, options: FetchOptions | None = None):
+        self.cache = cache
+        self.options = options or FetchOptions()
+        self.stats = FetchStats()
+        self._slots = asyncio.Semaphore(max(1, self.options.concurrency))
+        self._hosts: dict[str, _Host] = {}
+        self._pending: dict[str, asyncio.Task[str | None]] = {}
+
+    async def text(self, link: str) -> str | None:
+        """The main text of ``link``, or None if it has none or could not be fetched."""
+        key = canonical_link(link)
+        task = self._pending.get(key)
+        if task is None:
+            task = self._pending[key] = asyncio.ensure_future(self._load(key, link))
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await task
+
+    async def _load(self, key: str, link: str) -> str | None:
+        page = await asyncio.to_thread(self.cache.get, key)
+        if page is not None:
+            self.stats.cached += 1
+            METRICS.count("page_cache_hits")
+            return page.text or None
+        page = await self._download(key, link)
+        if page is None:
+            self.stats.failed += 1
+            return None
+        await asyncio.to_thread(self.cache.put, page)
+        self.stats.fetched += 1
+        return page.text or None
+
+    async def _download(self, key: str, link: str) -> CachedPage | None:
+        loop = asyncio.get_running_loop()
+        netloc = urlsplit(key).netloc
+        host = self._hosts.get(netloc)
+        if host is None:
+            host = self._hosts[netloc] = _Host(asyncio.Semaphore(max(1, self.options.per_host)))
+        async with host.slots:
+            # Claim the start slot before sleeping, so that requests waiting together are
+            # still spaced ``host_delay`` apart.
+            now = loop.time()
+            start = max(now, host.next_start)
+            host.next_start = start + self.options.host_delay
+            await asyncio.sleep(start - now)
+            async with self._slots:
+                try:
+                    return await asyncio.to_thread(
+                        fetch_page, link, self.options.timeout, self.options.max_bytes
+                    )
+                except (requests.RequestException, OSError):
+                    return None
+
+
+def fetch_pages(
+    links: Iterable[str], cache: PageCache, options: FetchOptions | None = None
+) -> tuple[dict[str, str], FetchStats]:
+    """Fetch many pages in one event loop; return the text found per link, and stats."""
+
+    async def fetch_all() -> tuple[dict[str, str], FetchStats]:
+        fetcher = PageFetcher(cache, options)
+        unique = list(dict.fromkeys(links))
+        texts = await asyncio.gather(*(fetcher.text(link) for link in unique))
+        return {link: text for link, text in zip(unique, texts) if text}, fetcher.stats
+
+    return asyncio.run(fetch_all())
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+
+def parse_datetime(value: str | datetime | None) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class FeedItem:
+    link: str
+    title: str | None = None
+    published: datetime | None = None
+    summary: str | None = None
+    source: str | None = None
+    guid: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "title": self.title,
+            "link": self.link,
+            "published": self.published.isoformat() if self.published else None,
+            "summary": self.summary,
+            "source": self.source,
+            "guid": self.guid,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> FeedItem:
+        return cls(
+            link=data["link"],
+            title=data.get("title"),
+            published=parse_datetime(data.get("published")),
+            summary=data.get("summary"),
+            source=data.get("source"),
+            guid=data.get("guid"),
+        )
+
+
+def as_feed_items(items: Iterable[FeedItem | dict]) -> list[FeedItem]:
+    """Accept legacy item dicts alongside ``FeedItem``; dicts without a link are dropped."""
+    return [
+        item if isinstance(item, FeedItem) else FeedItem.from_dict(item)
+        for item in items
+        if isinstance(item, FeedItem) or item.get("link")
+    ]
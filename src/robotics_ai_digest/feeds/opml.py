@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+from xml.etree import ElementTree
+
+
+def parse_opml(path: str | Path) -> list[tuple[str, str | None]]:
+    """Return (xmlUrl, title) pairs for every feed outline, including nested ones."""
+    tree = ElementTree.parse(path)
+    feeds: list[tuple[str, str | None]] = []
+    seen: set[str] = set()
+    for outline in tree.iter("outline"):
+        url = (outline.get("xmlUrl") or "").strip()
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        title = outline.get("title") or outline.get("text")
+        feeds.append((url, title))
+    return feeds
+
+
+def render_opml(
+    feeds: list[tuple[str, str | None]], title: str = "robotics-ai-digest feeds"
+) -> str:
+    root = ElementTree.Element("opml", version="2.0")
+    head = ElementTree.SubElement(root, "head")
+    ElementTree.SubElement(head, "title").text = title
+    body = ElementTree.SubElement(root, "body")
+    for url, feed_title in feeds:
+        label = feed_title or url
+        ElementTree.SubElement(body, "outline", type="rss", text=label, title=label, xmlUrl=url)
+    ElementTree.indent(root)
+    return ElementTree.tostring(root, encoding="unicode", xml_declaration=True) + "\n"
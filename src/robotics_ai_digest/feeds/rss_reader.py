@@ -2,16 +2,23 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from time import struct_time
+from typing import TYPE_CHECKING
 
 import feedparser
 import requests
 
+from ..metrics import METRICS
+from .items import FeedItem
 
-def _to_iso8601(value: struct_time | None) -> str | None:
+if TYPE_CHECKING:
+    from .snapshots import SnapshotWriter
+
+
+def _to_datetime(value: struct_time | None) -> datetime | None:
     if value is None:
         return None
     try:
-        dt = datetime(
+        return datetime(
             value.tm_year,
             value.tm_mon,
             value.tm_mday,
@@ -20,49 +27,97 @@ def _to_iso8601(value: struct_time | None) -> str | None:
             value.tm_sec,
             tzinfo=timezone.utc,
         )
-        return dt.isoformat()
     except (TypeError, ValueError):
         return None
 
 
-def fetch_rss(urls: list[str], timeout: int = 15) -> list[dict]:
-    items: list[dict] = []
-    seen: set[str] = set()
+def download_feed(
+    url: str,
+    timeout: int = 15,
+    snapshots: SnapshotWriter | None = None,
+    etags: dict[str, str] | None = None,
+) -> bytes:
+    """Return the feed body; with ``snapshots``, archive every response, errors included.
 
-    for url in urls:
-        try:
-            response = requests.get(url, timeout=timeout)
+    With ``etags``, the stored ETag for ``url`` is sent as ``If-None-Match`` and the
+    response's ETag is stored; a ``304 Not Modified`` returns an empty body.
+    """
+    conditional = {}
+    if etags is not None and url in etags:
+        conditional["headers"] = {"If-None-Match": etags[url]}
+    try:
+        with METRICS.span("feed_fetch", feed=url):
+            fetched_at = datetime.now(timezone.utc)
+            response = requests.get(url, timeout=timeout, **conditional)
+            if snapshots is not None:
+                snapshots.record(
+                    url, response.status_code, dict(response.headers), response.content, fetched_at
+                )
             response.raise_for_status()
-            parsed = feedparser.parse(response.content)
-        except (requests.RequestException, OSError):
-            continue
+    except requests.RequestException:
+        METRICS.count("feed_errors", feed=url)
+        raise
+    if etags is not None:
+        if response.headers.get("ETag"):
+            etags[url] = response.headers["ETag"]
+        if response.status_code == 304:
+            METRICS.count("feed_not_modified", feed=url)
+            return b""
+    METRICS.count("feed_bytes", len(response.content), feed=url)
+    return response.content
+
 
-        if getattr(parsed, "bozo", 0):
+def parse_feed(content: bytes, url: str, seen: set[str] | None = None) -> list[FeedItem]:
+    """Parse raw feed bytes into items, skipping keys already present in ``seen``."""
+    with METRICS.span("feed_parse", feed=url):
+        parsed = feedparser.parse(content)
+    if getattr(parsed, "bozo", 0):
+        return []
+
+    if seen is None:
+        seen = set()
+    items: list[FeedItem] = []
+    source_name = parsed.feed.get("title", url)
+    for entry in parsed.entries:
+        link = entry.get("link")
+        if not link:
+            continue
+        guid = entry.get("id") or entry.get("guid") or link
+        dedupe_key = guid or link
+        if dedupe_key in seen:
             continue
+        seen.add(dedupe_key)
 
-        source_name = parsed.feed.get("title", url)
-        for entry in parsed.entries:
-            link = entry.get("link")
-            if not link:
-                continue
-            guid = entry.get("id") or entry.get("guid") or link
-            dedupe_key = guid or link
-            if dedupe_key in seen:
-                continue
-            seen.add(dedupe_key)
-
-            published = _to_iso8601(entry.get("published_parsed") or entry.get("updated_parsed"))
-
-            items.append(
-                {
-                    "title": entry.get("title"),
-                    "link": link,
-                    "published": published,
-                    "summary": entry.get("summary") or entry.get("description"),
-                    "source": source_name,
-                    "guid": guid,
-                }
+        published = _to_datetime(entry.get("published_parsed") or entry.get("updated_parsed"))
+        items.append(
+            FeedItem(
+                link=link,
+                title=entry.get("title"),
+                published=published,
+                summary=entry.get("summary") or entry.get("description"),
+                source=source_name,
+                guid=guid,
             )
-
+        )
+    METRICS.count("feed_items", len(items), feed=url)
     return items
 
+
+def fetch_rss(
+    urls: list[str],
+    timeout: int = 15,
+    snapshots: SnapshotWriter | None = None,
+    etags: dict[str, str] | None = None,
+) -> list[FeedItem]:
+    items: list[FeedItem] = []
+    seen: set[str] = set()
+
+    for url in urls:
+        try:
+            content = download_feed(url, timeout=timeout, snapshots=snapshots, etags=etags)
+            if content:
+                items.extend(parse_feed(content, url, seen))
+        except (requests.RequestException, OSError):
+            continue
+
+    return items
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import hashlib
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse an ``i/N`` shard spec (0-based index) into ``(index, total)``."""
+    index_text, sep, total_text = value.partition("/")
+    if not sep:
+        raise ValueError(f"Invalid shard '{value}'. Use i/N, e.g. 0/4.")
+    try:
+        index, total = int(index_text), int(total_text)
+    except ValueError as exc:
+        raise ValueError(f"Invalid shard '{value}'. Use i/N, e.g. 0/4.") from exc
+    if total < 1 or not 0 <= index < total:
+        raise ValueError(f"Invalid shard '{value}'. Index must be in [0, N).")
+    return index, total
+
+
+def shard_of(url: str, total: int) -> int:
+    # Stable across processes and hosts, unlike the salted built-in hash().
+    digest = hashlib.sha1(url.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % total
+
+
+def select_shard(urls: list[str], index: int, total: int) -> list[str]:
+    return [url for url in urls if shard_of(url, total) == index]
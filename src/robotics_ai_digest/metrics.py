@@ -0,0 +1,175 @@
+"""Opt-in timing spans and counters around each stage, exported as JSON or Prometheus text.
+
+Collection is off by default: ``span`` then returns a shared no-op context manager and
+``count``/``observe`` return at once, so instrumented code pays one attribute check per call.
+Spans recorded in worker processes (e.g. parallel digest rendering) are not collected.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+import json
+import math
+import threading
+import time
+from typing import ParamSpec, TypeVar
+
+PREFIX = "robotics_ai_digest"
+QUANTILES = (0.5, 0.9, 0.99)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+Labels = tuple[tuple[str, str], ...]
+_NOOP = nullcontext()
+
+
+def _key(name: str, labels: dict[str, object]) -> tuple[str, Labels]:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def quantile(ordered: list[float], q: float) -> float:
+    # Nearest-rank, so every reported value is an observed one.
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_labels(labels: Labels, *extra: tuple[str, str]) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in pairs) + "}"
+
+
+class Metrics:
+    """Thread-safe counters and duration samples, keyed by name and labels."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._counters: defaultdict[tuple[str, Labels], float] = defaultdict(float)
+        self._timings: defaultdict[tuple[str, Labels], list[float]] = defaultdict(list)
+        self._started = time.time()
+
+    def enable(self) -> None:
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def count(self, name: str, value: float = 1, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name: str, seconds: float, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._timings[key].append(seconds)
+
+    def span(self, name: str, **labels: object) -> AbstractContextManager[None]:
+        """Time the ``with`` block as one ``name`` sample, whether or not it raises."""
+        if not self.enabled:
+            return _NOOP
+        return self._span(name, labels)
+
+    def timed(self, name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """Decorator form of ``span`` for functions that are a stage on their own."""
+
+        def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._span(name, {}):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @contextmanager
+    def _span(self, name: str, labels: dict[str, object]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def _snapshot(
+        self,
+    ) -> tuple[list[tuple[tuple[str, Labels], float]], list[tuple[tuple[str, Labels], list]]]:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timings = sorted((key, sorted(samples)) for key, samples in self._timings.items())
+        return counters, timings
+
+    def report(self) -> dict:
+        counters, timings = self._snapshot()
+        return {
+            "started_at": datetime.fromtimestamp(self._started, timezone.utc).isoformat(),
+            "duration_seconds": round(time.time() - self._started, 6),
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in counters
+            ],
+            "timings": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": len(samples),
+                    "total_seconds": round(sum(samples), 6),
+                    **{f"p{round(q * 100)}": round(quantile(samples, q), 6) for q in QUANTILES},
+                    "max": round(samples[-1], 6),
+                }
+                for (name, labels), samples in timings
+            ],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.report(), indent=2) + "\n"
+
+    def to_prometheus(self) -> str:
+        """Render the text exposition format, e.g. for node_exporter's textfile collector."""
+        counters, timings = self._snapshot()
+        lines = [
+            f"# TYPE {PREFIX}_run_duration_seconds gauge",
+            f"{PREFIX}_run_duration_seconds {time.time() - self._started:.6f}",
+            f"# TYPE {PREFIX}_run_started_timestamp_seconds gauge",
+            f"{PREFIX}_run_started_timestamp_seconds {self._started:.3f}",
+        ]
+        typed: set[str] = set()
+        for (name, labels), value in counters:
+            metric = f"{PREFIX}_{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_prometheus_labels(labels)} {value:g}")
+        for (name, labels), samples in timings:
+            metric = f"{PREFIX}_{name}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            for q in QUANTILES:
+                quantile_labels = _prometheus_labels(labels, ("quantile", str(q)))
+                lines.append(f"{metric}{quantile_labels} {quantile(samples, q):.6f}")
+            lines.append(f"{metric}_sum{_prometheus_labels(labels)} {sum(samples):.6f}")
+            lines.append(f"{metric}_count{_prometheus_labels(labels)} {len(samples)}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
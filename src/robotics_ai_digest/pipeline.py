@@ -0,0 +1,192 @@
+"""Pipelined ``run``: fetch, parse, upsert, summarize and render as asyncio stages.
+
+Stages are linked by bounded queues, so summaries start while later feeds still download.
+With a page cache, each summarize worker first fetches the article's full text.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import requests
+from sqlalchemy.orm import Session, sessionmaker
+
+from .digest.output import write_daily_digest
+from .feeds.fulltext import FetchOptions, FetchStats, PageCache, PageFetcher, source_text
+from .feeds.items import FeedItem
+from .feeds.rss_reader import download_feed, parse_feed
+from .feeds.snapshots import SnapshotWriter
+from .storage.repository import insert_new_articles, save_ai_summary
+from .summarization.summarizer import Summarizer
+
+_DONE = object()
+
+
+@dataclass
+class PipelineOptions:
+    urls: list[str]
+    fetch_concurrency: int = 8
+    summarize_concurrency: int = 4
+    queue_size: int = 32
+    timeout: int = 15
+    summarizer: Summarizer | None = None
+    summarize_limit: int | None = None
+    digest_date: date | None = None
+    digest_out: Path | None = None
+    # Summarize full article pages (fetched through this cache) instead of feed teasers.
+    page_cache: PageCache | None = None
+    page_fetch: FetchOptions | None = None
+    # Archive every raw feed response for ``ingest --replay``.
+    snapshots: SnapshotWriter | None = None
+    # Revalidate with these per-URL ETags (updated in place); 304s yield no items.
+    etags: dict[str, str] | None = None
+
+
+@dataclass
+class PipelineResult:
+    feeds_fetched: int = 0
+    feeds_failed: int = 0
+    retrieved: int = 0
+    new: int = 0
+    duplicates: int = 0
+    summarized: int = 0
+    summarize_failures: int = 0
+    digest_path: Path | None = None
+    pages: FetchStats | None = None
+
+
+def _insert_batch(
+    session_factory: sessionmaker[Session], items: list[FeedItem]
+) -> tuple[list[tuple[int, str, str | None, str]], int]:
+    # Reading the new rows after their commit must not reload each one with a SELECT.
+    with session_factory(expire_on_commit=False) as session:
+        new_articles, duplicates = insert_new_articles(session, items)
+        return [(a.id, a.title, a.summary, a.link) for a in new_articles], duplicates
+
+
+def _save_summary(session_factory: sessionmaker[Session], article_id: int, result: dict) -> None:
+    with session_factory() as session:
+        save_ai_summary(
+            session,
+            article_id,
+            result["summary"],
+            result["bullets"],
+            model=result.get("model"),
+            **result.get("usage", {}),
+        )
+
+
+def _write_digest(session_factory: sessionmaker[Session], target_date: date, out_dir: Path) -> Path:
+    with session_factory() as session:
+        return write_daily_digest(session, target_date, out_dir)[0]
+
+
+async def run_pipeline(
+    session_factory: sessionmaker[Session], options: PipelineOptions
+) -> PipelineResult:
+    result = PipelineResult()
+    url_queue: asyncio.Queue[str] = asyncio.Queue()
+    for url in options.urls:
+        url_queue.put_nowait(url)
+    raw_queue: asyncio.Queue = asyncio.Queue(maxsize=options.queue_size)
+    item_queue: asyncio.Queue = asyncio.Queue(maxsize=options.queue_size)
+    summary_queue: asyncio.Queue = asyncio.Queue(maxsize=options.queue_size)
+    db_lock = asyncio.Lock()
+    seen: set[str] = set()
+    summarizer = options.summarizer
+    summarize_workers = max(1, options.summarize_concurrency) if summarizer else 0
+    download_options: dict[str, object] = {}
+    if options.snapshots is not None:
+        download_options["snapshots"] = options.snapshots
+    if options.etags is not None:
+        download_options["etags"] = options.etags
+    fetcher = None
+    if options.page_cache is not None and summarizer:
+        fetcher = PageFetcher(options.page_cache, options.page_fetch)
+        result.pages = fetcher.stats
+
+    async def fetch_worker() -> None:
+        while True:
+            try:
+                url = url_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                content = await asyncio.to_thread(
+                    download_feed, url, options.timeout, **download_options
+                )
+            except (requests.RequestException, OSError):
+                result.feeds_failed += 1
+                continue
+            result.feeds_fetched += 1
+            if content:
+                await raw_queue.put((url, content))
+
+    async def fetch_stage() -> None:
+        workers = max(1, min(options.fetch_concurrency, len(options.urls)))
+        await asyncio.gather(*(fetch_worker() for _ in range(workers)))
+        await raw_queue.put(_DONE)
+
+    async def parse_stage() -> None:
+        # Single consumer, so the shared ``seen`` set is only touched by one thread at a time.
+        while (entry := await raw_queue.get()) is not _DONE:
+            url, content = entry
+            try:
+                items = await asyncio.to_thread(parse_feed, content, url, seen)
+            except OSError:
+                continue
+            result.retrieved += len(items)
+            if items:
+                await item_queue.put(items)
+        await item_queue.put(_DONE)
+
+    async def upsert_stage() -> None:
+        queued = 0
+        while (items := await item_queue.get()) is not _DONE:
+            async with db_lock:
+                new_rows, duplicates = await asyncio.to_thread(
+                    _insert_batch, session_factory, items
+                )
+            result.new += len(new_rows)
+            result.duplicates += duplicates
+            if not summarize_workers:
+                continue
+            for row in new_rows:
+                if options.summarize_limit is not None and queued >= options.summarize_limit:
+                    break
+                # Start the page download now, so it overlaps with earlier summaries.
+                page = asyncio.ensure_future(fetcher.text(row[3])) if fetcher else None
+                await summary_queue.put((row, page))
+                queued += 1
+        for _ in range(summarize_workers):
+            await summary_queue.put(_DONE)
+
+    async def summarize_worker() -> None:
+        assert summarizer is not None
+        while (entry := await summary_queue.get()) is not _DONE:
+            (article_id, title, feed_summary, _link), page = entry
+            try:
+                page_text = await page if page is not None else None
+                text = source_text(title, feed_summary, page_text)
+                summary = await asyncio.to_thread(summarizer.summarize, title, text)
+                async with db_lock:
+                    await asyncio.to_thread(_save_summary, session_factory, article_id, summary)
+                result.summarized += 1
+            except Exception:  # noqa: BLE001
+                result.summarize_failures += 1
+
+    await asyncio.gather(
+        fetch_stage(),
+        parse_stage(),
+        upsert_stage(),
+        *(summarize_worker() for _ in range(summarize_workers)),
+    )
+
+    if options.digest_out is not None and options.digest_date is not None:
+        result.digest_path = await asyncio.to_thread(
+            _write_digest, session_factory, options.digest_date, options.digest_out
+        )
+    return result
@@ -0,0 +1,102 @@
+"""Opt-in cProfile and tracemalloc capture around one CLI command.
+
+Each profiled run writes ``<command>-<UTC time>-<pid>.pstats`` (for ``python -m pstats`` or
+snakeviz) and a ``.txt`` summary with the top functions and allocation sites.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import cProfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import io
+import os
+from pathlib import Path
+import pstats
+import random
+import time
+import tracemalloc
+from typing import TypeVar
+
+PROFILE_MODES = ("cpu", "memory", "all")
+R = TypeVar("R")
+
+# Allocations made by the profilers and the import machinery are noise in the summary.
+_MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(slots=True)
+class ProfileReport:
+    summary_path: Path
+    stats_path: Path | None = None
+
+
+def should_profile(sample_rate: float, draw: Callable[[], float] = random.random) -> bool:
+    """Decide whether this run is in the sampled fraction, e.g. 0.1 for one cron run in ten."""
+    return sample_rate >= 1 or draw() < sample_rate
+
+
+def _cpu_summary(profiler: cProfile.Profile, top: int) -> str:
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return f"== CPU: top {top} functions by cumulative time ==\n{buffer.getvalue().strip()}\n"
+
+
+def _memory_summary(snapshot: tracemalloc.Snapshot, peak: int, top: int) -> str:
+    lines = [f"== Memory: peak {peak / 2**20:.1f} MiB; top {top} sites still allocated =="]
+    statistics = snapshot.filter_traces(_MEMORY_FILTERS).statistics("lineno")
+    for rank, stat in enumerate(statistics[:top], start=1):
+        frame = stat.traceback[0]
+        lines.append(
+            f"{rank:>3}. {frame.filename}:{frame.lineno}: "
+            f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def run_profiled(
+    func: Callable[[], R],
+    out_dir: Path,
+    name: str,
+    cpu: bool = True,
+    memory: bool = False,
+    top: int = 20,
+) -> tuple[R, ProfileReport]:
+    """Call ``func`` under the selected profilers; reports are written even if it raises."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{os.getpid()}"
+    report = ProfileReport(summary_path=out_dir / f"{stem}.txt")
+    profiler = cProfile.Profile() if cpu else None
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = func()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    finally:
+        elapsed = time.perf_counter() - started
+        sections = [f"Profile of '{name}': {elapsed:.3f} s wall time\n"]
+        if profiler is not None:
+            report.stats_path = out_dir / f"{stem}.pstats"
+            profiler.dump_stats(report.stats_path)
+            sections.append(_cpu_summary(profiler, top))
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            sections.append(_memory_summary(snapshot, peak, top))
+        report.summary_path.write_text("\n".join(sections), encoding="utf-8")
+    return result, report
@@ -0,0 +1,319 @@
+"""Read-only HTTP API over the digest database, built on the stdlib ``http.server``.
+
+Responses are kept in an LRU cache that is emptied as soon as SQLite's
+``PRAGMA data_version`` reports a commit from another connection (an ingest, a summarize
+run, ...). Every response carries an ETag, so polling clients mostly get a bodiless 304.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import traceback
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from .digest.model import DigestArticle
+from .digest.output import FORMATS, bucket_trending, render_digest_text
+from .digest.renderer_md import FRAGMENT_FORMAT_VERSION, group_consecutive_by_source
+from .storage.repository import get_article_page, iter_article_rows_for_date
+from .storage.rows import ArticleRow
+from .storage.search import search_articles
+from .storage.trending import get_trending_terms
+
+MAX_LIMIT = 200
+_CONTENT_TYPES = {
+    "json": "application/json",
+    "md": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+}
+_DIGEST_CONTENT_TYPES = {**_CONTENT_TYPES, "json": "application/feed+json"}
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(slots=True, frozen=True)
+class Response:
+    status: int
+    body: bytes
+    content_type: str
+    etag: str | None = None
+
+    @classmethod
+    def ok(cls, body: str, content_type: str) -> Response:
+        data = body.encode("utf-8")
+        return cls(HTTPStatus.OK, data, content_type, f'"{hashlib.sha256(data).hexdigest()[:32]}"')
+
+    @classmethod
+    def json(cls, payload: object, status: int = HTTPStatus.OK) -> Response:
+        if status != HTTPStatus.OK:
+            data = json.dumps(payload).encode("utf-8")
+            return cls(status, data, _CONTENT_TYPES["json"])
+        return cls.ok(json.dumps(payload, ensure_ascii=False), _CONTENT_TYPES["json"])
+
+
+class ResponseCache:
+    """LRU of rendered responses, valid for one SQLite ``data_version``.
+
+    ``data_version`` is per connection, so a single connection is held open just to poll it.
+    """
+
+    def __init__(self, session_factory: sessionmaker[Session], max_entries: int = 256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, Response] = OrderedDict()
+        self._version: int | None = None
+        self._lock = threading.Lock()
+        self._watcher = session_factory.kw["bind"].raw_connection()
+
+    def _data_version(self) -> int:
+        cursor = self._watcher.cursor()
+        try:
+            return cursor.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            cursor.close()
+
+    def get_or_render(self, key: str, render: Callable[[], Response]) -> Response:
+        with self._lock:
+            version = self._data_version()
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        response = render()
+        if response.status == HTTPStatus.OK and self.max_entries > 0:
+            with self._lock:
+                # Drop the result if a writer committed while it was being rendered.
+                if version == self._version:
+                    self._entries[key] = response
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return response
+
+    def close(self) -> None:
+        self._watcher.close()
+
+
+def _row_json(row: ArticleRow) -> dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "link": row.link,
+        "guid": row.guid,
+        "source": row.source,
+        "published": row.published.isoformat() if row.published else None,
+        "created_at": row.created_at.isoformat(),
+        "summary": row.summary,
+        "summary_ai": row.summary_ai,
+        # Stored bullets that fail to parse come out as [], as in rendered digests.
+        "bullets": DigestArticle(row).bullets,
+        "summarized_at": row.summarized_at.isoformat() if row.summarized_at else None,
+    }
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header lists ``etag`` or ``*`` (weak comparison)."""
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _param(params: dict[str, list[str]], name: str) -> str | None:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _int(
+    params: dict[str, list[str]], name: str, default: int, low: int = 0, high: int = MAX_LIMIT
+) -> int:
+    raw = _param(params, name)
+    try:
+        value = int(raw) if raw is not None else default
+    except ValueError as exc:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid {name}: {raw}") from exc
+    return max(low, min(value, high))
+
+
+def _limit(params: dict[str, list[str]], default: int) -> int:
+    return _int(params, "limit", default, low=1)
+
+
+def _date(value: str | None, name: str) -> date | None:
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError as exc:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"invalid {name} date: {value}") from exc
+
+
+class DigestApi:
+    """Maps request targets to responses; socket-free so it can be exercised directly.
+
+    Routes: ``/articles`` and ``/summaries`` (``limit``, ``source``, ``cursor``),
+    ``/search`` (``q``, ``limit``, ``source``, ``from``, ``to``), ``/trending`` (``date``,
+    ``days``, ``limit``) and ``/digests/YYYY-MM-DD[.md|.html|.json]`` (``trending``).
+    """
+
+    def __init__(self, session_factory: sessionmaker[Session], cache_size: int = 256):
+        self.session_factory = session_factory
+        self.cache = ResponseCache(session_factory, cache_size)
+
+    def handle(self, target: str) -> Response:
+        # The day is part of the key: /trending without a date means today's terms.
+        today = date.today()
+        return self.cache.get_or_render(
+            f"{today.isoformat()} {target}", lambda: self._render(target, today)
+        )
+
+    def _render(self, target: str, today: date) -> Response:
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        try:
+            with self.session_factory() as session:
+                if url.path in ("/articles", "/summaries"):
+                    return self._articles(session, params, url.path == "/summaries")
+                if url.path == "/search":
+                    return self._search(session, params)
+                if url.path == "/trending":
+                    return self._trending(session, params, today)
+                if url.path.startswith("/digests/"):
+                    name = url.path.removeprefix("/digests/")
+                    return self._digest(session, name, params)
+        except ApiError as exc:
+            return Response.json({"error": str(exc)}, exc.status)
+        except Exception:  # noqa: BLE001
+            # A bug or a broken row: answer 500 (never cached) and keep serving.
+            traceback.print_exc()
+            return Response.json({"error": "internal error"}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        return Response.json({"error": f"not found: {url.path}"}, HTTPStatus.NOT_FOUND)
+
+    def _articles(self, session: Session, params: dict, summarized_only: bool) -> Response:
+        try:
+            page = get_article_page(
+                session,
+                limit=_limit(params, 10),
+                source=_param(params, "source"),
+                summarized_only=summarized_only,
+                cursor=_param(params, "cursor"),
+            )
+        except ValueError as exc:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(exc)) from exc
+        return Response.json(
+            {"articles": [_row_json(row) for row in page.rows], "next_cursor": page.next_cursor}
+        )
+
+    def _search(self, session: Session, params: dict) -> Response:
+        query = _param(params, "q")
+        if not query:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "missing q parameter")
+        try:
+            hits = search_articles(
+                session,
+                query,
+                limit=_limit(params, 20),
+                source=_param(params, "source"),
+                start=_date(_param(params, "from"), "from"),
+                end=_date(_param(params, "to"), "to"),
+            )
+        except OperationalError as exc:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"search failed: {exc.orig}") from exc
+        results = [
+            {**_row_json(hit.article), "snippet": hit.snippet, "score": hit.score} for hit in hits
+        ]
+        return Response.json({"query": query, "results": results})
+
+    def _trending(self, session: Session, params: dict, today: date) -> Response:
+        end = _date(_param(params, "date"), "date") or today
+        days = _int(params, "days", 1, 1, 366)
+        terms = get_trending_terms(session, end, days=days, limit=_limit(params, 10))
+        return Response.json(
+            {
+                "date": end.isoformat(),
+                "days": days,
+                "terms": [
+                    {"term": term.term, "count": term.count, "baseline": round(term.baseline, 2)}
+                    for term in terms
+                ],
+            }
+        )
+
+    def _digest(self, session: Session, name: str, params: dict) -> Response:
+        day_text, _, fmt = name.partition(".")
+        fmt = fmt or "md"
+        if fmt not in FORMATS:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"unknown digest format: {fmt}")
+        day = _date(day_text, "digest")
+        if day is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, "missing digest date")
+        trending = bucket_trending(session, "day", day.isoformat(), _int(params, "trending", 0))
+        rows = iter_article_rows_for_date(session, day, FRAGMENT_FORMAT_VERSION)
+        body = render_digest_text(fmt, day, group_consecutive_by_source(rows), trending=trending)
+        return Response.ok(body, _DIGEST_CONTENT_TYPES[fmt])
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: DigestServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        response = self.server.api.handle(self.path)
+        not_modified = response.etag is not None and _etag_matches(
+            self.headers.get("If-None-Match"), response.etag
+        )
+        self.send_response(HTTPStatus.NOT_MODIFIED if not_modified else response.status)
+        if response.etag is not None:
+            self.send_header("ETag", response.etag)
+            self.send_header("Cache-Control", "no-cache")
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class DigestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], api: DigestApi, verbose: bool = False):
+        super().__init__(address, _RequestHandler)
+        self.api = api
+        self.verbose = verbose
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.api.cache.close()
+
+
+def make_server(
+    session_factory: sessionmaker[Session],
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    cache_size: int = 256,
+    verbose: bool = False,
+) -> DigestServer:
+    return DigestServer((host, port), DigestApi(session_factory, cache_size), verbose)
@@ -0,0 +1,251 @@
+"""Move cold articles into per-month archive databases and read them back transparently.
+
+Archived months live next to the hot database in ``<stem>_archive/articles_YYYY-MM.db``.
+For a date range that reaches into them, ``with_archives`` yields a session factory
+whose connections ATTACH those files and shadow ``articles``/``article_summaries`` with
+TEMP views over the hot and archived rows, so the repository queries run unchanged.
+Both tables use AUTOINCREMENT ids, so an archived id is never handed out again.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from datetime import date
+from pathlib import Path
+import sqlite3
+
+from sqlalchemy import (
+    MetaData,
+    Table,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from .db import _build_sqlite_url
+from .models import Article, ArticleSummary
+from .search import index_missing_articles, unindex_articles
+
+ARCHIVED_TABLES = (Article.__table__, ArticleSummary.__table__)
+_EFFECTIVE_AT = func.coalesce(Article.published, Article.created_at)
+_MONTH = func.strftime("%Y-%m", _EFFECTIVE_AT)
+_ARCHIVE_SCHEMA = "archive"
+_ARTICLE_KEYS = {Article.__table__: Article.id, ArticleSummary.__table__: ArticleSummary.article_id}
+_archive_metadata = MetaData()
+_ARCHIVE_TARGETS = {
+    table.name: table.to_metadata(_archive_metadata, schema=_ARCHIVE_SCHEMA)
+    for table in ARCHIVED_TABLES
+}
+
+
+def archive_dir(db_path: str) -> Path:
+    path = Path(db_path)
+    return path.with_name(f"{path.stem}_archive")
+
+
+def archive_path(db_path: str, month: str) -> Path:
+    return archive_dir(db_path) / f"articles_{month}.db"
+
+
+def _month_key(day: date) -> str:
+    # Unlike strftime, pads the year, so date.min and date.max sort with real months.
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def _create_archive(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(_build_sqlite_url(str(path)))
+    try:
+        Article.metadata.create_all(engine, tables=list(ARCHIVED_TABLES))
+    finally:
+        engine.dispose()
+
+
+def raise_id_floor(engine: Engine, db_path: str) -> None:
+    """Make the next article and summary ids higher than any archived one.
+
+    AUTOINCREMENT keeps ids above the highest ever used, but databases that archived before
+    it was introduced never recorded the ids they moved out.
+    """
+    floors = {table.name: 0 for table in ARCHIVED_TABLES}
+    for path in sorted(archive_dir(db_path).glob("articles_*.db")):
+        with closing(sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)) as archive:
+            for name, floor in list(floors.items()):
+                (highest,) = archive.execute(f"SELECT coalesce(max(id), 0) FROM {name}").fetchone()
+                floors[name] = max(floor, highest)
+    with engine.begin() as connection:
+        for name, floor in floors.items():
+            params = {"name": name, "floor": floor}
+            connection.execute(
+                text("UPDATE sqlite_sequence SET seq = :floor WHERE name = :name AND seq < :floor"),
+                params,
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT :name, :floor "
+                    "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = :name)"
+                ),
+                params,
+            )
+
+
+def _move_month(engine: Engine, path: Path, month: str, before: date) -> None:
+    moving = select(Article.id).where(
+        _MONTH == month, func.date(_EFFECTIVE_AT) < before.isoformat()
+    )
+    archived = _ARCHIVE_TARGETS[Article.__table__.name]
+    archived_summaries = _ARCHIVE_TARGETS[ArticleSummary.__table__.name]
+    # Archive rows that clash with a moving article (same id, link or guid, e.g. an article
+    # re-ingested after its first copy was archived) are replaced by the hot version.
+    clashing = select(archived.c.id).where(
+        or_(
+            archived.c.id.in_(moving),
+            archived.c.link.in_(select(Article.link).where(Article.id.in_(moving))),
+            archived.c.guid.in_(select(Article.guid).where(Article.id.in_(moving))),
+        )
+    )
+    with engine.connect() as connection:
+        connection.exec_driver_sql(f"ATTACH DATABASE ? AS {_ARCHIVE_SCHEMA}", (str(path),))
+        connection.commit()
+        try:
+            # Copies and deletes share one transaction, so a failure leaves both files as-is.
+            with connection.begin():
+                connection.execute(
+                    delete(archived_summaries).where(
+                        or_(
+                            archived_summaries.c.article_id.in_(clashing),
+                            archived_summaries.c.article_id.in_(moving),
+                            archived_summaries.c.id.in_(
+                                select(ArticleSummary.id).where(
+                                    ArticleSummary.article_id.in_(moving)
+                                )
+                            ),
+                        )
+                    )
+                )
+                unindex_articles(connection, clashing)
+                connection.execute(delete(archived).where(archived.c.id.in_(clashing)))
+                for table, key in _ARTICLE_KEYS.items():
+                    rows = select(*table.c).where(key.in_(moving))
+                    target = _ARCHIVE_TARGETS[table.name]
+                    connection.execute(insert(target).from_select(list(table.c.keys()), rows))
+                connection.execute(
+                    delete(ArticleSummary).where(ArticleSummary.article_id.in_(moving))
+                )
+                connection.execute(delete(Article).where(Article.id.in_(moving)))
+                # The delete triggers dropped the moved articles from the search index.
+                index_missing_articles(connection, _ARCHIVE_SCHEMA)
+        finally:
+            connection.exec_driver_sql(f"DETACH DATABASE {_ARCHIVE_SCHEMA}")
+            connection.commit()
+
+
+def archive_articles(
+    session_factory: sessionmaker[Session], db_path: str, before: date, dry_run: bool = False
+) -> dict[str, int]:
+    """Move articles whose effective date is before ``before`` into monthly archives.
+
+    Returns the number of articles per archived month. Aggregate stats and trending counts
+    are left alone, so totals still include archived articles.
+    """
+    with session_factory() as session:
+        stmt = (
+            select(_MONTH, func.count())
+            .where(func.date(_EFFECTIVE_AT) < before.isoformat())
+            .group_by(_MONTH)
+            .order_by(_MONTH)
+        )
+        counts = {month: count for month, count in session.execute(stmt)}
+    if dry_run:
+        return counts
+
+    engine = session_factory.kw["bind"]
+    for month in counts:
+        path = archive_path(db_path, month)
+        _create_archive(path)
+        _move_month(engine, path, month, before)
+    return counts
+
+
+def _select(table: Table, source: str) -> str:
+    return f"SELECT {', '.join(table.c.keys())} FROM {source}.{table.name}"
+
+
+def _shadow_with_archives(connection: sqlite3.Connection, paths: list[Path]) -> None:
+    cursor = connection.cursor()
+    if len(paths) <= connection.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED):
+        schemas = []
+        for index, path in enumerate(paths):
+            schema = f"archive_{index}"
+            cursor.execute(f"ATTACH DATABASE ? AS {schema}", (str(path),))
+            schemas.append(schema)
+        sources = {
+            table.name: [f"{schema}.{table.name}" for schema in schemas]
+            for table in ARCHIVED_TABLES
+        }
+    else:
+        # More months than ATTACH slots: copy them, one attachment at a time, into temp tables.
+        sources = {}
+        for table in ARCHIVED_TABLES:
+            cursor.execute(
+                f"CREATE TEMP TABLE archived_{table.name} AS {_select(table, 'main')} LIMIT 0"
+            )
+            sources[table.name] = [f"temp.archived_{table.name}"]
+        for path in paths:
+            cursor.execute("ATTACH DATABASE ? AS archive_copy", (str(path),))
+            for table in ARCHIVED_TABLES:
+                cursor.execute(
+                    f"INSERT INTO temp.archived_{table.name} {_select(table, 'archive_copy')}"
+                )
+            connection.commit()
+            cursor.execute("DETACH DATABASE archive_copy")
+
+    for table in ARCHIVED_TABLES:
+        parts = [_select(table, "main")]
+        parts.extend(
+            f"SELECT {', '.join(table.c.keys())} FROM {source}" for source in sources[table.name]
+        )
+        cursor.execute(f"CREATE TEMP VIEW {table.name} AS {' UNION ALL '.join(parts)}")
+    cursor.close()
+
+
+@contextmanager
+def with_archives(
+    session_factory: sessionmaker[Session], db_path: str, start: date, end: date
+) -> Iterator[sessionmaker[Session]]:
+    """Yield a session factory that also sees archived months in ``[start, end]``.
+
+    Reads of ``articles``/``article_summaries`` cover both databases, so digests and
+    ``search`` (archived articles keep their index entries in the hot database) see both;
+    writes, such as digest fragments cached for archived articles, go to the hot database.
+    Yields ``session_factory`` itself when none of those months is archived; otherwise the
+    engine holding the attached archives is disposed of on exit.
+    """
+    first, last = _month_key(start), _month_key(end)
+    paths = [
+        path
+        for path in sorted(archive_dir(db_path).glob("articles_*.db"))
+        if first <= path.stem.removeprefix("articles_") <= last
+    ]
+    if not paths:
+        yield session_factory
+        return
+
+    engine = create_engine(_build_sqlite_url(db_path), future=True)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, _record) -> None:
+        _shadow_with_archives(dbapi_connection, paths)
+
+    try:
+        yield sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    finally:
+        engine.dispose()
@@ -2,11 +2,16 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import MetaData, Table, create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateTable
 from sqlalchemy.orm import Session, sessionmaker
 
-from .models import Base
+from .fragments import install_fragment_triggers
+from .models import Article, ArticleFragment, ArticleSummary, Base
+from .search import install_search_index
+from .stats import install_stats
+from .trending import install_trending
 
 
 def _build_sqlite_url(db_path: str) -> str:
@@ -16,10 +21,103 @@ def _build_sqlite_url(db_path: str) -> str:
     return f"sqlite:///{db_path.replace(chr(92), '/')}"
 
 
+def _ensure_indexes(engine: Engine) -> None:
+    # create_all() skips indexes of tables that already exist, e.g. in older databases.
+    # Look names up directly: the inspector does not report SQLite expression indexes.
+    with engine.begin() as connection:
+        existing = set(
+            connection.scalars(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+        )
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(connection)
+
+
+def _add_missing_columns(engine: Engine) -> None:
+    # create_all() never alters existing tables; add nullable columns introduced later.
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {
+                row[1] for row in connection.execute(text(f"PRAGMA table_info({table.name})"))
+            }
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                )
+
+
+def _rebuild_table(connection: Connection, table: Table) -> None:
+    # SQLite cannot add AUTOINCREMENT in place: copy the rows into a fresh table and swap
+    # it in. Indexes and triggers go with the old table; init_db recreates them after.
+    scratch = MetaData()
+    for existing in Base.metadata.sorted_tables:
+        # Foreign keys of the copy must resolve against the tables they point at.
+        existing.to_metadata(scratch)
+    rebuilt = table.to_metadata(scratch, name=f"{table.name}_rebuilt")
+    columns = ", ".join(table.c.keys())
+    connection.execute(CreateTable(rebuilt))
+    connection.execute(
+        text(f"INSERT INTO {rebuilt.name} ({columns}) SELECT {columns} FROM {table.name}")
+    )
+    connection.execute(text(f"DROP TABLE {table.name}"))
+    connection.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {table.name}"))
+
+
+def _ensure_autoincrement(engine: Engine) -> bool:
+    """Rebuild article tables created before their ids became AUTOINCREMENT.
+
+    Without it SQLite hands out the ids of the newest rows again once they are archived.
+    Returns whether anything was rebuilt.
+    """
+    rebuilt = False
+    with engine.begin() as connection:
+        for table in (Article.__table__, ArticleSummary.__table__):
+            sql = connection.scalar(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": table.name},
+            )
+            if sql is not None and "AUTOINCREMENT" not in sql.upper():
+                _rebuild_table(connection, table)
+                rebuilt = True
+        if rebuilt:
+            # Ids may already have been reused, so cached fragments cannot be trusted.
+            connection.execute(ArticleFragment.__table__.delete())
+    return rebuilt
+
+
+def compact_database(db_path: str, analyze: bool = True, vacuum: bool = True) -> None:
+    """Refresh planner statistics and/or rebuild the file to drop free pages."""
+    engine = create_engine(_build_sqlite_url(db_path), future=True)
+    try:
+        # VACUUM cannot run inside a transaction.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            if analyze:
+                connection.exec_driver_sql("ANALYZE")
+            if vacuum:
+                connection.exec_driver_sql("VACUUM")
+            connection.exec_driver_sql("PRAGMA optimize")
+    finally:
+        engine.dispose()
+
+
 def init_db(db_path: str) -> sessionmaker[Session]:
     if db_path != ":memory:":
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     engine: Engine = create_engine(_build_sqlite_url(db_path), future=True)
     Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+    _add_missing_columns(engine)
+    if _ensure_autoincrement(engine) and db_path != ":memory:":
+        # Imported here: the archive module builds on this one.
+        from .archive import raise_id_floor
 
+        raise_id_floor(engine, db_path)
+    _ensure_indexes(engine)
+    install_search_index(engine)
+    install_fragment_triggers(engine)
+    install_stats(engine)
+    install_trending(engine)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
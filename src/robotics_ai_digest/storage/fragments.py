@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .models import ArticleFragment
+
+# Any change to an article or its AI summary drops the cached fragment.
+_FRAGMENT_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS article_fragments_article_update
+    AFTER UPDATE OF title, link, published, summary, source ON articles BEGIN
+        DELETE FROM article_fragments WHERE article_id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_fragments_article_delete
+    AFTER DELETE ON articles BEGIN
+        DELETE FROM article_fragments WHERE article_id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_fragments_summary_insert
+    AFTER INSERT ON article_summaries BEGIN
+        DELETE FROM article_fragments WHERE article_id = new.article_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_fragments_summary_update
+    AFTER UPDATE ON article_summaries BEGIN
+        DELETE FROM article_fragments WHERE article_id IN (old.article_id, new.article_id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS article_fragments_summary_delete
+    AFTER DELETE ON article_summaries BEGIN
+        DELETE FROM article_fragments WHERE article_id = old.article_id;
+    END""",
+)
+
+
+def install_fragment_triggers(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for statement in _FRAGMENT_TRIGGERS:
+            connection.execute(text(statement))
+
+
+def save_fragments(session: Session, fragments: dict[int, str], format_version: int) -> None:
+    if not fragments:
+        return
+    stmt = insert(ArticleFragment)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ArticleFragment.article_id],
+        set_={"format_version": stmt.excluded.format_version, "fragment": stmt.excluded.fragment},
+    )
+    session.execute(
+        stmt,
+        [
+            {"article_id": article_id, "format_version": format_version, "fragment": fragment}
+            for article_id, fragment in fragments.items()
+        ],
+    )
+    session.commit()
@@ -2,7 +2,18 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    true,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -12,6 +23,8 @@ class Base(DeclarativeBase):
 
 class Article(Base):
     __tablename__ = "articles"
+    # Ids are never reused, so archived articles and their cached fragments keep theirs.
+    __table_args__ = {"sqlite_autoincrement": True}  # noqa: RUF012
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -24,6 +37,7 @@ class Article(Base):
         DateTime(timezone=True),
         nullable=False,
         server_default=func.now(),
+        index=True,
     )
     ai_summary_record: Mapped["ArticleSummary | None"] = relationship(
         back_populates="article",
@@ -31,13 +45,90 @@ class Article(Base):
     )
 
 
+# Expression indexes matching the newest-first keyset ordering used by list/summaries.
+Index(
+    "ix_articles_effective_at_id",
+    func.coalesce(Article.published, Article.created_at),
+    Article.id,
+)
+Index(
+    "ix_articles_source_effective_at_id",
+    Article.source,
+    func.coalesce(Article.published, Article.created_at),
+    Article.id,
+)
+# Day lookups and ranges (digests, date listings) filter on date(published).
+Index("ix_articles_published_day", func.date(Article.published))
+
+
 class ArticleSummary(Base):
     __tablename__ = "article_summaries"
+    __table_args__ = {"sqlite_autoincrement": True}  # noqa: RUF012
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     article_id: Mapped[int] = mapped_column(ForeignKey("articles.id"), unique=True, nullable=False)
     summary_ai: Mapped[str] = mapped_column(Text, nullable=False)
     bullets_ai: Mapped[str] = mapped_column(Text, nullable=False)
-    summarized_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    summarized_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    # Usage reported by the summarizer for the latest run; NULL for mock/legacy summaries.
+    input_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cost_usd: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Model that wrote the summary ("extractive" when no API was called); NULL for
+    # mock/legacy summaries.
+    model: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
     article: Mapped[Article] = relationship(back_populates="ai_summary_record")
+
+
+class ArticleFragment(Base):
+    """Cached rendered digest markdown for one article; cleared by triggers on change."""
+
+    __tablename__ = "article_fragments"
+
+    article_id: Mapped[int] = mapped_column(ForeignKey("articles.id"), primary_key=True)
+    format_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    fragment: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class Feed(Base):
+    __tablename__ = "feeds"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    url: Mapped[str] = mapped_column(String(1000), unique=True, nullable=False, index=True)
+    title: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    enabled: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class DailySourceStats(Base):
+    """Running totals per article day and source, kept current by the repository writers.
+
+    ``day`` is the article's effective date (published, else ingested), as in digests.
+    """
+
+    __tablename__ = "daily_source_stats"
+
+    day: Mapped[str] = mapped_column(String(10), primary_key=True)
+    source: Mapped[str] = mapped_column(String(255), primary_key=True)
+    articles: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    summarized: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")
+
+
+class DailyTermCount(Base):
+    """How many articles of a day mention a term; maintained at ingest for trending queries."""
+
+    __tablename__ = "daily_term_counts"
+
+    day: Mapped[str] = mapped_column(String(10), primary_key=True)
+    term: Mapped[str] = mapped_column(String(255), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
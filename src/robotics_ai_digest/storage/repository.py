@@ -1,64 +1,92 @@
 from __future__ import annotations
 
+import base64
+from collections.abc import Collection, Iterable, Iterator
 from datetime import date, datetime, timezone
+import hashlib
 import json
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    func,
+    literal,
+    or_,
+    select,
+    type_coerce,
+    union,
+)
 from sqlalchemy.orm import Session, selectinload
 
-from .models import Article, ArticleSummary
+from robotics_ai_digest.feeds.items import FeedItem, as_feed_items
+from robotics_ai_digest.metrics import METRICS
 
+from .models import Article, ArticleFragment, ArticleSummary, Feed
+from .rows import ARTICLE_ROW_COLUMNS, ArticlePage, ArticleRow, SummaryCandidate
+from .stats import record_new_articles, record_summary
+from .trending import record_article_terms
 
-def _parse_datetime(value: str | None) -> datetime | None:
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        return None
+_EFFECTIVE_AT = func.coalesce(Article.published, Article.created_at)
+_ID_CHUNK = 500
 
 
-def upsert_articles(session: Session, articles: list[dict]) -> tuple[int, int]:
-    if not articles:
-        return 0, 0
+@METRICS.timed("db_upsert")
+def insert_new_articles(
+    session: Session, articles: Iterable[FeedItem | dict]
+) -> tuple[list[Article], int]:
+    """Insert unseen items and return the new ``Article`` rows plus the duplicate count."""
+    items = as_feed_items(articles)
+    if not items:
+        return [], 0
 
-    links = [item.get("link") for item in articles if item.get("link")]
-    guids = [item.get("guid") for item in articles if item.get("guid")]
+    links = [item.link for item in items]
+    guids = [item.guid for item in items if item.guid]
 
     existing_links = set(session.scalars(select(Article.link).where(Article.link.in_(links))).all())
     existing_guids = set(session.scalars(select(Article.guid).where(Article.guid.in_(guids))).all())
 
-    new_count = 0
+    new_articles: list[Article] = []
     duplicate_count = 0
     seen_links = set(existing_links)
     seen_guids = set(existing_guids)
 
-    for item in articles:
-        link = item.get("link")
-        guid = item.get("guid")
-        if not link:
-            continue
+    for item in items:
+        link = item.link
+        guid = item.guid
         if link in seen_links or (guid and guid in seen_guids):
             duplicate_count += 1
             continue
 
         article = Article(
-            title=item.get("title") or "(untitled)",
+            title=item.title or "(untitled)",
             link=link,
             guid=guid,
-            published=_parse_datetime(item.get("published")),
-            summary=item.get("summary"),
-            source=item.get("source") or "unknown",
+            published=item.published,
+            summary=item.summary,
+            source=item.source or "unknown",
         )
         session.add(article)
         seen_links.add(link)
         if guid:
             seen_guids.add(guid)
-        new_count += 1
+        new_articles.append(article)
 
+    if new_articles:
+        session.flush()
+        record_new_articles(session, [article.id for article in new_articles])
+        record_article_terms(session, new_articles)
     session.commit()
-    return new_count, duplicate_count
+    METRICS.count("upsert_rows", len(items))
+    METRICS.count("articles_new", len(new_articles))
+    METRICS.count("articles_duplicate", duplicate_count)
+    return new_articles, duplicate_count
+
+
+def upsert_articles(session: Session, articles: Iterable[FeedItem | dict]) -> tuple[int, int]:
+    new_articles, duplicate_count = insert_new_articles(session, articles)
+    return len(new_articles), duplicate_count
 
 
 def get_recent_articles(
@@ -82,6 +110,187 @@ def get_articles_for_date(session: Session, date: date) -> list[Article]:
     return list(session.scalars(stmt).all())
 
 
+def _article_rows_select() -> Select:
+    return select(*ARTICLE_ROW_COLUMNS).outerjoin(
+        ArticleSummary, ArticleSummary.article_id == Article.id
+    )
+
+
+def iter_article_rows(
+    session: Session, stmt: Select, batch_size: int = 1000
+) -> Iterator[ArticleRow]:
+    """Stream ``ArticleRow`` records without ORM identity-map or relationship overhead."""
+    result = session.execute(stmt.execution_options(yield_per=batch_size))
+    for row in result:
+        yield ArticleRow(*row)
+
+
+def encode_cursor(sort_key: str, article_id: int) -> str:
+    payload = json.dumps([sort_key, article_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, article_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+    if not isinstance(sort_key, str) or not isinstance(article_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return sort_key, article_id
+
+
+def get_article_page(
+    session: Session,
+    limit: int = 10,
+    source: str | None = None,
+    summarized_only: bool = False,
+    cursor: str | None = None,
+) -> ArticlePage:
+    """Return one page of articles, newest first, using keyset pagination.
+
+    The cursor holds the raw stored sort timestamp and id of the last row, so every page is
+    an index range scan starting at that position instead of an OFFSET skip.
+    """
+    # Compare the stored text directly; round-tripping through datetime would change its format.
+    sort_key = type_coerce(_EFFECTIVE_AT, String)
+    stmt = select(*ARTICLE_ROW_COLUMNS, sort_key)
+    if summarized_only:
+        stmt = stmt.join(ArticleSummary, ArticleSummary.article_id == Article.id)
+    else:
+        stmt = stmt.outerjoin(ArticleSummary, ArticleSummary.article_id == Article.id)
+    if source:
+        stmt = stmt.where(Article.source == source)
+    if cursor:
+        last_key, last_id = decode_cursor(cursor)
+        # Expanded form of (key, id) < (last_key, last_id); SQLite only seeks the index with it.
+        stmt = stmt.where(sort_key <= last_key, or_(sort_key < last_key, Article.id < last_id))
+    stmt = stmt.order_by(_EFFECTIVE_AT.desc(), Article.id.desc()).limit(limit + 1)
+
+    result = list(session.execute(stmt))
+    rows = [ArticleRow(*row[:-1]) for row in result[:limit]]
+    next_cursor = None
+    if len(result) > limit and rows:
+        next_cursor = encode_cursor(result[limit - 1][-1], rows[-1].id)
+    return ArticlePage(rows=rows, next_cursor=next_cursor)
+
+
+def get_recent_article_rows(
+    session: Session, limit: int = 10, source: str | None = None
+) -> list[ArticleRow]:
+    return get_article_page(session, limit=limit, source=source).rows
+
+
+def _period_bucket(period: str) -> ColumnElement[str]:
+    if period == "day":
+        return func.date(Article.published)
+    if period == "week":
+        # Monday of the ISO week: jump to the next Sunday (or stay on it), then back six days.
+        return func.date(Article.published, "weekday 0", "-6 days")
+    if period == "month":
+        return func.strftime("%Y-%m", Article.published)
+    raise ValueError(f"Unknown period: {period}")
+
+
+def _in_published_range(stmt: Select, start: date, end: date) -> Select:
+    return (
+        stmt.where(Article.published.is_not(None))
+        .where(func.date(Article.published) >= start.isoformat())
+        .where(func.date(Article.published) <= end.isoformat())
+    )
+
+
+def iter_article_rows_for_range(
+    session: Session,
+    start: date,
+    end: date,
+    period: str = "day",
+    buckets: Collection[str] | None = None,
+    fragment_version: int | None = None,
+) -> Iterator[tuple[str, ArticleRow]]:
+    """Stream ``(bucket, row)`` pairs for published dates in ``[start, end]`` in one query.
+
+    Buckets (``YYYY-MM-DD`` days, Monday dates for weeks, ``YYYY-MM`` months) come out in
+    ascending order. Within a bucket rows are newest first with each source's rows kept
+    contiguous, sources ordered by their newest article: the grouping order
+    ``render_digest`` produces, so digests can be rendered without buffering. ``buckets``
+    optionally restricts the output to the given bucket keys, and ``fragment_version``
+    fills ``ArticleRow.fragment`` from cached fragments rendered with that format version.
+    """
+    bucket = _period_bucket(period)
+    # Ties go to the lower id, the order SQLite returns them in for get_articles_for_date.
+    newest_first = (Article.published.desc(), Article.created_at.desc(), Article.id.asc())
+    position = func.row_number().over(partition_by=bucket, order_by=newest_first)
+    fragment = literal(None, String).label("fragment")
+    stmt = _article_rows_select()
+    if fragment_version is not None:
+        fragment = ArticleFragment.fragment.label("fragment")
+        stmt = stmt.outerjoin(
+            ArticleFragment,
+            (ArticleFragment.article_id == Article.id)
+            & (ArticleFragment.format_version == fragment_version),
+        )
+    stmt = stmt.add_columns(fragment, bucket.label("bucket"), position.label("position"))
+    stmt = _in_published_range(stmt, start, end)
+    if buckets is not None:
+        stmt = stmt.where(bucket.in_(list(buckets)))
+    ranked = stmt.subquery()
+    source_rank = func.min(ranked.c.position).over(partition_by=(ranked.c.bucket, ranked.c.source))
+    columns = [ranked.c[col.key] for col in ARTICLE_ROW_COLUMNS]
+    stmt = select(*columns, ranked.c.fragment, ranked.c.bucket).order_by(
+        ranked.c.bucket, source_rank, ranked.c.position
+    )
+    result = session.execute(stmt.execution_options(yield_per=1000))
+    for row in result:
+        yield row[-1], ArticleRow(*row[:-1])
+
+
+def iter_article_rows_for_date(
+    session: Session, date: date, fragment_version: int | None = None
+) -> Iterator[ArticleRow]:
+    for _, row in iter_article_rows_for_range(
+        session, date, date, fragment_version=fragment_version
+    ):
+        yield row
+
+
+def get_bucket_fingerprints(
+    session: Session, start: date, end: date, period: str = "day"
+) -> dict[str, str]:
+    """Hash each bucket's article ids and summary timestamps to detect digest changes."""
+    bucket = _period_bucket(period)
+    stmt = select(bucket, Article.id, type_coerce(ArticleSummary.summarized_at, String)).outerjoin(
+        ArticleSummary, ArticleSummary.article_id == Article.id
+    )
+    stmt = _in_published_range(stmt, start, end).order_by(bucket, Article.id)
+
+    fingerprints: dict[str, str] = {}
+    current: str | None = None
+    digest = hashlib.sha256()
+    for key, article_id, summarized_at in session.execute(stmt):
+        if key != current:
+            if current is not None:
+                fingerprints[current] = digest.hexdigest()
+            current, digest = key, hashlib.sha256()
+        digest.update(f"{article_id}:{summarized_at or ''};".encode())
+    if current is not None:
+        fingerprints[current] = digest.hexdigest()
+    return fingerprints
+
+
+def get_changed_buckets(session: Session, since: datetime, period: str = "day") -> set[str]:
+    """Buckets holding articles ingested or summarized at or after ``since`` (UTC)."""
+    bucket = _period_bucket(period)
+    ingested = select(bucket).where(Article.published.is_not(None), Article.created_at >= since)
+    summarized = (
+        select(bucket)
+        .join(ArticleSummary, ArticleSummary.article_id == Article.id)
+        .where(Article.published.is_not(None), ArticleSummary.summarized_at >= since)
+    )
+    return set(session.scalars(union(ingested, summarized)))
+
+
 def get_articles_missing_ai_summary(session: Session, limit: int = 10) -> list[Article]:
     stmt = (
         select(Article)
@@ -93,19 +302,106 @@ def get_articles_missing_ai_summary(session: Session, limit: int = 10) -> list[A
     return list(session.scalars(stmt).all())
 
 
-def save_ai_summary(session: Session, article_id: int, summary: str, bullets: list[str]) -> None:
+@METRICS.timed("db_summary_candidates")
+def get_summary_candidates(session: Session) -> list[SummaryCandidate]:
+    """Every article without an AI summary, as compact rows for budget planning.
+
+    Ages and lengths are computed by SQLite, so no datetimes are parsed in Python.
+    """
+    stmt = (
+        select(
+            Article.id,
+            Article.source,
+            Article.title,
+            # Future-dated entries count as brand new.
+            func.max(0.0, func.julianday("now") - func.julianday(_EFFECTIVE_AT)),
+            func.length(func.coalesce(Article.summary, Article.title)),
+        )
+        .outerjoin(ArticleSummary, ArticleSummary.article_id == Article.id)
+        .where(ArticleSummary.id.is_(None))
+    )
+    return [SummaryCandidate(*row) for row in session.execute(stmt)]
+
+
+def get_articles_by_ids(session: Session, article_ids: list[int]) -> list[Article]:
+    """Load articles by primary key, in the order of ``article_ids``."""
+    found: dict[int, Article] = {}
+    for start in range(0, len(article_ids), _ID_CHUNK):
+        chunk = article_ids[start : start + _ID_CHUNK]
+        found.update(
+            (article.id, article)
+            for article in session.scalars(select(Article).where(Article.id.in_(chunk)))
+        )
+    return [found[article_id] for article_id in article_ids if article_id in found]
+
+
+@METRICS.timed("db_save_summary")
+def save_ai_summary(
+    session: Session,
+    article_id: int,
+    summary: str,
+    bullets: list[str],
+    input_tokens: int | None = None,
+    output_tokens: int | None = None,
+    cost_usd: float | None = None,
+    model: str | None = None,
+) -> None:
     record = session.scalar(select(ArticleSummary).where(ArticleSummary.article_id == article_id))
     payload = json.dumps(bullets, ensure_ascii=False)
+    first_summary = record is None
     if record is None:
-        record = ArticleSummary(
-            article_id=article_id,
-            summary_ai=summary,
-            bullets_ai=payload,
-            summarized_at=datetime.now(timezone.utc),
-        )
+        record = ArticleSummary(article_id=article_id)
         session.add(record)
-    else:
-        record.summary_ai = summary
-        record.bullets_ai = payload
-        record.summarized_at = datetime.now(timezone.utc)
+    record.summary_ai = summary
+    record.bullets_ai = payload
+    record.summarized_at = datetime.now(timezone.utc)
+    record.input_tokens = input_tokens
+    record.output_tokens = output_tokens
+    record.cost_usd = cost_usd
+    record.model = model
+    session.flush()
+    record_summary(session, article_id, first_summary, input_tokens, output_tokens, cost_usd)
+    session.commit()
+
+
+def add_feeds(session: Session, feeds: list[tuple[str, str | None]]) -> tuple[int, int]:
+    """Register (url, title) pairs; existing URLs are left untouched."""
+    if not feeds:
+        return 0, 0
+
+    urls = list(dict.fromkeys(url for url, _ in feeds))
+    existing: set[str] = set()
+    # Chunked: a large OPML import would exceed SQLite's bound-parameter limit.
+    for start in range(0, len(urls), _ID_CHUNK):
+        chunk = urls[start : start + _ID_CHUNK]
+        existing.update(session.scalars(select(Feed.url).where(Feed.url.in_(chunk))))
+
+    new_count = 0
+    duplicate_count = 0
+    for url, title in feeds:
+        if url in existing:
+            duplicate_count += 1
+            continue
+        session.add(Feed(url=url, title=title))
+        existing.add(url)
+        new_count += 1
+
+    session.commit()
+    return new_count, duplicate_count
+
+
+def get_feeds(session: Session, enabled_only: bool = False) -> list[Feed]:
+    stmt = select(Feed)
+    if enabled_only:
+        stmt = stmt.where(Feed.enabled.is_(True))
+    stmt = stmt.order_by(Feed.id)
+    return list(session.scalars(stmt).all())
+
+
+def set_feed_enabled(session: Session, url: str, enabled: bool) -> bool:
+    feed = session.scalar(select(Feed).where(Feed.url == url))
+    if feed is None:
+        return False
+    feed.enabled = enabled
     session.commit()
+    return True
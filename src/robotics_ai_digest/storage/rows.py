@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .models import Article, ArticleSummary
+
+# Column order matches the ArticleRow fields; select these and build rows positionally.
+ARTICLE_ROW_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.link,
+    Article.guid,
+    Article.published,
+    Article.summary,
+    Article.source,
+    Article.created_at,
+    ArticleSummary.summary_ai,
+    ArticleSummary.bullets_ai,
+    ArticleSummary.summarized_at,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class ArticleRow:
+    """Read-only article record with its AI summary columns flattened in."""
+
+    id: int
+    title: str
+    link: str
+    guid: str | None
+    published: datetime | None
+    summary: str | None
+    source: str
+    created_at: datetime
+    summary_ai: str | None = None
+    bullets_ai: str | None = None
+    summarized_at: datetime | None = None
+    # Cached rendered digest markdown, when the query joined article_fragments.
+    fragment: str | None = None
+
+    @property
+    def effective_at(self) -> datetime:
+        return self.published or self.created_at
+
+    @classmethod
+    def from_article(cls, article: Article) -> ArticleRow:
+        record = article.ai_summary_record
+        return cls(
+            id=article.id,
+            title=article.title,
+            link=article.link,
+            guid=article.guid,
+            published=article.published,
+            summary=article.summary,
+            source=article.source,
+            created_at=article.created_at,
+            summary_ai=record.summary_ai if record else None,
+            bullets_ai=record.bullets_ai if record else None,
+            summarized_at=record.summarized_at if record else None,
+        )
+
+
+def as_article_row(article: Article | ArticleRow) -> ArticleRow:
+    return article if isinstance(article, ArticleRow) else ArticleRow.from_article(article)
+
+
+@dataclass(slots=True, frozen=True)
+class ArticlePage:
+    rows: list[ArticleRow]
+    next_cursor: str | None = None
+
+
+# Not frozen: frozen dataclasses build several times slower, and backlogs have 100k+ rows.
+@dataclass(slots=True)
+class SummaryCandidate:
+    """What the budget planner needs to know about an article awaiting a summary."""
+
+    id: int
+    source: str
+    title: str
+    # Days since the article was published (else ingested).
+    age_days: float
+    # Length of the text that would be summarized: the feed summary, else the title.
+    chars: int
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import (
+    Float,
+    Select,
+    String,
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .models import Article, ArticleSummary
+from .rows import ARTICLE_ROW_COLUMNS, ArticleRow
+
+FTS_TABLE = "articles_fts"
+
+_FTS_DDL = (
+    (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, summary, summary_ai, bullets, tokenize = 'unicode61 remove_diacritics 2')"
+    ),
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, summary, summary_ai, bullets)
+        VALUES (new.id, new.title, coalesce(new.summary, ''), '', '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary
+    ON articles BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, summary = coalesce(new.summary, '')
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS article_summaries_fts_insert AFTER INSERT
+    ON article_summaries BEGIN
+        UPDATE {FTS_TABLE} SET summary_ai = new.summary_ai, bullets = new.bullets_ai
+        WHERE rowid = new.article_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS article_summaries_fts_update AFTER UPDATE
+    OF summary_ai, bullets_ai ON article_summaries BEGIN
+        UPDATE {FTS_TABLE} SET summary_ai = new.summary_ai, bullets = new.bullets_ai
+        WHERE rowid = new.article_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS article_summaries_fts_delete AFTER DELETE
+    ON article_summaries BEGIN
+        UPDATE {FTS_TABLE} SET summary_ai = '', bullets = '' WHERE rowid = old.article_id;
+    END""",
+)
+
+# ``{schema}`` is empty for the tables in scope (which may be archive views) or "name.".
+_FTS_BACKFILL = f"""
+    INSERT INTO {FTS_TABLE}(rowid, title, summary, summary_ai, bullets)
+    SELECT a.id, a.title, coalesce(a.summary, ''), coalesce(s.summary_ai, ''),
+           coalesce(s.bullets_ai, '')
+    FROM {{schema}}articles AS a LEFT JOIN {{schema}}article_summaries AS s
+    ON s.article_id = a.id
+"""
+
+# bm25 column weights: title, feed summary, AI summary, AI bullets.
+_RANK = literal_column(f"bm25({FTS_TABLE}, 10.0, 3.0, 5.0, 2.0)", Float)
+_SNIPPET = literal_column(f"snippet({FTS_TABLE}, -1, '[', ']', '...', 12)", String)
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    article: ArticleRow
+    snippet: str
+    score: float
+
+
+def _fts_exists(connection: Connection) -> bool:
+    return bool(
+        connection.scalar(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        )
+    )
+
+
+def install_search_index(engine: Engine) -> bool:
+    """Create the FTS5 index and its sync triggers; returns False if FTS5 is unavailable."""
+    try:
+        with engine.begin() as connection:
+            created = not _fts_exists(connection)
+            for statement in _FTS_DDL:
+                connection.execute(text(statement))
+            if created:
+                connection.execute(text(_FTS_BACKFILL.format(schema="")))
+    except OperationalError:
+        return False
+    return True
+
+
+def rebuild_search_index(session: Session) -> None:
+    session.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    session.execute(text(_FTS_BACKFILL.format(schema="")))
+    session.commit()
+
+
+def unindex_articles(connection: Connection, ids: Select) -> None:
+    """Drop the index entries of the articles ``ids`` selects, if the index exists."""
+    if _fts_exists(connection):
+        connection.execute(delete(_fts).where(_fts.c.rowid.in_(ids)))
+
+
+def index_missing_articles(connection: Connection, schema: str) -> None:
+    """Index the articles of attached database ``schema`` that the index lacks.
+
+    Archived articles keep their entries in the hot database's index, which is how
+    ``search`` still finds them through ``with_archives``.
+    """
+    if _fts_exists(connection):
+        connection.execute(
+            text(
+                _FTS_BACKFILL.format(schema=f"{schema}.")
+                + f" WHERE a.id NOT IN (SELECT rowid FROM {FTS_TABLE})"
+            )
+        )
+
+
+def search_articles(
+    session: Session,
+    query: str,
+    limit: int = 20,
+    source: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[SearchHit]:
+    """Rank articles matching an FTS5 query (terms, "phrases", prefix*, AND/OR/NOT)."""
+    effective_day = func.date(func.coalesce(Article.published, Article.created_at))
+    stmt = (
+        select(*ARTICLE_ROW_COLUMNS, _SNIPPET, _RANK)
+        .select_from(_fts)
+        .join(Article, Article.id == _fts.c.rowid)
+        .outerjoin(ArticleSummary, ArticleSummary.article_id == Article.id)
+        .where(text(f"{FTS_TABLE} MATCH :query").bindparams(query=query))
+    )
+    if source:
+        stmt = stmt.where(Article.source == source)
+    if start:
+        stmt = stmt.where(effective_day >= start.isoformat())
+    if end:
+        stmt = stmt.where(effective_day <= end.isoformat())
+    stmt = stmt.order_by(_RANK).limit(limit)
+
+    return [
+        SearchHit(article=ArticleRow(*row[:-2]), snippet=row[-2], score=row[-1])
+        for row in session.execute(stmt)
+    ]
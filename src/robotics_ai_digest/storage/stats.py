@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import ColumnElement, delete, func, literal, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .models import Article, ArticleSummary, DailySourceStats
+
+_DAY = func.date(func.coalesce(Article.published, Article.created_at))
+_COUNTERS = ("articles", "summarized", "input_tokens", "output_tokens", "cost_usd")
+# Keeps each IN (...) list well below SQLite's bound-parameter limit.
+_ID_CHUNK = 500
+_WITH_SUMMARIES = Article.__table__.outerjoin(
+    ArticleSummary.__table__, ArticleSummary.article_id == Article.id
+)
+
+
+def _accumulate(
+    session: Session | Connection,
+    where: ColumnElement[bool],
+    with_summaries: bool = False,
+    **counters: ColumnElement,
+) -> None:
+    """Add per-(day, source) increments, computed over the matching articles, to the totals."""
+    names = list(counters)
+    source_rows = select(_DAY, Article.source, *counters.values())
+    if with_summaries:
+        source_rows = source_rows.select_from(_WITH_SUMMARIES)
+    source_rows = source_rows.where(where).group_by(_DAY, Article.source)
+    stmt = insert(DailySourceStats).from_select(["day", "source", *names], source_rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailySourceStats.day, DailySourceStats.source],
+        set_={
+            name: getattr(DailySourceStats, name) + getattr(stmt.excluded, name) for name in names
+        },
+    )
+    session.execute(stmt)
+
+
+def record_new_articles(session: Session, article_ids: Sequence[int]) -> None:
+    """Count freshly flushed articles; runs inside the caller's transaction."""
+    for start in range(0, len(article_ids), _ID_CHUNK):
+        chunk = article_ids[start : start + _ID_CHUNK]
+        _accumulate(session, Article.id.in_(chunk), articles=func.count())
+
+
+def record_summary(
+    session: Session,
+    article_id: int,
+    first_summary: bool,
+    input_tokens: int | None = None,
+    output_tokens: int | None = None,
+    cost_usd: float | None = None,
+) -> None:
+    """Count a saved summary; re-summarizing adds its spend but not another summarized row."""
+    _accumulate(
+        session,
+        Article.id == article_id,
+        summarized=literal(1 if first_summary else 0),
+        input_tokens=literal(input_tokens or 0),
+        output_tokens=literal(output_tokens or 0),
+        cost_usd=literal(float(cost_usd or 0.0)),
+    )
+
+
+def record_imported(
+    session: Session, article_ids: Sequence[int], new_articles: bool = True
+) -> None:
+    """Count bulk-imported articles, or only the summaries imported for existing ones."""
+    counters = {
+        "summarized": func.count(ArticleSummary.id),
+        "input_tokens": func.coalesce(func.sum(ArticleSummary.input_tokens), 0),
+        "output_tokens": func.coalesce(func.sum(ArticleSummary.output_tokens), 0),
+        "cost_usd": func.coalesce(func.sum(ArticleSummary.cost_usd), 0.0),
+    }
+    if new_articles:
+        counters = {"articles": func.count(), **counters}
+    for start in range(0, len(article_ids), _ID_CHUNK):
+        chunk = article_ids[start : start + _ID_CHUNK]
+        _accumulate(session, Article.id.in_(chunk), with_summaries=True, **counters)
+
+
+def _rebuild(connection: Session | Connection) -> None:
+    connection.execute(delete(DailySourceStats))
+    source_rows = (
+        select(
+            _DAY,
+            Article.source,
+            func.count(),
+            func.count(ArticleSummary.id),
+            func.coalesce(func.sum(ArticleSummary.input_tokens), 0),
+            func.coalesce(func.sum(ArticleSummary.output_tokens), 0),
+            func.coalesce(func.sum(ArticleSummary.cost_usd), 0.0),
+        )
+        .select_from(_WITH_SUMMARIES)
+        .group_by(_DAY, Article.source)
+    )
+    connection.execute(
+        insert(DailySourceStats).from_select(["day", "source", *_COUNTERS], source_rows)
+    )
+
+
+def rebuild_stats(session: Session) -> None:
+    """Recompute every total from scratch.
+
+    Spend from earlier runs of re-summarized articles is lost: only the latest usage is stored.
+    """
+    _rebuild(session)
+    session.commit()
+
+
+def install_stats(engine: Engine) -> None:
+    # Databases created before the aggregates existed get them backfilled once.
+    with engine.begin() as connection:
+        has_stats = connection.scalar(select(literal(1)).select_from(DailySourceStats).limit(1))
+        has_articles = connection.scalar(select(literal(1)).select_from(Article).limit(1))
+        if has_articles and not has_stats:
+            _rebuild(connection)
+
+
+@dataclass(slots=True, frozen=True)
+class StatsRow:
+    key: str
+    articles: int
+    summarized: int
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+
+    @property
+    def coverage(self) -> float:
+        return self.summarized / self.articles if self.articles else 0.0
+
+
+def _sums() -> tuple[ColumnElement, ...]:
+    return tuple(func.coalesce(func.sum(getattr(DailySourceStats, name)), 0) for name in _COUNTERS)
+
+
+def get_stats_total(session: Session, source: str | None = None) -> StatsRow:
+    stmt = select(*_sums())
+    if source:
+        stmt = stmt.where(DailySourceStats.source == source)
+    return StatsRow(source or "all", *session.execute(stmt).one())
+
+
+def get_stats_by_source(session: Session) -> list[StatsRow]:
+    stmt = (
+        select(DailySourceStats.source, *_sums())
+        .group_by(DailySourceStats.source)
+        .order_by(DailySourceStats.source)
+    )
+    return [StatsRow(*row) for row in session.execute(stmt)]
+
+
+def get_daily_stats(
+    session: Session, since: date | None = None, source: str | None = None
+) -> list[StatsRow]:
+    """Per-day totals (all sources, or one), newest first."""
+    stmt = select(DailySourceStats.day, *_sums()).group_by(DailySourceStats.day)
+    if since:
+        stmt = stmt.where(DailySourceStats.day >= since.isoformat())
+    if source:
+        stmt = stmt.where(DailySourceStats.source == source)
+    return [StatsRow(*row) for row in session.execute(stmt.order_by(DailySourceStats.day.desc()))]
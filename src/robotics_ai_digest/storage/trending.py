@@ -0,0 +1,164 @@
+"""Per-day term document frequencies, updated at ingest, and a rising-terms query.
+
+Terms are lowercase words and adjacent word pairs from each article's title and feed
+summary. Each article counts once per term, so a repetitive summary cannot dominate a day.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+import re
+
+from sqlalchemy import case, delete, func, literal, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .models import Article, DailyTermCount
+
+_TOKEN = re.compile(r"[^\W_]+(?:[-'][^\W_]+)*")
+# Batches stay well below SQLite's bound-parameter limit (3 per row).
+_ROW_CHUNK = 300
+_ID_CHUNK = 500
+_DAY = func.date(func.coalesce(Article.published, Article.created_at))
+_STOPWORDS_TEXT = """
+    a about after all also an and any are as at be been but by can could did do does for
+    from had has have how if in into is it its just more most new not now of on one or our
+    out over so than that the their them then there these they this to up us using via was
+    we were what when where which while who why will with would you your
+    au aux avec ce ces dans de des du en est et la le les leur mais par pas pour qui sa se
+    son sont sur un une
+"""
+STOPWORDS = frozenset(_STOPWORDS_TEXT.split())
+
+
+def extract_terms(*texts: str | None) -> set[str]:
+    """Distinct unigrams and bigrams; stopwords and bare numbers break bigrams."""
+    terms: set[str] = set()
+    for text in texts:
+        if not text:
+            continue
+        previous: str | None = None
+        for match in _TOKEN.finditer(text):
+            raw = match.group()
+            word = raw.lower()
+            # Two-letter words only count as acronyms, e.g. "AI" or "RL".
+            too_short = len(word) < 3 and not (len(word) == 2 and raw.isupper())
+            if word in STOPWORDS or word.isdigit() or too_short:
+                previous = None
+                continue
+            terms.add(word)
+            if previous is not None:
+                terms.add(f"{previous} {word}")
+            previous = word
+    return terms
+
+
+def _article_day(article: Article) -> str:
+    # created_at is filled in by SQLite's CURRENT_TIMESTAMP, i.e. today in UTC.
+    moment = article.published or datetime.now(timezone.utc)
+    return moment.date().isoformat()
+
+
+def _add_counts(connection: Session | Connection, counts: Counter[tuple[str, str]]) -> None:
+    rows = [{"day": day, "term": term, "count": count} for (day, term), count in counts.items()]
+    for start in range(0, len(rows), _ROW_CHUNK):
+        stmt = insert(DailyTermCount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyTermCount.day, DailyTermCount.term],
+            set_={"count": DailyTermCount.count + stmt.excluded.count},
+        )
+        connection.execute(stmt, rows[start : start + _ROW_CHUNK])
+
+
+def record_article_terms(session: Session, articles: Iterable[Article]) -> None:
+    """Count the terms of newly inserted articles; runs inside the caller's transaction."""
+    counts: Counter[tuple[str, str]] = Counter()
+    for article in articles:
+        day = _article_day(article)
+        counts.update((day, term) for term in extract_terms(article.title, article.summary))
+    _add_counts(session, counts)
+
+
+def record_terms_for_ids(session: Session, article_ids: Sequence[int]) -> None:
+    """Like ``record_article_terms`` for rows written without the ORM, e.g. bulk imports."""
+    counts: Counter[tuple[str, str]] = Counter()
+    for start in range(0, len(article_ids), _ID_CHUNK):
+        chunk = article_ids[start : start + _ID_CHUNK]
+        stmt = select(_DAY, Article.title, Article.summary).where(Article.id.in_(chunk))
+        for article_day, title, summary in session.execute(stmt):
+            counts.update((article_day, term) for term in extract_terms(title, summary))
+    _add_counts(session, counts)
+
+
+def _rebuild(connection: Session | Connection) -> None:
+    connection.execute(delete(DailyTermCount))
+    counts: Counter[tuple[str, str]] = Counter()
+    stmt = select(_DAY, Article.title, Article.summary).execution_options(yield_per=1000)
+    for article_day, title, summary in connection.execute(stmt):
+        counts.update((article_day, term) for term in extract_terms(title, summary))
+    _add_counts(connection, counts)
+
+
+def rebuild_trending(session: Session) -> None:
+    _rebuild(session)
+    session.commit()
+
+
+def install_trending(engine: Engine) -> None:
+    # Databases created before the term index existed get it backfilled once.
+    with engine.begin() as connection:
+        has_terms = connection.scalar(select(literal(1)).select_from(DailyTermCount).limit(1))
+        has_articles = connection.scalar(select(literal(1)).select_from(Article).limit(1))
+        if has_articles and not has_terms:
+            _rebuild(connection)
+
+
+@dataclass(slots=True, frozen=True)
+class TrendingTerm:
+    term: str
+    count: int
+    # Expected count for a window this long, from the baseline period's average.
+    baseline: float
+
+    @property
+    def change(self) -> float:
+        return self.count - self.baseline
+
+
+def get_trending_terms(
+    session: Session,
+    end: date,
+    days: int = 1,
+    limit: int = 10,
+    baseline_days: int | None = None,
+    min_count: int = 2,
+) -> list[TrendingTerm]:
+    """Terms whose article count over the ``days`` ending at ``end`` rose the most.
+
+    The baseline is the ``baseline_days`` (default ``7 * days``) just before the window,
+    scaled to the window's length. Only the two windows' rows are read, via the
+    ``(day, term)`` primary key, so the cost does not grow with history.
+    """
+    baseline_days = baseline_days or 7 * days
+    start = end - timedelta(days=days - 1)
+    baseline_start = start - timedelta(days=baseline_days)
+    in_window = DailyTermCount.day >= start.isoformat()
+    current = func.sum(case((in_window, DailyTermCount.count), else_=0))
+    previous = func.sum(case((in_window, 0), else_=DailyTermCount.count))
+    ratio = days / baseline_days
+    stmt = (
+        select(DailyTermCount.term, current, previous)
+        .where(DailyTermCount.day.between(baseline_start.isoformat(), end.isoformat()))
+        .group_by(DailyTermCount.term)
+        .having(current >= min_count)
+        .order_by((current - previous * ratio).desc(), current.desc(), DailyTermCount.term)
+        .limit(limit)
+    )
+    return [
+        TrendingTerm(term, count, previous_count * ratio)
+        for term, count, previous_count in session.execute(stmt)
+    ]
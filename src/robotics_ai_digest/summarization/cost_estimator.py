@@ -1,23 +1,55 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
+
 import tiktoken
 
+from ..metrics import METRICS
+from .extractive_summarizer import EXTRACTIVE_MODEL
+
 DEFAULT_EXPECTED_OUTPUT_TOKENS = 220
-DEFAULT_PRICE_PER_1K_TOKENS = 0.002
 
-# Approximate blended $ / 1K tokens for estimation.
-MODEL_PRICE_PER_1K_TOKENS: dict[str, float] = {
-    "gpt-4.1-mini": 0.002,
-    "gpt-4o-mini": 0.00075,
+
+@dataclass(slots=True, frozen=True)
+class ModelPrice:
+    """$ per 1K tokens; providers bill output tokens several times higher than input."""
+
+    input_per_1k: float
+    output_per_1k: float
+
+    def cost(self, input_tokens: float, output_tokens: float) -> float:
+        return (input_tokens * self.input_per_1k + output_tokens * self.output_per_1k) / 1000
+
+
+# Unknown models are priced like a large model, so estimates err on the expensive side.
+DEFAULT_PRICE_PER_1K_TOKENS = ModelPrice(input_per_1k=0.002, output_per_1k=0.008)
+MODEL_PRICE_PER_1K_TOKENS: dict[str, ModelPrice] = {
+    "gpt-4.1": ModelPrice(input_per_1k=0.002, output_per_1k=0.008),
+    "gpt-4.1-mini": ModelPrice(input_per_1k=0.0004, output_per_1k=0.0016),
+    "gpt-4.1-nano": ModelPrice(input_per_1k=0.0001, output_per_1k=0.0004),
+    "gpt-4o-mini": ModelPrice(input_per_1k=0.00015, output_per_1k=0.0006),
+    # Routed items that reuse their source text; no API call is made.
+    EXTRACTIVE_MODEL: ModelPrice(input_per_1k=0.0, output_per_1k=0.0),
 }
 
 
+def model_price(model: str) -> ModelPrice:
+    return MODEL_PRICE_PER_1K_TOKENS.get(model, DEFAULT_PRICE_PER_1K_TOKENS)
+
+
+@METRICS.timed("tiktoken_count")
 def count_tokens(prompt: str, model: str = "gpt-4.1-mini") -> int:
     try:
         encoding = tiktoken.encoding_for_model(model)
     except KeyError:
         encoding = tiktoken.get_encoding("cl100k_base")
-    return len(encoding.encode(prompt))
+    tokens = len(encoding.encode(prompt))
+    METRICS.count("tokens_counted", tokens)
+    return tokens
+
+
+def usage_cost(input_tokens: int, output_tokens: int, model: str = "gpt-4.1-mini") -> float:
+    return model_price(model).cost(input_tokens, output_tokens)
 
 
 def estimate_api_cost(
@@ -26,7 +58,4 @@ def estimate_api_cost(
     expected_output_tokens: int = DEFAULT_EXPECTED_OUTPUT_TOKENS,
 ) -> float:
     input_tokens = count_tokens(prompt, model=model)
-    total_tokens = input_tokens + expected_output_tokens
-    price_per_1k = MODEL_PRICE_PER_1K_TOKENS.get(model, DEFAULT_PRICE_PER_1K_TOKENS)
-    return (total_tokens / 1000) * price_per_1k
-
+    return usage_cost(input_tokens, expected_output_tokens, model)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from .summarizer import Summarizer
+
+EXTRACTIVE_MODEL = "extractive"
+
+
+class ExtractiveSummarizer(Summarizer):
+    """Reuse the source text as-is: for items too short to be worth an API call."""
+
+    def summarize(self, title: str, text: str) -> dict:
+        summary = " ".join(text.split()) or title
+        return {"summary": summary, "bullets": [title], "model": EXTRACTIVE_MODEL}
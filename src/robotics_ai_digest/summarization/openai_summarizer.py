@@ -4,6 +4,8 @@ import json
 
 from openai import OpenAI
 
+from ..metrics import METRICS
+from .cost_estimator import usage_cost
 from .summarizer import Summarizer
 
 SUMMARY_INSTRUCTIONS = (
@@ -19,25 +21,49 @@ def build_summarization_prompt(title: str, text: str) -> str:
 
 
 class OpenAISummarizer(Summarizer):
-    def __init__(self, model: str = "gpt-4.1-mini"):
+    def __init__(
+        self,
+        model: str = "gpt-4.1-mini",
+        base_url: str | None = None,
+        api_key: str | None = None,
+        max_retries: int = 2,
+    ):
+        """``base_url`` points the client at an OpenAI-compatible server, e.g. a local fake."""
         self.model = model
-        self.client = OpenAI()
+        self.client = OpenAI(base_url=base_url, api_key=api_key, max_retries=max_retries)
 
     def summarize(self, title: str, text: str) -> dict:
         payload = build_summarization_prompt(title, text)
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                instructions=SUMMARY_INSTRUCTIONS,
-                input=payload,
-            )
+            with METRICS.span("llm_request", model=self.model):
+                response = self.client.responses.create(
+                    model=self.model,
+                    instructions=SUMMARY_INSTRUCTIONS,
+                    input=payload,
+                )
             content = response.output_text
             result = json.loads(content)
             summary = result.get("summary")
             bullets = result.get("bullets")
             if not isinstance(summary, str) or not isinstance(bullets, list):
                 raise ValueError("Invalid OpenAI response format")
-            return {"summary": summary, "bullets": [str(item) for item in bullets][:3]}
+            output = {
+                "summary": summary,
+                "bullets": [str(item) for item in bullets][:3],
+                "model": self.model,
+            }
+            if response.usage is not None:
+                input_tokens = response.usage.input_tokens
+                output_tokens = response.usage.output_tokens
+                METRICS.count("llm_input_tokens", input_tokens, model=self.model)
+                METRICS.count("llm_output_tokens", output_tokens, model=self.model)
+                output["usage"] = {
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cost_usd": usage_cost(input_tokens, output_tokens, self.model),
+                }
+            return output
         except Exception as exc:  # noqa: BLE001
+            METRICS.count("llm_errors", model=self.model)
             raise RuntimeError(f"OpenAI summarization failed: {exc}") from exc
 
@@ -0,0 +1,185 @@
+"""Choose which articles to summarize when the spend is capped, not the count.
+
+Each candidate gets a priority score (recency, source weight, keyword relevance) and an
+estimated cost from its text length and the model's input/output prices. Selection is a
+greedy knapsack by score per dollar, which is near-optimal when each article costs a
+small share of the budget and runs in O(n log n): 100k+ candidates plan in well under a
+second. Length-based token counts err high (about 3 characters per token); the
+caller can re-check the chosen articles with exact token counts via ``fit_to_budget``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+import math
+import string
+from typing import TypeVar
+
+from ..storage.rows import SummaryCandidate
+from .cost_estimator import DEFAULT_EXPECTED_OUTPUT_TOKENS, ModelPrice, model_price
+from .openai_summarizer import build_summarization_prompt
+from .router import ModelRouter
+
+T = TypeVar("T")
+
+_DEFAULT_KEYWORDS_TEXT = """
+robot robots robotics humanoid humanoids manipulation locomotion grasping autonomous
+embodied reinforcement imitation foundation multimodal vision-language policy sim2real
+"""
+DEFAULT_KEYWORDS = frozenset(_DEFAULT_KEYWORDS_TEXT.split())
+# Title, labels and newlines that build_summarization_prompt adds around the text.
+_PROMPT_OVERHEAD_CHARS = len(build_summarization_prompt("", ""))
+_CHARS_PER_TOKEN = 3.0
+# Title words are matched whole; a regex per title would dominate planning time.
+_PUNCTUATION = str.maketrans(dict.fromkeys(string.punctuation.replace("-", ""), " "))
+# Keyword hits beyond this add nothing: a title stuffed with buzzwords is not 5x as relevant.
+_MAX_KEYWORD_HITS = 3
+
+
+@dataclass(slots=True, frozen=True)
+class PriorityWeights:
+    # An article loses half its recency score every ``half_life_days``.
+    half_life_days: float = 3.0
+    # Multipliers per article source (feed name); unlisted sources weigh 1.
+    source_weights: Mapping[str, float] = field(default_factory=dict)
+    keywords: frozenset[str] = DEFAULT_KEYWORDS
+    # Score bonus per distinct keyword found in the title (case-insensitive, whole words).
+    keyword_bonus: float = 0.5
+
+
+@dataclass(slots=True)
+class SummaryPlan:
+    # Chosen articles, highest priority first.
+    selected: list[SummaryCandidate]
+    candidates: int
+    estimated_cost_usd: float
+    budget_usd: float
+
+
+def _keyword_hits(titles: list[str], keywords: frozenset[str]) -> list[int]:
+    """Distinct keywords per title, matched on all titles at once to skip per-title calls."""
+    # Feed XML cannot carry NUL, so it safely separates the titles.
+    lines = "\0".join(titles).lower().translate(_PUNCTUATION).split("\0")
+    if len(lines) != len(titles):
+        lines = [title.lower().translate(_PUNCTUATION) for title in titles]
+    return list(map(len, map(keywords.intersection, map(str.split, lines))))
+
+
+def plan_summaries(
+    candidates: Sequence[SummaryCandidate],
+    budget_usd: float,
+    model: str = "gpt-4.1-mini",
+    weights: PriorityWeights | None = None,
+    max_articles: int | None = None,
+    source_chars: int | None = None,
+    router: ModelRouter | None = None,
+) -> SummaryPlan:
+    """Pick the candidates with the most priority per dollar that fit in ``budget_usd``.
+
+    Priority is recency decay x source weight x (1 + bonus x distinct title keywords).
+
+    ``source_chars`` overrides every candidate's length, e.g. with the full-text cap when
+    pages are fetched after planning. With a ``router``, each candidate is priced at the
+    model it would be routed to (``model`` is then unused).
+    """
+    weights = weights or PriorityWeights()
+    keywords = frozenset(word.lower() for word in weights.keywords)
+    decay = math.log(2) / max(weights.half_life_days, 1e-9)
+    count = len(candidates)
+    limit = count if max_articles is None else max_articles
+    sources = [candidate.source for candidate in candidates]
+    if source_chars is None:
+        lengths = [candidate.chars for candidate in candidates]
+    else:
+        lengths = [source_chars] * count
+
+    # Columns rather than a tuple per candidate: at 100k+ rows the per-row overhead is
+    # what planning costs.
+    if router is None:
+        price = model_price(model)
+        input_per_char = price.cost(1 / _CHARS_PER_TOKEN, 0)
+        overhead = _PROMPT_OVERHEAD_CHARS * input_per_char
+        overhead += price.cost(0, DEFAULT_EXPECTED_OUTPUT_TOKENS)
+        costs = [overhead + chars * input_per_char for chars in lengths]
+    else:
+        costs = list(map(_RoutedCosts(router), lengths, sources))
+    factors = {source: weights.source_weights.get(source, 1.0) for source in set(sources)}
+    exp = math.exp
+    scores = [
+        exp(-decay * candidate.age_days) * factors[source]
+        for candidate, source in zip(candidates, sources)
+    ]
+    if keywords and weights.keyword_bonus:
+        bonus = weights.keyword_bonus
+        hits = _keyword_hits([candidate.title for candidate in candidates], keywords)
+        scores = [
+            score * (1 + bonus * min(hit, _MAX_KEYWORD_HITS)) if hit else score
+            for score, hit in zip(scores, hits)
+        ]
+
+    total = sum(costs)
+    if total <= budget_usd and limit >= count:
+        # Everything fits: there is nothing to rank by price.
+        chosen = list(range(count))
+        spent = total
+    else:
+        # Articles routed to the extractive "model" cost nothing and always go first.
+        ratios = [score / cost if cost else math.inf for score, cost in zip(scores, costs)]
+        cheapest = min(filter(None, costs), default=0.0)
+        chosen = []
+        spent = 0.0
+        if limit > 0:
+            for index in sorted(range(count), key=ratios.__getitem__, reverse=True):
+                cost = costs[index]
+                if spent + cost <= budget_usd:
+                    spent += cost
+                    chosen.append(index)
+                    if len(chosen) >= limit:
+                        break
+                elif spent + cheapest > budget_usd:
+                    break
+
+    chosen.sort(key=scores.__getitem__, reverse=True)
+    return SummaryPlan(
+        selected=[candidates[index] for index in chosen],
+        candidates=count,
+        estimated_cost_usd=spent,
+        budget_usd=budget_usd,
+    )
+
+
+class _RoutedCosts:
+    """Cost of a candidate at the model the router picks, memoized per length and source."""
+
+    def __init__(self, router: ModelRouter):
+        self.router = router
+        self._prices: dict[str, ModelPrice] = {}
+        self._costs: dict[tuple[int, str], float] = {}
+
+    def __call__(self, chars: int, source: str) -> float:
+        cost = self._costs.get((chars, source))
+        if cost is None:
+            # Length-based counts err high, so routing errs towards the dearer models.
+            tokens = (chars + _PROMPT_OVERHEAD_CHARS) / _CHARS_PER_TOKEN
+            routed = self.router.model_for(math.ceil(tokens), source)
+            if routed not in self._prices:
+                self._prices[routed] = model_price(routed)
+            cost = self._costs[chars, source] = self._prices[routed].cost(
+                tokens, DEFAULT_EXPECTED_OUTPUT_TOKENS
+            )
+        return cost
+
+
+def fit_to_budget(items: Iterable[T], costs: Iterable[float], budget_usd: float) -> list[T]:
+    """Keep items, in order, while their running cost stays within ``budget_usd``.
+
+    Items that would overshoot are skipped, so a cheaper one further down may still fit.
+    """
+    kept: list[T] = []
+    spent = 0.0
+    for item, cost in zip(items, costs):
+        if spent + cost <= budget_usd:
+            spent += cost
+            kept.append(item)
+    return kept
@@ -0,0 +1,60 @@
+"""Pick a summarization model per article from its prompt size and source.
+
+Routes are tried in order and the first match wins; articles no route matches go to the
+default model. A route is written ``MODEL[<=TOKENS][@SOURCE,...]``: ``TOKENS`` caps the
+prompt size it accepts and each ``SOURCE`` is a case-insensitive glob over feed names.
+The ``extractive`` model makes no API call. For example::
+
+    extractive<=60  gpt-4.1-nano<=400  gpt-4.1-mini@arxiv*,*journal*  gpt-4.1
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+import re
+
+_ROUTE = re.compile(r"^(?P<model>[^<@\s]+)(?:<=(?P<tokens>\d+))?(?:@(?P<sources>.+))?$")
+
+
+@dataclass(slots=True, frozen=True)
+class Route:
+    model: str
+    # Largest prompt, in tokens, this route takes; None for any size.
+    max_tokens: int | None = None
+    # Lower-cased globs over article sources; empty for any source.
+    sources: tuple[str, ...] = ()
+
+
+def parse_route(spec: str) -> Route:
+    match = _ROUTE.match(spec.strip())
+    if match is None:
+        raise ValueError(f"Invalid route {spec!r}: expected MODEL[<=TOKENS][@SOURCE,...]")
+    tokens = match["tokens"]
+    sources = tuple(
+        glob.strip().lower() for glob in (match["sources"] or "").split(",") if glob.strip()
+    )
+    return Route(match["model"], int(tokens) if tokens else None, sources)
+
+
+class ModelRouter:
+    def __init__(self, routes: Sequence[Route], default_model: str):
+        self.routes = tuple(routes)
+        self.default_model = default_model
+        # Source matching is per feed, and backlogs hold few feeds but many articles.
+        self._by_source: dict[str, tuple[Route, ...]] = {}
+
+    def model_for(self, tokens: int, source: str) -> str:
+        routes = self._by_source.get(source)
+        if routes is None:
+            lowered = source.lower()
+            routes = self._by_source[source] = tuple(
+                route
+                for route in self.routes
+                if not route.sources or any(fnmatchcase(lowered, glob) for glob in route.sources)
+            )
+        for route in routes:
+            if route.max_tokens is None or tokens <= route.max_tokens:
+                return route.model
+        return self.default_model
@@ -5,5 +5,9 @@ from typing import Protocol
 
 class Summarizer(Protocol):
     def summarize(self, title: str, text: str) -> dict:
-        """Return {'summary': str, 'bullets': list[str]}."""
+        """Return {'summary': str, 'bullets': list[str]}.
+
+        May add 'usage': {'input_tokens', 'output_tokens', 'cost_usd'} for billed calls, and
+        'model': the name of the model that wrote the summary.
+        """
 
@@ -0,0 +1,343 @@
+"""Streaming export and bulk import of articles together with their AI summaries.
+
+Export reads ``articles LEFT JOIN article_summaries`` through a ``yield_per`` cursor and
+writes one flat record per article, so memory stays flat however large the database is.
+NDJSON and CSV need nothing extra (a ``.gz`` suffix compresses them); Parquet needs
+``pyarrow``. Import reads the same records back in batches and writes them with bulk
+inserts, skipping articles whose link or guid is already stored.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+import csv
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import io
+from itertools import islice
+import json
+from pathlib import Path
+from typing import IO, TextIO, TypeVar
+
+from sqlalchemy import insert, select, union
+from sqlalchemy.orm import Session
+
+from .digest.output import atomic_writer
+from .feeds.items import parse_datetime
+from .metrics import METRICS
+from .storage.models import Article, ArticleSummary
+from .storage.stats import record_imported
+from .storage.trending import record_terms_for_ids
+
+TRANSFER_FORMATS = ("ndjson", "csv", "parquet")
+ARTICLE_FIELDS = ("id", "link", "guid", "title", "published", "summary", "source", "created_at")
+SUMMARY_FIELDS = (
+    "summary_ai",
+    "bullets_ai",
+    "summarized_at",
+    "input_tokens",
+    "output_tokens",
+    "cost_usd",
+    "model",
+)
+FIELDS = ARTICLE_FIELDS + SUMMARY_FIELDS
+# Rows fetched per cursor round trip on export, and inserted per transaction on import.
+BATCH_SIZE = 500
+_PARQUET_ROW_GROUP = 10_000
+_DATETIME_FIELDS = ("published", "created_at", "summarized_at")
+_SUFFIXES = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".parquet": "parquet"}
+T = TypeVar("T")
+
+
+@dataclass(slots=True, frozen=True)
+class ExportResult:
+    rows: int
+    # Latest ingest or summary time written; pass it back as the next export's ``since``.
+    watermark: datetime | None
+
+
+@dataclass(slots=True, frozen=True)
+class ImportResult:
+    rows: int
+    new: int
+    duplicates: int
+    summaries: int
+
+
+def guess_format(path: Path) -> str:
+    """The format implied by the file name (ignoring ``.gz``); NDJSON when unknown."""
+    suffixes = path.suffixes[:-1] if path.suffix == ".gz" else path.suffixes
+    return _SUFFIXES.get(suffixes[-1] if suffixes else "", "ndjson")
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _require_pyarrow() -> tuple:
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet needs pyarrow: pip install 'robotics-ai-digest[parquet]'"
+        ) from exc
+    return pyarrow, pyarrow.parquet
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # SQLite hands back naive UTC values; exported ones carry an explicit offset.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def iter_export_records(session: Session, since: datetime | None = None) -> Iterator[dict]:
+    """Yield one record per article, oldest id first, streamed from the database.
+
+    With ``since``, only articles ingested or summarized at or after that time are read;
+    both lookups use an index, so incremental exports do not scan the whole table.
+    """
+    columns = [getattr(Article, name) for name in ARTICLE_FIELDS]
+    columns += [getattr(ArticleSummary, name) for name in SUMMARY_FIELDS]
+    stmt = select(*columns).outerjoin(ArticleSummary, ArticleSummary.article_id == Article.id)
+    if since is not None:
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        changed = union(
+            select(Article.id).where(Article.created_at >= since),
+            select(ArticleSummary.article_id).where(ArticleSummary.summarized_at >= since),
+        )
+        stmt = stmt.where(Article.id.in_(changed))
+    stmt = stmt.order_by(Article.id).execution_options(yield_per=BATCH_SIZE)
+    for row in session.execute(stmt):
+        record = dict(zip(FIELDS, row))
+        for name in _DATETIME_FIELDS:
+            record[name] = _utc(record[name])
+        yield record
+
+
+def _text_value(value: object) -> object:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _write_ndjson(handle: TextIO, records: Iterable[dict]) -> None:
+    for record in records:
+        values = {name: _text_value(value) for name, value in record.items()}
+        handle.write(json.dumps(values, ensure_ascii=False) + "\n")
+
+
+def _write_csv(handle: TextIO, records: Iterable[dict]) -> None:
+    writer = csv.DictWriter(handle, fieldnames=FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow({name: _text_value(value) for name, value in record.items()})
+
+
+def _write_parquet(handle: IO[bytes], records: Iterable[dict]) -> None:
+    pa, pq = _require_pyarrow()
+    timestamp = pa.timestamp("us", tz="UTC")
+    types = {
+        "id": pa.int64(),
+        "published": timestamp,
+        "created_at": timestamp,
+        "summarized_at": timestamp,
+        "input_tokens": pa.int64(),
+        "output_tokens": pa.int64(),
+        "cost_usd": pa.float64(),
+    }
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in FIELDS])
+    with pq.ParquetWriter(handle, schema) as writer:
+        for batch in _batched(records, _PARQUET_ROW_GROUP):
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+
+_TEXT_WRITERS: dict[str, Callable[[TextIO, Iterable[dict]], None]] = {
+    "ndjson": _write_ndjson,
+    "csv": _write_csv,
+}
+
+
+@contextmanager
+def _text_output(raw: IO[bytes], compress: bool) -> Iterator[TextIO]:
+    stream = gzip.GzipFile(fileobj=raw, mode="wb") if compress else raw
+    with io.TextIOWrapper(stream, encoding="utf-8", newline="") as handle:
+        yield handle
+
+
+def export_articles(
+    session: Session, path: Path, fmt: str | None = None, since: datetime | None = None
+) -> ExportResult:
+    """Stream every (or every changed) article into ``path``, replacing it atomically."""
+    fmt = fmt or guess_format(path)
+    if fmt == "parquet":
+        _require_pyarrow()
+    rows = 0
+    watermark: datetime | None = None
+
+    def tracked() -> Iterator[dict]:
+        nonlocal rows, watermark
+        for record in iter_export_records(session, since):
+            rows += 1
+            for moment in (record["created_at"], record["summarized_at"]):
+                if moment is not None and (watermark is None or moment > watermark):
+                    watermark = moment
+            yield record
+
+    with METRICS.span("export", format=fmt), atomic_writer(path, binary=True) as raw:
+        if fmt == "parquet":
+            _write_parquet(raw, tracked())
+        else:
+            with _text_output(raw, compress=path.suffix == ".gz") as handle:
+                _TEXT_WRITERS[fmt](handle, tracked())
+    METRICS.count("export_rows", rows)
+    return ExportResult(rows=rows, watermark=watermark)
+
+
+def _text_input(path: Path) -> TextIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return path.open(encoding="utf-8", newline="")
+
+
+def iter_import_records(path: Path, fmt: str | None = None) -> Iterator[dict]:
+    """Yield raw records from an export file without loading it whole."""
+    fmt = fmt or guess_format(path)
+    if fmt == "parquet":
+        _, pq = _require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_SIZE):
+            yield from batch.to_pylist()
+        return
+    with _text_input(path) as handle:
+        if fmt == "csv":
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _clean(record: dict) -> dict:
+    # CSV gives every value back as a string, with "" for missing ones.
+    values = {name: None if record.get(name) in ("", None) else record[name] for name in FIELDS}
+    if not values["link"]:
+        raise ValueError(f"Record without a link: {record!r}")
+    for name in _DATETIME_FIELDS:
+        moment = parse_datetime(values[name])
+        if moment is not None and moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+        values[name] = moment
+    for name in ("input_tokens", "output_tokens"):
+        values[name] = None if values[name] is None else int(values[name])
+    values["cost_usd"] = None if values["cost_usd"] is None else float(values["cost_usd"])
+    if isinstance(values["bullets_ai"], list):
+        values["bullets_ai"] = json.dumps(values["bullets_ai"])
+    return values
+
+
+def _ids_by_link(session: Session, links: list[str]) -> dict[str, int]:
+    stmt = select(Article.link, Article.id).where(Article.link.in_(links))
+    return {link: article_id for link, article_id in session.execute(stmt)}
+
+
+def _import_batch(session: Session, batch: list[dict]) -> tuple[int, int]:
+    """Insert one batch; return the new article and new summary counts."""
+    now = datetime.now(timezone.utc)
+    links = [record["link"] for record in batch]
+    guids = [record["guid"] for record in batch if record["guid"]]
+    stored = _ids_by_link(session, links)
+    seen_links = set(stored)
+    seen_guids = set(session.scalars(select(Article.guid).where(Article.guid.in_(guids))))
+
+    article_rows: list[dict] = []
+    # Summaries keyed by link; they may belong to new articles or to stored ones lacking one.
+    summaries: dict[str, dict] = {}
+    for record in batch:
+        link, guid = record["link"], record["guid"]
+        if link in seen_links or (guid and guid in seen_guids):
+            if link in stored and record["summary_ai"]:
+                summaries.setdefault(link, record)
+            continue
+        article_rows.append(
+            {
+                "title": record["title"] or "(untitled)",
+                "link": link,
+                "guid": guid,
+                "published": record["published"],
+                "summary": record["summary"],
+                "source": record["source"] or "unknown",
+                "created_at": record["created_at"] or now,
+            }
+        )
+        seen_links.add(link)
+        if guid:
+            seen_guids.add(guid)
+        if record["summary_ai"]:
+            summaries[link] = record
+
+    new_ids: dict[str, int] = {}
+    if article_rows:
+        session.execute(insert(Article), article_rows)
+        new_links = [row["link"] for row in article_rows]
+        new_ids = _ids_by_link(session, new_links)
+
+    # Stored articles keep the summary they already have.
+    candidates = {stored[link] for link in summaries if link in stored}
+    summarized = set(
+        session.scalars(
+            select(ArticleSummary.article_id).where(ArticleSummary.article_id.in_(candidates))
+        )
+    )
+    summary_rows = []
+    for link, record in summaries.items():
+        article_id = new_ids.get(link) or stored[link]
+        if article_id in summarized:
+            continue
+        summary_rows.append(
+            {
+                "article_id": article_id,
+                "summary_ai": record["summary_ai"],
+                "bullets_ai": record["bullets_ai"] or "[]",
+                "summarized_at": record["summarized_at"] or now,
+                "input_tokens": record["input_tokens"],
+                "output_tokens": record["output_tokens"],
+                "cost_usd": record["cost_usd"],
+                "model": record["model"],
+            }
+        )
+    if summary_rows:
+        session.execute(insert(ArticleSummary), summary_rows)
+
+    added = list(new_ids.values())
+    if added:
+        record_imported(session, added)
+        record_terms_for_ids(session, added)
+    completed = [row["article_id"] for row in summary_rows if row["article_id"] in candidates]
+    if completed:
+        record_imported(session, completed, new_articles=False)
+    return len(added), len(summary_rows)
+
+
+def import_articles(
+    session: Session, records: Iterable[dict], batch_size: int = BATCH_SIZE
+) -> ImportResult:
+    """Bulk-insert exported records, committing every ``batch_size`` rows.
+
+    Re-running an interrupted or overlapping import is safe: stored links and guids are
+    skipped, and stored articles only gain a summary if they have none.
+    """
+    rows = new = summaries = 0
+    for batch in _batched(records, batch_size):
+        with METRICS.span("import_batch"):
+            added, summarized = _import_batch(session, [_clean(record) for record in batch])
+            session.commit()
+        rows += len(batch)
+        new += added
+        summaries += summarized
+    METRICS.count("import_rows", rows)
+    METRICS.count("articles_new", new)
+    return ImportResult(rows=rows, new=new, duplicates=rows - new, summaries=summaries)
@@ -0,0 +1,31 @@
+from collections.abc import Callable
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.models import Article
+from robotics_ai_digest.storage.repository import save_ai_summary, upsert_articles
+
+
+@pytest.fixture
+def seeded_db(tmp_path) -> Callable[..., sessionmaker[Session]]:  # noqa: ANN001
+    """Factory for seeded databases: ``seeded_db(*batches, summaries=None, path=None)``.
+
+    Each batch of article dicts is upserted in turn, so a later batch can hold duplicates.
+    ``summaries`` maps an article link to the ``save_ai_summary`` arguments after its id.
+    The database is ``tmp_path / "digest.db"`` unless ``path`` says otherwise.
+    """
+
+    def seed(*batches, summaries=None, path=None):  # noqa: ANN001, ANN002, ANN202
+        session_factory = init_db(str(path or tmp_path / "digest.db"))
+        with session_factory() as session:
+            for batch in batches:
+                upsert_articles(session, batch)
+            for link, args in (summaries or {}).items():
+                article_id = session.scalar(select(Article.id).where(Article.link == link))
+                save_ai_summary(session, article_id, *args)
+        return session_factory
+
+    return seed
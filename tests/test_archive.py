@@ -0,0 +1,180 @@
+from datetime import date
+import sqlite3
+
+from sqlalchemy import MetaData, create_engine, func, select
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.archive import archive_articles, archive_path, with_archives
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.models import Article, ArticleSummary, Base
+from robotics_ai_digest.storage.repository import (
+    get_articles_for_date,
+    upsert_articles,
+)
+from robotics_ai_digest.storage.search import search_articles
+
+
+ARTICLES = [
+    {
+        "title": f"Article {month}-{index}",
+        "link": f"https://example.com/{month}/{index}",
+        "published": f"2024-{month:02d}-15T09:00:00+00:00",
+        "source": "Feed A",
+    }
+    for month in (1, 2, 3)
+    for index in range(3)
+]
+SUMMARIES = {"https://example.com/1/0": ("Summary.", ["Point"])}
+
+
+def test_archived_months_are_read_back_transparently(tmp_path, seeded_db):
+    db_path = tmp_path / "digest.db"
+    session_factory = seeded_db(ARTICLES, summaries=SUMMARIES, path=db_path)
+
+    assert archive_articles(session_factory, str(db_path), date(2024, 3, 1), dry_run=True) == {
+        "2024-01": 3,
+        "2024-02": 3,
+    }
+    assert archive_articles(session_factory, str(db_path), date(2024, 3, 1)) == {
+        "2024-01": 3,
+        "2024-02": 3,
+    }
+    assert archive_path(str(db_path), "2024-01").exists()
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(Article)) == 3
+
+    january = date(2024, 1, 15)
+    with with_archives(session_factory, str(db_path), january, january) as archived:
+        with archived() as session:
+            rows = get_articles_for_date(session, january)
+            assert sorted(article.title for article in rows) == [f"Article 1-{i}" for i in range(3)]
+        engine = archived.kw["bind"]
+        assert engine.pool.checkedin() == 1
+    # The attached archives are closed on exit.
+    assert engine.pool.checkedin() == 0
+    # Months without an archive keep using the hot database as-is.
+    march = (date(2024, 3, 1), date(2024, 3, 31))
+    with with_archives(session_factory, str(db_path), *march) as archived:
+        assert archived is session_factory
+
+
+def test_digest_of_an_archived_day_is_unchanged_and_compact_runs(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    seeded_db(ARTICLES, summaries=SUMMARIES, path=db_path)
+    digest = ["digest", "--db", str(db_path), "--date", "2024-01-15", "--force"]
+
+    assert main([*digest, "--out", str(tmp_path / "before")]) == 0
+    assert main(["archive", "--db", str(db_path), "--older-than-days", "30"]) == 0
+    assert "Archived 9 articles" in capsys.readouterr().out
+    assert main([*digest, "--out", str(tmp_path / "after")]) == 0
+    assert main(["compact", "--db", str(db_path), "--archives"]) == 0
+    assert "articles_2024-01.db" in capsys.readouterr().out
+
+    before = (tmp_path / "before" / "digest_2024-01-15.md").read_text(encoding="utf-8")
+    after = (tmp_path / "after" / "digest_2024-01-15.md").read_text(encoding="utf-8")
+    assert "Summary." in before
+    # Only the generation timestamp in the footer differs.
+    assert after.rsplit(" ", 1)[0] == before.rsplit(" ", 1)[0]
+
+
+def test_archived_ids_are_never_reused(tmp_path, seeded_db):
+    db_path = tmp_path / "digest.db"
+    session_factory = seeded_db(ARTICLES, summaries=SUMMARIES, path=db_path)
+    assert archive_articles(session_factory, str(db_path), date(2025, 1, 1))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {"title": "New", "link": "https://example.com/new", "published": "2024-01-20"},
+                # Re-ingested after its first copy was archived.
+                {"title": "Again", "link": "https://example.com/1/0", "published": "2024-01-15"},
+            ],
+        )
+        new_ids = session.scalars(select(Article.id)).all()
+    assert min(new_ids) > 9
+
+    january = (date(2024, 1, 1), date(2024, 1, 31))
+    with (
+        with_archives(session_factory, str(db_path), *january) as archived,
+        archived() as session,
+    ):
+        new = session.scalar(select(Article).where(Article.title == "New"))
+        assert new.ai_summary_record is None
+        assert len(session.scalars(select(Article.id)).all()) == 5
+
+    # Moving the clashing link again replaces the archived copy instead of failing.
+    assert archive_articles(session_factory, str(db_path), date(2025, 1, 1)) == {"2024-01": 2}
+    with (
+        with_archives(session_factory, str(db_path), *january) as archived,
+        archived() as session,
+    ):
+        rows = session.execute(select(Article.title, Article.link)).all()
+        assert len(rows) == 4
+        assert ("Again", "https://example.com/1/0") in rows
+        assert session.scalar(select(func.count()).select_from(ArticleSummary)) == 0
+
+
+def test_search_finds_archived_articles(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = seeded_db(ARTICLES, summaries=SUMMARIES, path=db_path)
+    assert archive_articles(session_factory, str(db_path), date(2024, 3, 1))
+    search = ["search", "--db", str(db_path), "--query"]
+
+    assert main([*search, '"Article 1"']) == 0
+    assert "Found 3 results" in capsys.readouterr().out
+    # AI summaries stay searchable, and a rebuilt index still covers the archives.
+    assert main([*search, "Summary", "--rebuild"]) == 0
+    assert "Article 1-0" in capsys.readouterr().out
+    assert main([*search, '"Article 1"', "--to", "2024-01-31"]) == 0
+    assert "Found 3 results" in capsys.readouterr().out
+    assert main([*search, '"Article 1"', "--from", "2024-02-01"]) == 0
+    assert "Found 0 results" in capsys.readouterr().out
+
+    # A re-ingested link replaces its archived copy in the index too.
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [{"title": "Again", "link": "https://example.com/1/0", "published": "2024-01-15"}],
+        )
+    assert archive_articles(session_factory, str(db_path), date(2024, 3, 1)) == {"2024-01": 1}
+    assert main([*search, "Again"]) == 0
+    assert "Found 1 results" in capsys.readouterr().out
+    assert main([*search, '"Article 1"']) == 0
+    assert "Found 2 results" in capsys.readouterr().out
+
+
+def test_init_db_migrates_tables_without_autoincrement(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    legacy = MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(legacy)
+        copy.dialect_options["sqlite"]["autoincrement"] = False
+    engine = create_engine(f"sqlite:///{db_path}")
+    legacy.create_all(engine)
+    engine.dispose()
+    with sqlite3.connect(db_path) as connection:
+        connection.executemany(
+            "INSERT INTO articles (id, title, link, source, created_at) "
+            "VALUES (?, ?, ?, 'Feed', '2025-01-01 00:00:00')",
+            [(i, f"Legacy {i}", f"https://example.com/legacy/{i}") for i in (1, 2, 3)],
+        )
+    # An archive written before the migration holds higher ids than the hot database.
+    archive = archive_path(str(db_path), "2024-01")
+    archive.parent.mkdir()
+    with sqlite3.connect(archive) as connection:
+        connection.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY)")
+        connection.execute("CREATE TABLE article_summaries (id INTEGER PRIMARY KEY)")
+        connection.execute("INSERT INTO articles (id) VALUES (10)")
+
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(session, [{"title": "Fresh robot news", "link": "https://example.com/f"}])
+        assert session.scalars(select(Article.id).order_by(Article.id)).all() == [1, 2, 3, 11]
+        assert [hit.article.title for hit in search_articles(session, "fresh")] == [
+            "Fresh robot news"
+        ]
+    with sqlite3.connect(db_path) as connection:
+        (sql,) = connection.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'articles'"
+        ).fetchone()
+    assert "AUTOINCREMENT" in sql
@@ -0,0 +1,117 @@
+from contextlib import closing
+import json
+import sqlite3
+import threading
+
+import requests
+
+from robotics_ai_digest.benchmarks.feeds import FeedServer, FeedServerConfig
+from robotics_ai_digest.benchmarks.llm import FakeOpenAIConfig, FakeOpenAIServer
+from robotics_ai_digest.benchmarks.storage import OPERATIONS, parse_size, plan_problems
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.feeds.rss_reader import parse_feed
+from robotics_ai_digest.summarization.openai_summarizer import OpenAISummarizer
+
+
+def test_plan_problems_flag_full_scans_and_unexpected_sorts():
+    plan = ["SCAN articles", "SCAN articles USING INDEX ix_articles_effective_at_id"]
+    assert plan_problems(plan) == ["SCAN articles"]
+    assert plan_problems(["USE TEMP B-TREE FOR ORDER BY"], allow_sort=False)
+    assert parse_size("10k") == 10_000
+    assert parse_size("1m") == 1_000_000
+
+
+def _dump(db_path):  # noqa: ANN001, ANN202
+    with closing(sqlite3.connect(db_path)) as connection:
+        return list(connection.iterdump())
+
+
+def test_storage_benchmark_reports_every_operation_with_index_backed_plans(tmp_path, capsys):
+    out = tmp_path / "results.json"
+    argv = ["bench", "storage", "--sizes", "2k", "--repeat", "2"]
+    assert main([*argv, "--data-dir", str(tmp_path / "bench"), "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert [result["operation"] for result in report["results"]] == list(OPERATIONS)
+    assert all(result["ok"] and result["size"] == 2000 for result in report["results"])
+    assert "get_articles_for_date" in capsys.readouterr().out
+
+    # The cached database is reused and left as it was, aggregates and id sequences included.
+    [cached] = (tmp_path / "bench").glob("*.db")
+    before = _dump(cached)
+    assert main([*argv, "--data-dir", str(tmp_path / "bench")]) == 0
+    assert _dump(cached) == before
+    assert [path.name for path in (tmp_path / "bench").glob("*.db")] == [cached.name]
+
+
+def test_feed_server_serves_rss_and_atom_with_etags():
+    config = FeedServerConfig(feeds=4, items=3, latency_ms=0, jitter_ms=0, atom_fraction=0.5)
+    server = FeedServer(("127.0.0.1", 0), config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        urls = [config.feed_url(base_url, index) for index in range(config.feeds)]
+        assert {url.rsplit(".", 1)[1] for url in urls} == {"atom", "xml"}
+        for url in urls:
+            response = requests.get(url, timeout=5)
+            assert len(parse_feed(response.content, url)) == 3
+            etag = response.headers["ETag"]
+            cached = requests.get(url, headers={"If-None-Match": etag}, timeout=5)
+            assert cached.status_code == 304
+        assert server.snapshot()["not_modified"] == 4
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_ingest_benchmark_reports_throughput(tmp_path, capsys):
+    out = tmp_path / "ingest.json"
+    argv = ["bench", "ingest", "--feeds", "4", "--items", "3", "--latency-ms", "0"]
+    assert main([*argv, "--jitter-ms", "0", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert (report["feeds_ok"], report["items_new"], report["server"]["ok"]) == (4, 12, 4)
+    assert report["fetch_p95_ms"] is not None
+    assert report["server"]["not_modified"] == 4
+    assert report["revisit_seconds"] is not None
+    assert "items/s" in capsys.readouterr().out
+
+
+def test_ingest_benchmark_without_etags_refetches_nothing(tmp_path):
+    argv = ["bench", "ingest", "--mode", "ingest", "--feeds", "3", "--items", "2"]
+    out = tmp_path / "ingest.json"
+    assert main([*argv, "--latency-ms", "0", "--no-etag", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["server"]["requests"] == 3
+    assert report["revisit_seconds"] is None
+
+
+def test_openai_summarizer_talks_to_the_fake_server():
+    config = FakeOpenAIConfig(latency_ms=1, latency_sigma=0)
+    server = FakeOpenAIServer(("127.0.0.1", 0), config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+        summarizer = OpenAISummarizer(base_url=base_url, api_key="fake-key", max_retries=0)
+        result = summarizer.summarize("Humanoid robot", "A humanoid robot learned to walk.")
+        assert len(result["bullets"]) == 3
+        assert result["usage"]["input_tokens"] == server.snapshot()["input_tokens"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_summarize_load_test_reports_unaccounted_cost_of_invalid_outputs(tmp_path, capsys):
+    out = tmp_path / "summarize.json"
+    argv = ["bench", "summarize", "--requests", "6", "--latency-ms", "1", "--invalid-rate", "1"]
+    assert main([*argv, "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["failures"] == {"invalid_output": 6}
+    assert report["retries"] == 0
+    assert report["accounted_cost_usd"] == 0
+    assert report["unaccounted_cost_usd"] == report["billed_cost_usd"] > 0
+    assert "unaccounted $" in capsys.readouterr().out
@@ -41,3 +41,31 @@ def test_summaries_command_displays_saved_summaries(tmp_path, capsys):
     assert "Showing 1 AI summaries" in captured.out
     assert "Stored summary article" in captured.out
     assert "AI summary text" in captured.out
+
+
+def test_summaries_command_fills_limit_past_unsummarized_articles(tmp_path, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {index}",
+                    "link": f"https://example.com/{index}",
+                    "published": f"2025-02-{index + 1:02d}T10:00:00+00:00",
+                    "source": "Feed A",
+                }
+                for index in range(6)
+            ],
+        )
+        oldest_ids = session.scalars(select(Article.id).order_by(Article.id).limit(2)).all()
+        for article_id in oldest_ids:
+            save_ai_summary(session, article_id, f"AI summary {article_id}", ["B1"])
+
+    exit_code = main(["summaries", "--db", str(db_path), "--limit", "2"])
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert "Showing 2 AI summaries" in captured.out
+    assert "Next cursor:" not in captured.out
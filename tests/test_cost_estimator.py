@@ -1,4 +1,8 @@
-from robotics_ai_digest.summarization.cost_estimator import count_tokens, estimate_api_cost
+from robotics_ai_digest.summarization.cost_estimator import (
+    count_tokens,
+    estimate_api_cost,
+    usage_cost,
+)
 
 
 def test_estimate_api_cost_short_prompt_returns_positive_value():
@@ -16,3 +20,9 @@ def test_count_tokens_is_deterministic_for_same_prompt():
     assert t1 == t2
     assert t1 > 0
 
+
+def test_usage_cost_prices_output_tokens_separately():
+    assert usage_cost(1000, 0, model="gpt-4.1-mini") == 0.0004
+    assert usage_cost(0, 1000, model="gpt-4.1-mini") == 0.0016
+    # Unknown models fall back to large-model pricing rather than a cheap guess.
+    assert usage_cost(1000, 1000, model="some-new-model") == 0.01
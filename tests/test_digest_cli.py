@@ -1,6 +1,19 @@
+from datetime import date, datetime, timezone
+import json
+
+import pytest
+from sqlalchemy import update
+
 from robotics_ai_digest.cli import main
+from robotics_ai_digest.digest.output import write_daily_digest, write_range_digests
+from robotics_ai_digest.digest.renderer_md import render_digest
 from robotics_ai_digest.storage.db import init_db
-from robotics_ai_digest.storage.repository import upsert_articles
+from robotics_ai_digest.storage.models import Article, ArticleFragment
+from robotics_ai_digest.storage.repository import (
+    get_articles_for_date,
+    save_ai_summary,
+    upsert_articles,
+)
 
 
 def test_digest_command_creates_markdown_file(tmp_path):
@@ -42,3 +55,242 @@ def test_digest_command_creates_markdown_file(tmp_path):
     assert "# Robotics & AI Digest \u2014 2025-02-10" in content
     assert "## Digest Source" in content
 
+
+def _strip_stamp(content: str) -> str:
+    return content.rsplit("Generated at: ", 1)[0]
+
+
+def test_streamed_digest_matches_in_memory_renderer(tmp_path):
+    db_path = tmp_path / "digest.db"
+    out_dir = tmp_path / "out"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {index}",
+                    "link": f"https://example.com/{index}",
+                    "published": f"2025-02-10T{10 + index:02d}:00:00+00:00",
+                    "summary": f"Summary {index}",
+                    # Interleaved sources check that streamed groups keep render_digest's order.
+                    "source": ["Source A", "Source B", "Source C"][index % 3],
+                }
+                for index in range(7)
+            ],
+        )
+        save_ai_summary(session, 2, "AI summary", ["Point A", "Point B"])
+
+    with session_factory() as session:
+        [output_path] = write_daily_digest(session, date(2025, 2, 10), out_dir)
+        articles = get_articles_for_date(session, date(2025, 2, 10))
+        expected = render_digest(date(2025, 2, 10), articles)
+
+    streamed = output_path.read_text(encoding="utf-8")
+    assert _strip_stamp(streamed) == _strip_stamp(expected)
+    assert streamed.index("## Source A") < streamed.index("## Source C")
+    assert list(out_dir.iterdir()) == [output_path]
+
+
+def test_streamed_digest_is_byte_identical_when_timestamps_tie(tmp_path, monkeypatch):
+    stamp = datetime(2025, 2, 11, 8, 0, tzinfo=timezone.utc)
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):  # noqa: ANN001, ANN206
+            return stamp
+
+    monkeypatch.setattr("robotics_ai_digest.digest.model.datetime", _FrozenDatetime)
+    session_factory = init_db(str(tmp_path / "digest.db"))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {index}",
+                    "link": f"https://example.com/{index}",
+                    "published": f"2025-02-10T{10 + index // 3:02d}:00:00+00:00",
+                    "summary": f"Summary {index}",
+                    "source": ["Source A", "Source B"][index % 2],
+                }
+                for index in range(6)
+            ],
+        )
+        # Equal publish and ingest times leave only the id to break ties.
+        session.execute(update(Article).values(created_at=datetime(2025, 2, 10, 12)))
+        session.commit()
+
+    with session_factory() as session:
+        expected = render_digest(
+            date(2025, 2, 10), get_articles_for_date(session, date(2025, 2, 10)), stamp
+        ).encode("utf-8")
+        [daily] = write_daily_digest(session, date(2025, 2, 10), tmp_path / "daily")
+        ranged = write_range_digests(
+            session, date(2025, 2, 10), date(2025, 2, 10), tmp_path / "range", workers=1
+        )
+
+    assert daily.read_bytes() == expected
+    assert [path.read_bytes() for path in ranged.written] == [expected]
+
+
+def test_digest_range_renders_daily_and_weekly_files(tmp_path, capsys):
+    db_path = tmp_path / "digest.db"
+    out_dir = tmp_path / "out"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {day}",
+                    "link": f"https://example.com/{day}",
+                    "published": f"2025-02-{day:02d}T09:00:00+00:00",
+                    "source": "Feed A",
+                }
+                for day in (7, 10, 11, 17)
+            ],
+        )
+
+    args = ["digest", "--db", str(db_path), "--out", str(out_dir), "--from", "2025-02-08"]
+    exit_code = main([*args, "--to", "2025-02-17", "--workers", "2"])
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert "Generated 3 digests" in captured.out
+    assert sorted(path.name for path in out_dir.glob("digest_*")) == [
+        "digest_2025-02-10.md",
+        "digest_2025-02-11.md",
+        "digest_2025-02-17.md",
+    ]
+
+    weekly_dir = tmp_path / "weekly"
+    args = ["digest", "--db", str(db_path), "--out", str(weekly_dir), "--from", "2025-02-08"]
+    assert main([*args, "--to", "2025-02-11", "--period", "week", "--workers", "1"]) == 0
+    assert sorted(path.name for path in weekly_dir.glob("digest_*")) == [
+        "digest_2025-W06.md",
+        "digest_2025-W07.md",
+    ]
+    weekly = (weekly_dir / "digest_2025-W07.md").read_text(encoding="utf-8")
+    assert "# Robotics & AI Digest \u2014 2025-W07" in weekly
+    assert "Total articles: 2" in weekly
+
+
+def test_digest_skips_unchanged_dates_and_rebuilds_changed_ones(tmp_path, capsys):
+    db_path = tmp_path / "digest.db"
+    out_dir = tmp_path / "out"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {day}",
+                    "link": f"https://example.com/{day}",
+                    "published": f"2025-02-{day:02d}T09:00:00+00:00",
+                    "source": "Feed A",
+                }
+                for day in (10, 11)
+            ],
+        )
+
+    args = ["digest", "--db", str(db_path), "--out", str(out_dir)]
+    range_args = [*args, "--from", "2025-02-10", "--to", "2025-02-11", "--workers", "1"]
+    assert main(range_args) == 0
+    assert "Generated 2 digests (0 unchanged)" in capsys.readouterr().out
+    first_mtime = (out_dir / "digest_2025-02-10.md").stat().st_mtime_ns
+
+    assert main(range_args) == 0
+    assert "Generated 0 digests (2 unchanged)" in capsys.readouterr().out
+    assert main([*args, "--date", "2025-02-10"]) == 0
+    assert "Unchanged:" in capsys.readouterr().out
+    assert (out_dir / "digest_2025-02-10.md").stat().st_mtime_ns == first_mtime
+
+    with session_factory() as session:
+        save_ai_summary(session, 2, "AI summary", ["b1"])
+
+    assert main([*args, "--changed-since", "2000-01-01T00:00:00", "--workers", "1"]) == 0
+    captured = capsys.readouterr()
+    assert "digest_2025-02-11.md" in captured.out
+    assert "Generated 1 digests (1 unchanged)" in captured.out
+
+
+def test_digest_reuses_cached_fragments_until_article_changes(tmp_path):
+    out_dir = tmp_path / "out"
+    session_factory = init_db(str(tmp_path / "digest.db"))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {index}",
+                    "link": f"https://example.com/{index}",
+                    "published": f"2025-02-10T{10 + index:02d}:00:00+00:00",
+                    "source": "Feed A",
+                }
+                for index in range(3)
+            ],
+        )
+
+    with session_factory() as session:
+        [path] = write_daily_digest(session, date(2025, 2, 10), out_dir)
+        first = path.read_text(encoding="utf-8")
+        assert session.query(ArticleFragment).count() == 3
+        [path] = write_daily_digest(session, date(2025, 2, 10), out_dir)
+        second = path.read_text(encoding="utf-8")
+        assert _strip_stamp(second) == _strip_stamp(first)
+
+        save_ai_summary(session, 2, "Fresh AI summary", ["b1"])
+        assert session.get(ArticleFragment, 2) is None
+        [path] = write_daily_digest(session, date(2025, 2, 10), out_dir)
+        third = path.read_text(encoding="utf-8")
+
+    assert "Fresh AI summary" in third
+    assert session_factory().query(ArticleFragment).count() == 3
+
+
+def test_digest_renders_markdown_html_and_json_feed_in_one_pass(tmp_path, capsys):
+    db_path = tmp_path / "digest.db"
+    out_dir = tmp_path / "out"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": "Grasping <fast>",
+                    "link": "https://example.com/g1",
+                    "guid": "g1",
+                    "published": "2025-02-10T09:15:00+00:00",
+                    "summary": "Grasp summary",
+                    "source": "Feed A",
+                },
+                {
+                    "title": "Walking",
+                    "link": "https://example.com/w1",
+                    "published": "2025-02-10T10:00:00+00:00",
+                    "source": "Feed B",
+                },
+            ],
+        )
+        save_ai_summary(session, 1, "AI grasp summary", ["b1", "b2"])
+
+    args = ["digest", "--db", str(db_path), "--date", "2025-02-10", "--out", str(out_dir)]
+    assert main([*args, "--format", "md,html,json"]) == 0
+    assert "digest_2025-02-10.json" in capsys.readouterr().out
+
+    markdown = (out_dir / "digest_2025-02-10.md").read_text(encoding="utf-8")
+    assert "- **[Grasping <fast>](https://example.com/g1)**" in markdown
+    html = (out_dir / "digest_2025-02-10.html").read_text(encoding="utf-8")
+    assert '<a href="https://example.com/g1">Grasping &lt;fast&gt;</a>' in html
+    assert "<li>b2</li>" in html
+    feed = json.loads((out_dir / "digest_2025-02-10.json").read_text(encoding="utf-8"))
+    assert feed["version"] == "https://jsonfeed.org/version/1.1"
+    assert [item["id"] for item in feed["items"]] == ["https://example.com/w1", "g1"]
+    assert feed["items"][1]["content_text"] == "AI grasp summary\n- b1\n- b2"
+    assert feed["items"][1]["date_published"] == "2025-02-10T09:15:00Z"
+    assert feed["_digest"]["total_articles"] == 2
+
+    assert main([*args, "--format", "md,json"]) == 0
+    assert capsys.readouterr().out.count("Unchanged:") == 2
+    with pytest.raises(SystemExit):
+        main([*args, "--format", "pdf"])
@@ -0,0 +1,75 @@
+import sqlite3
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.feeds.opml import parse_opml
+from robotics_ai_digest.feeds.sharding import parse_shard, select_shard
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.repository import add_feeds
+
+OPML = """<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>Feeds</title></head>
+  <body>
+    <outline text="Robotics">
+      <outline type="rss" text="Feed A" xmlUrl="https://example.com/a.xml"/>
+      <outline type="rss" text="Feed B" xmlUrl="https://example.com/b.xml"/>
+    </outline>
+    <outline type="rss" text="Feed A again" xmlUrl="https://example.com/a.xml"/>
+  </body>
+</opml>
+"""
+
+
+def test_feeds_import_export_and_ingest_from_registry(tmp_path, capsys, monkeypatch):
+    opml_path = tmp_path / "feeds.opml"
+    opml_path.write_text(OPML, encoding="utf-8")
+    db_path = str(tmp_path / "digest.db")
+
+    assert main(["feeds", "import", "--db", db_path, "--opml", str(opml_path)]) == 0
+    assert "New: 2" in capsys.readouterr().out
+
+    assert main(["feeds", "disable", "--db", db_path, "--url", "https://example.com/b.xml"]) == 0
+
+    fetched: list[list[str]] = []
+
+    def fake_fetch_rss(urls):  # noqa: ANN001, ANN202
+        fetched.append(list(urls))
+        return []
+
+    monkeypatch.setattr("robotics_ai_digest.cli.fetch_rss", fake_fetch_rss)
+    assert main(["ingest", "--db", db_path]) == 0
+    assert fetched == [["https://example.com/a.xml"]]
+
+    export_path = tmp_path / "export.opml"
+    assert main(["feeds", "export", "--db", db_path, "--out", str(export_path)]) == 0
+    assert parse_opml(export_path) == [
+        ("https://example.com/a.xml", "Feed A"),
+        ("https://example.com/b.xml", "Feed B"),
+    ]
+
+
+def test_ingest_without_feeds_fails(tmp_path, capsys):
+    exit_code = main(["ingest", "--db", str(tmp_path / "digest.db")])
+
+    assert exit_code == 1
+    assert "No feeds to ingest" in capsys.readouterr().out
+
+
+def test_select_shard_partitions_feeds_deterministically():
+    urls = [f"https://example.com/{i}.xml" for i in range(50)]
+    shards = [select_shard(urls, index, 4) for index in range(4)]
+
+    assert sorted(url for shard in shards for url in shard) == sorted(urls)
+    assert shards == [select_shard(urls, index, 4) for index in range(4)]
+    assert parse_shard("3/4") == (3, 4)
+
+
+def test_add_feeds_handles_more_urls_than_sqlite_binds(tmp_path):
+    session_factory = init_db(str(tmp_path / "digest.db"))
+    feeds = [(f"https://example.com/{index}.xml", None) for index in range(1_200)]
+    with session_factory() as session:
+        # Builds default to 32766 binds, or 999 before SQLite 3.32; lower it to match.
+        raw = session.connection().connection.dbapi_connection
+        raw.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        assert add_feeds(session, feeds[:10]) == (10, 0)
+        assert add_feeds(session, feeds) == (1_190, 10)
@@ -0,0 +1,211 @@
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import pairwise
+import threading
+import time
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.feeds.fulltext import (
+    CachedPage,
+    FetchOptions,
+    PageCache,
+    canonical_link,
+    extract_main_text,
+    fetch_pages,
+)
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.repository import upsert_articles
+from robotics_ai_digest.summarization.summarizer import Summarizer
+
+PARAGRAPH = "The robot learned to fold laundry from a few hundred demonstrations. " * 3
+PAGE = f"""<html><head><title>t</title><script>var tracking = 1;</script></head><body>
+<nav><p>Home | News | A very long navigation menu entry that should be ignored</p></nav>
+<p>A sidebar paragraph that is long enough to count but sits outside the article.</p>
+<article><h1>Headline</h1><p>{PARAGRAPH}</p><p>{PARAGRAPH}</p></article>
+<footer><p>Copyright and a long footer line that is not part of the story text.</p></footer>
+</body></html>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_PageServer"
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.server.enter(self.headers["Host"].split(":")[0])
+        try:
+            time.sleep(0.05)
+            status = 404 if "missing" in self.path else 503 if "flaky" in self.path else 200
+            body = PAGE.encode() if status == 200 else b"nope"
+            self.send_response(status)
+            charset = "x-no-such-charset" if "bogus" in self.path else "utf-8"
+            self.send_header("Content-Type", f"text/html; charset={charset}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            self.server.leave(self.headers["Host"].split(":")[0])
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+class _PageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.starts: dict[str, list[float]] = {}
+
+    def enter(self, host: str) -> None:
+        with self.lock:
+            self.requests += 1
+            self.starts.setdefault(host, []).append(time.monotonic())
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+
+    def leave(self, host: str) -> None:
+        with self.lock:
+            self.active[host] -= 1
+
+
+def test_canonical_link_drops_tracking_parameters_and_fragments():
+    assert (
+        canonical_link("HTTPS://Example.com:443/post?b=2&utm_source=rss&a=1#comments")
+        == "https://example.com/post?a=1&b=2"
+    )
+    assert canonical_link("http://example.com:8080") == "http://example.com:8080/"
+
+
+def test_extract_main_text_prefers_the_article_element():
+    text = extract_main_text(PAGE)
+    assert text == f"{PARAGRAPH.strip()}\n\n{PARAGRAPH.strip()}"
+    # Without <article>, every prose block outside navigation and footers is kept.
+    fallback = extract_main_text(PAGE.replace("<article>", "").replace("</article>", ""))
+    assert fallback.startswith("A sidebar paragraph")
+    assert "navigation" not in fallback and "Copyright" not in fallback
+
+
+def test_fetch_pages_limits_hosts_and_never_downloads_twice(tmp_path):
+    server = _PageServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        links = [f"http://127.0.0.1:{port}/a/{i}" for i in range(8)]
+        links += [f"http://localhost:{port}/b/{i}" for i in range(8)]
+        # Tracking variants share the cache entry of the plain link.
+        links += [f"http://127.0.0.1:{port}/a/0?utm_source=feed", f"http://127.0.0.1:{port}/a/1#x"]
+        links += [f"http://127.0.0.1:{port}/missing", f"http://127.0.0.1:{port}/flaky"]
+        cache = PageCache(tmp_path / "pages")
+        options = FetchOptions(concurrency=8, per_host=2, host_delay=0)
+
+        texts, stats = fetch_pages(links, cache, options)
+        assert len(texts) == 18
+        assert (stats.fetched, stats.cached, stats.failed) == (17, 0, 1)
+        assert server.requests == 18
+        assert server.peak == {"127.0.0.1": 2, "localhost": 2}
+        assert cache.get(f"http://127.0.0.1:{port}/missing").text == ""
+
+        # Only the transient failure is retried.
+        texts, stats = fetch_pages(links, cache, options)
+        assert (stats.fetched, stats.cached, stats.failed) == (0, 17, 1)
+        assert server.requests == 19
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_pages_spaces_request_starts_per_host(tmp_path):
+    server = _PageServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        links = [f"http://127.0.0.1:{port}/a/{i}" for i in range(4)]
+        options = FetchOptions(concurrency=8, per_host=4, host_delay=0.2)
+        texts, _ = fetch_pages(links, PageCache(tmp_path / "pages"), options)
+        assert len(texts) == 4
+        starts = server.starts["127.0.0.1"]
+        # Some slack for thread scheduling; without spacing the requests start together.
+        assert min(b - a for a, b in pairwise(starts)) > 0.15
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_pages_survives_unknown_charsets_and_extraction_errors(tmp_path, monkeypatch):
+    server = _PageServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        cache = PageCache(tmp_path / "pages")
+        options = FetchOptions(host_delay=0)
+        bogus = f"http://127.0.0.1:{port}/bogus"
+        texts, stats = fetch_pages([bogus], cache, options)
+        # Unknown charsets are decoded as UTF-8.
+        assert texts == {bogus: extract_main_text(PAGE)}
+
+        def broken(html):  # noqa: ANN001, ANN202
+            raise ValueError("unparseable")
+
+        monkeypatch.setattr("robotics_ai_digest.feeds.fulltext.extract_main_text", broken)
+        broken_link = f"http://127.0.0.1:{port}/a/broken"
+        texts, stats = fetch_pages([broken_link], cache, options)
+        assert texts == {}
+        assert (stats.fetched, stats.failed) == (1, 0)
+        assert cache.get(broken_link).text == ""
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_page_cache_treats_corrupt_entries_as_misses(tmp_path):
+    cache = PageCache(tmp_path)
+    link = "https://example.com/post"
+    cache.put(CachedPage(link, link, 200, "now", "Text"))
+    assert cache.get(link).text == "Text"
+    for payload in (b"{not json", b'["a list"]', b'{"link": "only"}', b"\xff\xfe"):
+        cache.path(link).write_bytes(gzip.compress(payload))
+        assert cache.get(link) is None
+
+
+class _RecordingSummarizer(Summarizer):
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def summarize(self, title: str, text: str) -> dict:
+        self.texts.append(text)
+        return {"summary": f"Summary of {title}", "bullets": ["Point"]}
+
+
+def test_summarize_full_text_uses_page_text(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {"title": "With page", "link": "https://example.com/page", "summary": "Teaser."},
+                {"title": "No page", "link": "https://example.com/gone", "summary": "Teaser two."},
+            ],
+        )
+
+    def fake_fetch_page(link, timeout, max_bytes):  # noqa: ANN001, ANN202
+        text = extract_main_text(PAGE) if link.endswith("/page") else ""
+        return CachedPage(canonical_link(link), link, 200 if text else 404, "now", text)
+
+    summarizer = _RecordingSummarizer()
+    monkeypatch.setattr("robotics_ai_digest.feeds.fulltext.fetch_page", fake_fetch_page)
+    monkeypatch.setattr("robotics_ai_digest.cli._build_summarizer", lambda *_: summarizer)
+    monkeypatch.setattr("robotics_ai_digest.cli.load_dotenv", lambda: None)
+    monkeypatch.setattr("robotics_ai_digest.cli.count_tokens", lambda text, model: len(text))
+    monkeypatch.setattr("robotics_ai_digest.cli.estimate_api_cost", lambda text, model: 0.0)
+
+    args = ["summarize", "--db", str(db_path), "--full-text", "--page-cache", str(tmp_path)]
+    assert main(args) == 0
+    assert "Full text: 1 of 2 pages (2 fetched, 0 cached, 0 failed)" in capsys.readouterr().out
+    assert sorted(summarizer.texts) == sorted([extract_main_text(PAGE), "Teaser two."])
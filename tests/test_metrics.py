@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.metrics import METRICS, Metrics
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_rss.xml"
+
+
+class DummyResponse:
+    content = FIXTURE.read_bytes()
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+def test_disabled_metrics_record_nothing_and_enabled_ones_summarize_samples():
+    metrics = Metrics()
+    with metrics.span("stage"):
+        metrics.count("rows", 5)
+    assert metrics.report()["counters"] == []
+    assert metrics.report()["timings"] == []
+
+    metrics.enable()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        metrics.observe("llm_request", seconds, model="m")
+    metrics.count("rows", 5, feed='a"b')
+    metrics.count("rows", 2, feed='a"b')
+
+    [timing] = metrics.report()["timings"]
+    assert (timing["count"], timing["p50"], timing["p99"], timing["max"]) == (4, 0.2, 0.4, 0.4)
+    prometheus = metrics.to_prometheus()
+    assert 'robotics_ai_digest_rows_total{feed="a\\"b"} 7' in prometheus
+    assert 'robotics_ai_digest_llm_request_seconds{model="m",quantile="0.9"} 0.400000' in (
+        prometheus
+    )
+    assert 'robotics_ai_digest_llm_request_seconds_count{model="m"} 4' in prometheus
+
+
+def test_ingest_writes_json_and_prometheus_reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "robotics_ai_digest.feeds.rss_reader.requests.get", lambda url, timeout: DummyResponse()
+    )
+    report_path = tmp_path / "metrics.json"
+    prom_path = tmp_path / "metrics.prom"
+    url = "https://example.com/rss.xml"
+
+    argv = ["--metrics-json", str(report_path), "--metrics-prom", str(prom_path)]
+    assert main([*argv, "ingest", "--db", str(tmp_path / "digest.db"), "--rss", url]) == 0
+    assert not METRICS.enabled
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    counters = {(c["name"], c["labels"].get("feed")): c["value"] for c in report["counters"]}
+    assert counters[("feed_bytes", url)] == len(DummyResponse.content)
+    assert counters[("articles_new", None)] == 2
+    timings = {t["name"] for t in report["timings"]}
+    assert {"command", "feed_fetch", "feed_parse", "db_upsert"} <= timings
+    assert 'robotics_ai_digest_feed_parse_seconds_count{feed="https://example.com/rss.xml"} 1' in (
+        prom_path.read_text(encoding="utf-8")
+    )
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from sqlalchemy import event, func, select
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.feeds.items import FeedItem
+from robotics_ai_digest.pipeline import _insert_batch
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.models import Article, ArticleSummary
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_rss.xml"
+
+
+def test_run_pipeline_ingests_summarizes_and_renders_digest(tmp_path, monkeypatch, capsys):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr("robotics_ai_digest.cli.load_dotenv", lambda: None)
+    xml_bytes = FIXTURE.read_bytes()
+
+    def fake_download(url, timeout):  # noqa: ANN001, ANN202
+        return xml_bytes.replace(b"https://example.com/", url.encode() + b"/")
+
+    monkeypatch.setattr("robotics_ai_digest.pipeline.download_feed", fake_download)
+
+    db_path = tmp_path / "digest.db"
+    out_dir = tmp_path / "out"
+    exit_code = main(
+        [
+            "run",
+            "--db",
+            str(db_path),
+            "--rss",
+            "https://one.example",
+            "https://two.example",
+            "--pipeline",
+            "--summarize",
+            "--digest-out",
+            str(out_dir),
+            "--digest-date",
+            "2025-02-10",
+        ]
+    )
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    # "alpha-1" is the same guid in both feeds, so it is only stored once.
+    assert "New: 3" in captured.out
+    assert "Summarized: 3 (0 failed)" in captured.out
+    assert (out_dir / "digest_2025-02-10.md").exists()
+
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(Article)) == 3
+        assert session.scalar(select(func.count()).select_from(ArticleSummary)) == 3
+
+
+def test_insert_batch_does_not_reload_each_new_article(tmp_path):
+    session_factory = init_db(str(tmp_path / "digest.db"))
+    items = [
+        FeedItem(title=f"Robot {i}", link=f"https://example.com/{i}", summary="s", source="Feed")
+        for i in range(20)
+    ]
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, *args):  # noqa: ANN001, ANN002, ANN202
+        statements.append(statement)
+
+    engine = session_factory.kw["bind"]
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        rows, duplicates = _insert_batch(session_factory, items)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert duplicates == 0
+    assert [row[1] for row in rows] == [f"Robot {i}" for i in range(20)]
+    assert sum(statement.lstrip().startswith("SELECT") for statement in statements) < 5
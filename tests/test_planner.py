@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+import time
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.repository import (
+    get_summary_candidates,
+    save_ai_summary,
+    upsert_articles,
+)
+from robotics_ai_digest.storage.rows import SummaryCandidate
+from robotics_ai_digest.summarization.planner import (
+    PriorityWeights,
+    fit_to_budget,
+    plan_summaries,
+)
+
+
+def _candidate(
+    article_id: int, age_days: float = 0.0, source: str = "A", title: str = "News", chars: int = 300
+) -> SummaryCandidate:
+    return SummaryCandidate(article_id, source, title, age_days, chars)
+
+
+def test_plan_prefers_recent_weighted_and_relevant_articles():
+    candidates = [
+        _candidate(1, age_days=30),
+        _candidate(2, age_days=0),
+        _candidate(3, age_days=1, source="Favourite"),
+        _candidate(4, age_days=1, title="Humanoid robot learns manipulation"),
+        _candidate(5, age_days=1),
+    ]
+    weights = PriorityWeights(source_weights={"Favourite": 3.0})
+    plan = plan_summaries(candidates, budget_usd=1.0, weights=weights, max_articles=3)
+
+    assert [c.id for c in plan.selected] == [3, 4, 2]
+    assert plan.candidates == 5
+
+
+def test_plan_stays_under_budget_and_fills_it_with_cheaper_articles():
+    candidates = [_candidate(1, chars=30_000)] + [_candidate(i, age_days=1) for i in range(2, 50)]
+    single = plan_summaries(candidates[1:2], budget_usd=1.0).estimated_cost_usd
+    plan = plan_summaries(candidates, budget_usd=single * 10.5)
+
+    assert len(plan.selected) == 10
+    assert 1 not in {c.id for c in plan.selected}
+    assert plan.estimated_cost_usd <= plan.budget_usd
+    assert plan_summaries(candidates, budget_usd=single / 2).selected == []
+
+
+def test_plan_with_full_text_length_costs_more():
+    candidates = [_candidate(i) for i in range(10)]
+    teaser = plan_summaries(candidates, budget_usd=0.005)
+    full_text = plan_summaries(candidates, budget_usd=0.005, source_chars=8_000)
+
+    assert len(full_text.selected) < len(teaser.selected)
+
+
+def test_plan_100k_candidates_quickly():
+    candidates = [
+        _candidate(
+            i,
+            age_days=i / 1000,
+            source=f"S{i % 50}",
+            title=f"Robot story {i}",
+            chars=200 + i % 3000,
+        )
+        for i in range(100_000)
+    ]
+    start = time.perf_counter()
+    plan = plan_summaries(candidates, budget_usd=5.0)
+    assert time.perf_counter() - start < 1.0
+    assert plan.selected and plan.estimated_cost_usd <= 5.0
+
+
+def test_fit_to_budget_skips_items_that_overshoot():
+    assert fit_to_budget("abcd", [0.4, 0.7, 0.3, 0.3], 1.0) == ["a", "c", "d"]
+
+
+def test_summary_candidates_skip_summarized_articles(tmp_path):
+    session_factory = init_db(str(tmp_path / "digest.db"))
+    published = datetime.now(timezone.utc) - timedelta(days=2)
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": "Old",
+                    "link": "https://example.com/old",
+                    "summary": "x" * 120,
+                    "published": published.isoformat(),
+                },
+                {"title": "Done", "link": "https://example.com/done", "summary": "y"},
+                {"title": "No teaser", "link": "https://example.com/bare", "summary": None},
+            ],
+        )
+        done = [c.id for c in get_summary_candidates(session) if c.title == "Done"]
+        save_ai_summary(session, done[0], "Summary", ["Point"])
+        candidates = {c.title: c for c in get_summary_candidates(session)}
+
+    assert set(candidates) == {"Old", "No teaser"}
+    assert round(candidates["Old"].age_days) == 2 and candidates["Old"].chars == 120
+    assert candidates["No teaser"].chars == len("No teaser")
+
+
+def test_summarize_budget_dry_run_plans_within_the_cap(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"Article {i}",
+                    "link": f"https://example.com/{i}",
+                    "summary": "Teaser " * 40,
+                    "source": "Lab blog" if i == 7 else "Feed",
+                }
+                for i in range(20)
+            ],
+        )
+    monkeypatch.setattr("robotics_ai_digest.cli.load_dotenv", lambda: None)
+    monkeypatch.setattr("robotics_ai_digest.cli.count_tokens", lambda text, model: len(text) // 4)
+    monkeypatch.setattr("robotics_ai_digest.cli.estimate_api_cost", lambda text, model: 0.0005)
+
+    args = ["summarize", "--db", str(db_path), "--dry-run", "--budget-usd", "0.0026"]
+    assert main([*args, "--source-weight", "Lab blog=5"]) == 0
+    out = capsys.readouterr().out
+    assert "Budget plan: " in out and " of 20 articles" in out
+    # Exact estimates trim the plan to what the cap really allows.
+    assert "Estimated cost (USD): $0.002500" in out
+    assert "Estimated output tokens: 1100" in out
+
+    assert main([*args[:-1], "0"]) == 1
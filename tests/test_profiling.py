@@ -0,0 +1,44 @@
+import pstats
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.profiling import should_profile
+
+
+def test_profile_writes_pstats_and_hotspot_summary(tmp_path, capsys):
+    profile_dir = tmp_path / "profiles"
+    db_path = tmp_path / "digest.db"
+
+    argv = ["--profile", "all", "--profile-dir", str(profile_dir), "--profile-top", "5"]
+    assert main([*argv, "stats", "--db", str(db_path), "--json"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out.startswith("{")
+    assert "Profile summary: " in captured.err
+
+    [stats_path] = profile_dir.glob("stats-*.pstats")
+    assert pstats.Stats(str(stats_path)).total_calls > 0
+    summary = stats_path.with_suffix(".txt").read_text(encoding="utf-8")
+    assert "== CPU: top 5 functions by cumulative time ==" in summary
+    assert "handler_stats" in summary
+    assert "== Memory: peak " in summary
+
+
+def test_profile_sampling_skips_unsampled_runs(tmp_path):
+    assert should_profile(0.25, draw=lambda: 0.1)
+    assert not should_profile(0.25, draw=lambda: 0.5)
+
+    profile_dir = tmp_path / "profiles"
+    assert (
+        main(
+            [
+                "--profile",
+                "cpu",
+                "--profile-dir",
+                str(profile_dir),
+                "--profile-sample",
+                "0",
+                "version",
+            ]
+        )
+        == 0
+    )
+    assert not profile_dir.exists()
@@ -0,0 +1,131 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.models import ArticleSummary
+from robotics_ai_digest.storage.repository import upsert_articles
+from robotics_ai_digest.storage.rows import SummaryCandidate
+from robotics_ai_digest.summarization.planner import plan_summaries
+from robotics_ai_digest.summarization.router import ModelRouter, Route, parse_route
+from robotics_ai_digest.summarization.summarizer import Summarizer
+
+ROUTES = ["extractive<=20", "cheap-model<=200", "paper-model@arxiv*,*Journal"]
+
+
+def test_parse_route_and_first_match_wins():
+    assert parse_route("gpt-4.1-nano<=400@ArXiv*, lab blog") == Route(
+        "gpt-4.1-nano", 400, ("arxiv*", "lab blog")
+    )
+    with pytest.raises(ValueError):
+        parse_route("gpt-4.1<=many")
+
+    router = ModelRouter([parse_route(spec) for spec in ROUTES], "strong-model")
+    assert router.model_for(10, "arXiv cs.RO") == "extractive"
+    assert router.model_for(150, "Robot Report") == "cheap-model"
+    assert router.model_for(900, "arXiv cs.RO") == "paper-model"
+    assert router.model_for(900, "Science Robotics journal") == "paper-model"
+    assert router.model_for(900, "Robot Report") == "strong-model"
+
+
+def test_plan_prices_candidates_at_their_routed_model():
+    candidates = [SummaryCandidate(i, "Feed", f"News {i}", 0.0, 20) for i in range(5)]
+    candidates += [SummaryCandidate(i, "Feed", f"Long read {i}", 0.0, 6_000) for i in range(5, 10)]
+    router = ModelRouter([Route("extractive", 50)], "gpt-4.1")
+    plan = plan_summaries(candidates, budget_usd=0.007, router=router)
+
+    # Short items are free, so they all fit alongside what the budget buys at gpt-4.1 rates.
+    assert {c.id for c in plan.selected} == {0, 1, 2, 3, 4, 5}
+    assert plan.estimated_cost_usd <= 0.007
+
+
+class _NamedSummarizer(Summarizer):
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    def summarize(self, title: str, text: str) -> dict:
+        return {"summary": f"{self.model}: {title}", "bullets": ["Point"], "model": self.model}
+
+
+def test_summarize_routes_articles_and_records_the_model(tmp_path, monkeypatch, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = init_db(str(db_path))
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": "Tiny",
+                    "link": "https://example.com/1",
+                    "summary": "Short.",
+                    "source": "Blog",
+                },
+                {
+                    "title": "Mid",
+                    "link": "https://example.com/2",
+                    "summary": "word " * 100,
+                    "source": "Blog",
+                },
+                {
+                    "title": "Paper",
+                    "link": "https://example.com/3",
+                    "summary": "word " * 600,
+                    "source": "arXiv",
+                },
+                {
+                    "title": "Long",
+                    "link": "https://example.com/4",
+                    "summary": "word " * 600,
+                    "source": "Blog",
+                },
+            ],
+        )
+    built: list[str] = []
+
+    def build(model, base_url=None):  # noqa: ANN001, ANN202
+        built.append(model)
+        return _NamedSummarizer(model)
+
+    monkeypatch.setattr("robotics_ai_digest.cli._build_summarizer", build)
+    monkeypatch.setattr("robotics_ai_digest.cli.load_dotenv", lambda: None)
+    monkeypatch.setattr(
+        "robotics_ai_digest.cli.count_tokens", lambda text, model: len(text.split())
+    )
+    monkeypatch.setattr(
+        "robotics_ai_digest.cli.estimate_api_cost",
+        lambda text, model: {"cheap-model": 0.001}.get(model, 0.01),
+    )
+    args = ["summarize", "--db", str(db_path), "--model", "strong-model"]
+    args += [arg for spec in ROUTES for arg in ("--route", spec)]
+
+    assert main([*args, "--dry-run"]) == 0
+    out = capsys.readouterr().out
+    assert "Routes: " in out and "extractive 1" in out and "paper-model 1" in out
+    assert "Estimated output tokens: 660" in out
+    assert "Estimated cost (USD): $0.021000" in out
+    assert built == []
+
+    assert main(args) == 0
+    with session_factory() as session:
+        rows = session.execute(select(ArticleSummary.summary_ai, ArticleSummary.model)).all()
+    assert sorted(model for _, model in rows) == [
+        "cheap-model",
+        "extractive",
+        "paper-model",
+        "strong-model",
+    ]
+    assert ("Short.", "extractive") in rows
+    assert sorted(built) == ["cheap-model", "paper-model", "strong-model"]
+
+
+def test_init_db_adds_the_model_column_to_older_databases(tmp_path):
+    db_path = tmp_path / "old.db"
+    init_db(str(db_path)).kw["bind"].dispose()
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("ALTER TABLE article_summaries DROP COLUMN model")
+    init_db(str(db_path))
+    with sqlite3.connect(db_path) as connection:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(article_summaries)")}
+    assert "model" in columns
@@ -1,3 +1,4 @@
+from datetime import datetime, timezone
 from pathlib import Path
 
 from robotics_ai_digest.feeds.rss_reader import fetch_rss
@@ -25,12 +26,13 @@ def test_fetch_rss_parses_feed_and_deduplicates(monkeypatch):
     items = fetch_rss(["https://example.com/rss.xml"])
 
     assert len(items) == 2
-    assert items[0]["title"] == "Robot Alpha"
-    assert items[0]["guid"] == "alpha-1"
-    assert items[0]["source"] == "Robotics News"
-    assert items[0]["published"] == "2025-02-10T10:00:00+00:00"
-    assert items[1]["title"] == "Robot Beta"
-    assert items[1]["guid"] == "https://example.com/beta"
+    assert items[0].title == "Robot Alpha"
+    assert items[0].guid == "alpha-1"
+    assert items[0].source == "Robotics News"
+    assert items[0].published == datetime(2025, 2, 10, 10, 0, tzinfo=timezone.utc)
+    assert items[0].to_dict()["published"] == "2025-02-10T10:00:00+00:00"
+    assert items[1].title == "Robot Beta"
+    assert items[1].guid == "https://example.com/beta"
 
 
 def test_fetch_rss_invalid_feed_returns_empty_list(monkeypatch):
@@ -43,3 +45,25 @@ def test_fetch_rss_invalid_feed_returns_empty_list(monkeypatch):
 
     assert items == []
 
+
+
+def test_fetch_rss_revalidates_with_stored_etags(monkeypatch):
+    xml_bytes = (Path(__file__).parent / "fixtures" / "sample_rss.xml").read_bytes()
+    sent = []
+
+    def fake_get(url, timeout, headers=None):  # noqa: ANN001, ANN202
+        sent.append(headers)
+        if headers == {"If-None-Match": '"v1"'}:
+            response = DummyResponse(b"", 304)
+        else:
+            response = DummyResponse(xml_bytes)
+        response.headers = {"ETag": '"v1"'}
+        return response
+
+    monkeypatch.setattr("robotics_ai_digest.feeds.rss_reader.requests.get", fake_get)
+
+    etags: dict[str, str] = {}
+    assert len(fetch_rss(["https://example.com/rss.xml"], etags=etags)) == 2
+    assert etags == {"https://example.com/rss.xml": '"v1"'}
+    assert fetch_rss(["https://example.com/rss.xml"], etags=etags) == []
+    assert sent == [None, {"If-None-Match": '"v1"'}]
@@ -0,0 +1,47 @@
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.search import search_articles
+
+
+ARTICLES = [
+    {
+        "title": "Humanoid robot learns to walk",
+        "link": "https://example.com/humanoid",
+        "published": "2025-02-10T10:00:00+00:00",
+        "summary": "Locomotion research",
+        "source": "Feed A",
+    },
+    {
+        "title": "Warehouse automation update",
+        "link": "https://example.com/warehouse",
+        "published": "2025-02-11T10:00:00+00:00",
+        "summary": "Logistics news",
+        "source": "Feed B",
+    },
+]
+SUMMARIES = {"https://example.com/warehouse": ("Uses a diffusion policy for picking", ["b1"])}
+
+
+def test_search_matches_titles_and_ai_summaries(seeded_db):
+    session_factory = seeded_db(ARTICLES, summaries=SUMMARIES)
+
+    with session_factory() as session:
+        by_title = search_articles(session, "humanoid")
+        by_summary = search_articles(session, '"diffusion policy"')
+        filtered = search_articles(session, "humanoid", source="Feed B")
+
+    assert [hit.article.title for hit in by_title] == ["Humanoid robot learns to walk"]
+    assert [hit.article.title for hit in by_summary] == ["Warehouse automation update"]
+    assert "[diffusion policy]" in by_summary[0].snippet
+    assert filtered == []
+
+
+def test_search_command_prints_ranked_results(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    seeded_db(ARTICLES, summaries=SUMMARIES, path=db_path)
+
+    exit_code = main(["search", "--db", str(db_path), "--query", "walk", "--from", "2025-02-10"])
+    captured = capsys.readouterr()
+
+    assert exit_code == 0
+    assert "Found 1 results for: walk" in captured.out
+    assert "Humanoid robot learns to walk" in captured.out
@@ -0,0 +1,145 @@
+from datetime import date
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+from sqlalchemy import text
+
+from robotics_ai_digest.server import make_server
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.repository import save_ai_summary, upsert_articles
+
+
+def _article(index):  # noqa: ANN001, ANN202
+    return {
+        "title": f"Robot arm {index}",
+        "link": f"https://example.com/{index}",
+        "published": f"2025-02-10T{10 + index:02d}:00:00+00:00",
+        "summary": f"Manipulation result {index}",
+        "source": "Feed A",
+    }
+
+
+@pytest.fixture
+def served(tmp_path):  # noqa: ANN001, ANN201
+    session_factory = init_db(str(tmp_path / "digest.db"))
+    with session_factory() as session:
+        upsert_articles(session, [_article(0), _article(1)])
+    server = make_server(session_factory, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield session_factory, server, f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, etag=None):  # noqa: ANN001, ANN202
+    request = Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as exc:
+        return exc.code, exc.headers, exc.read()
+
+
+def test_serve_answers_from_cache_until_the_database_changes(served):
+    session_factory, server, base = served
+
+    status, headers, body = _get(f"{base}/articles?limit=1")
+    assert status == 200
+    payload = json.loads(body)
+    assert [article["title"] for article in payload["articles"]] == ["Robot arm 1"]
+    assert payload["next_cursor"]
+
+    etag = headers["ETag"]
+    status, _, body = _get(f"{base}/articles?limit=1", etag=etag)
+    assert (status, body) == (304, b"")
+    assert server.api.cache.hits == 1
+
+    with session_factory() as session:
+        upsert_articles(session, [_article(2)])
+        save_ai_summary(session, 1, "AI summary", ["b1"])
+
+    status, headers, body = _get(f"{base}/articles?limit=1", etag=etag)
+    assert status == 200
+    assert headers["ETag"] != etag
+    assert json.loads(body)["articles"][0]["title"] == "Robot arm 2"
+
+    status, _, body = _get(f"{base}/summaries")
+    assert [article["bullets"] for article in json.loads(body)["articles"]] == [["b1"]]
+
+
+def test_serve_renders_search_and_digests(served):
+    _, _, base = served
+
+    status, _, body = _get(f"{base}/search?q=manipulation&limit=5")
+    assert status == 200
+    assert len(json.loads(body)["results"]) == 2
+
+    status, headers, body = _get(f"{base}/digests/2025-02-10")
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/markdown")
+    assert body.decode("utf-8").startswith("# Robotics & AI Digest \u2014 2025-02-10")
+
+    status, headers, body = _get(f"{base}/digests/2025-02-10.json")
+    assert headers["Content-Type"] == "application/feed+json"
+    assert len(json.loads(body)["items"]) == 2
+
+    status, _, body = _get(f"{base}/trending?date=2025-02-10&limit=3")
+    assert status == 200
+    assert json.loads(body)["days"] == 1
+
+    assert _get(f"{base}/digests/2025-02-10.pdf")[0] == 404
+    assert _get(f"{base}/search")[0] == 400
+    assert _get(f"{base}/articles?cursor=nope")[0] == 400
+    assert _get(f"{base}/nothing")[0] == 404
+
+
+def test_serve_matches_etag_lists_weak_tags_and_wildcards(served):
+    _, _, base = served
+    etag = _get(f"{base}/articles")[1]["ETag"]
+
+    assert _get(f"{base}/articles", etag=f'"other",{etag}')[0] == 304
+    assert _get(f"{base}/articles", etag=f' "other" ,  W/{etag} ')[0] == 304
+    assert _get(f"{base}/articles", etag="*")[0] == 304
+    assert _get(f"{base}/articles", etag='"other"')[0] == 200
+
+
+def test_serve_answers_500_without_caching_and_tolerates_bad_bullets(served, monkeypatch):
+    session_factory, server, base = served
+    with session_factory() as session:
+        save_ai_summary(session, 1, "AI summary", ["b1"])
+        session.execute(text("UPDATE article_summaries SET bullets_ai = '[broken'"))
+        session.commit()
+    status, _, body = _get(f"{base}/summaries")
+    assert status == 200
+    assert json.loads(body)["articles"][0]["bullets"] == []
+
+    def explode(*args, **kwargs):  # noqa: ANN002, ANN003, ANN202
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr("robotics_ai_digest.server.get_article_page", explode)
+    misses = server.api.cache.misses
+    for _ in range(2):
+        status, _, body = _get(f"{base}/articles?limit=2")
+        assert status == 500
+        assert json.loads(body) == {"error": "internal error"}
+    assert server.api.cache.misses == misses + 2
+
+
+def test_trending_defaults_to_today_per_day(served, monkeypatch):
+    _, server, _ = served
+    today = [date(2025, 2, 10)]
+
+    class _Today(date):
+        @classmethod
+        def today(cls):  # noqa: ANN206
+            return today[0]
+
+    monkeypatch.setattr("robotics_ai_digest.server.date", _Today)
+    assert json.loads(server.api.handle("/trending").body)["date"] == "2025-02-10"
+    today[0] = date(2025, 2, 11)
+    assert json.loads(server.api.handle("/trending").body)["date"] == "2025-02-11"
@@ -0,0 +1,87 @@
+from datetime import date
+import json
+
+from sqlalchemy import delete, select
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.models import Article, DailySourceStats
+from robotics_ai_digest.storage.repository import save_ai_summary
+from robotics_ai_digest.storage.stats import (
+    get_daily_stats,
+    get_stats_by_source,
+    get_stats_total,
+    rebuild_stats,
+)
+
+
+ARTICLES = [
+    {
+        "title": f"Article {index}",
+        "link": f"https://example.com/{index}",
+        "published": f"2025-02-{10 + index % 2:02d}T09:00:00+00:00",
+        "source": ["Feed A", "Feed B"][index % 2],
+    }
+    for index in range(5)
+]
+# Duplicates must not be counted twice.
+DUPLICATES = [{"link": "https://example.com/0", "source": "Feed A"}]
+SUMMARIES = {
+    "https://example.com/0": ("S0", ["b"], 100, 50, 0.003),
+    "https://example.com/1": ("S1", ["b"]),
+}
+
+
+def _snapshot(session):  # noqa: ANN001, ANN202
+    return [
+        (row.day, row.source, row.articles, row.summarized, row.input_tokens, row.cost_usd)
+        for row in session.scalars(
+            select(DailySourceStats).order_by(DailySourceStats.day, DailySourceStats.source)
+        )
+    ]
+
+
+def test_stats_are_maintained_incrementally_and_match_a_rebuild(seeded_db):
+    session_factory = seeded_db(ARTICLES, DUPLICATES, summaries=SUMMARIES)
+
+    with session_factory() as session:
+        total = get_stats_total(session)
+        assert (total.articles, total.summarized, total.input_tokens) == (5, 2, 100)
+        assert total.coverage == 0.4
+        assert [
+            (row.key, row.articles, row.summarized) for row in get_stats_by_source(session)
+        ] == [
+            ("Feed A", 3, 1),
+            ("Feed B", 2, 1),
+        ]
+        daily = get_daily_stats(session, since=date(2025, 2, 11))
+        assert [(row.key, row.articles) for row in daily] == [("2025-02-11", 2)]
+
+        incremental = _snapshot(session)
+        rebuild_stats(session)
+        assert _snapshot(session) == incremental
+
+        # Re-summarizing adds spend without counting the article twice.
+        article_id = session.scalar(select(Article.id).where(Article.title == "Article 0"))
+        save_ai_summary(session, article_id, "S0 again", ["b"], 10, 5, 0.001)
+        total = get_stats_total(session, "Feed A")
+        assert (total.summarized, total.input_tokens) == (1, 110)
+        assert round(total.cost_usd, 6) == 0.004
+
+
+def test_stats_command_backfills_legacy_databases_and_prints_json(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = seeded_db(ARTICLES, DUPLICATES, summaries=SUMMARIES, path=db_path)
+    with session_factory() as session:
+        session.execute(delete(DailySourceStats))
+        session.commit()
+
+    assert main(["stats", "--db", str(db_path), "--json", "--days", "0"]) == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["total"]["articles"] == 5
+    assert payload["total"]["cost_usd"] == 0.003
+    assert payload["sources"]["Feed B"]["coverage"] == 0.5
+
+    assert main(["stats", "--db", str(db_path), "--source", "Feed A", "--rebuild"]) == 0
+    captured = capsys.readouterr()
+    assert "Articles: 3" in captured.out
+    assert "Summarized: 1 (33.3%)" in captured.out
@@ -1,16 +1,20 @@
-from datetime import date
+from datetime import date, datetime, timezone
 
 from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import sessionmaker
 
+from robotics_ai_digest.feeds.items import FeedItem
 from robotics_ai_digest.storage.models import Article, Base
 from robotics_ai_digest.storage.repository import (
     get_articles_for_date,
+    get_article_page,
     get_articles_missing_ai_summary,
+    get_recent_article_rows,
     get_recent_articles,
     save_ai_summary,
     upsert_articles,
 )
+from robotics_ai_digest.storage.rows import ArticleRow
 
 
 def test_upsert_articles_does_not_insert_duplicate():
@@ -185,3 +189,107 @@ def test_save_ai_summary_updates_missing_query():
         save_ai_summary(session, article_id, "AI summary", ["b1", "b2", "b3"])
         missing_after = get_articles_missing_ai_summary(session, limit=10)
         assert missing_after == []
+
+
+def test_upsert_articles_accepts_feed_items_and_dicts():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+
+    items = [
+        FeedItem(
+            link="https://example.com/typed",
+            title="Typed",
+            published=datetime(2025, 1, 2, 10, 0, tzinfo=timezone.utc),
+            source="Feed A",
+            guid="g-typed",
+        ),
+        {"title": "Legacy", "link": "https://example.com/legacy", "source": "Feed A"},
+    ]
+
+    with session_factory() as session:
+        nb_new, nb_duplicates = upsert_articles(session, items)
+        recent = get_recent_articles(session, limit=10)
+
+    assert (nb_new, nb_duplicates) == (2, 0)
+    assert {article.title for article in recent} == {"Typed", "Legacy"}
+    typed = next(article for article in recent if article.title == "Typed")
+    assert typed.published is not None
+    assert typed.published.replace(tzinfo=None) == datetime(2025, 1, 2, 10, 0)
+
+
+def test_get_recent_article_rows_joins_summary_in_one_query():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": "Summarized",
+                    "link": "https://example.com/summarized",
+                    "published": "2025-02-12T08:00:00+00:00",
+                    "source": "Feed A",
+                },
+                {
+                    "title": "Plain",
+                    "link": "https://example.com/plain",
+                    "published": "2025-02-11T08:00:00+00:00",
+                    "source": "Feed A",
+                },
+            ],
+        )
+        summarized_id = session.scalar(select(Article.id).where(Article.title == "Summarized"))
+        save_ai_summary(session, summarized_id, "AI summary", ["b1"])
+
+    with session_factory() as session:
+        rows = get_recent_article_rows(session, limit=10)
+        assert len(session.identity_map) == 0
+
+    assert [row.title for row in rows] == ["Summarized", "Plain"]
+    assert isinstance(rows[0], ArticleRow)
+    assert rows[0].summary_ai == "AI summary"
+    assert rows[1].summary_ai is None
+
+
+def test_get_article_page_keyset_pagination_and_summary_filter():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, future=True)
+
+    with session_factory() as session:
+        upsert_articles(
+            session,
+            [
+                {
+                    "title": f"A{index}",
+                    "link": f"https://example.com/{index}",
+                    # Pairs of identical timestamps exercise the id tie-breaker.
+                    "published": f"2025-01-{index // 2 + 1:02d}T10:00:00+00:00",
+                    "source": "Feed A",
+                }
+                for index in range(9)
+            ],
+        )
+        for article_id in (1, 2, 3):
+            save_ai_summary(session, article_id, f"AI {article_id}", ["b"])
+
+        titles: list[str] = []
+        cursor = None
+        while True:
+            page = get_article_page(session, limit=4, cursor=cursor)
+            titles.extend(row.title for row in page.rows)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        summarized = get_article_page(session, limit=2, summarized_only=True)
+        last = get_article_page(
+            session, limit=2, summarized_only=True, cursor=summarized.next_cursor
+        )
+
+    assert titles == ["A8", "A7", "A6", "A5", "A4", "A3", "A2", "A1", "A0"]
+    assert [row.id for row in summarized.rows] == [3, 2]
+    assert [row.id for row in last.rows] == [1]
+    assert last.next_cursor is None
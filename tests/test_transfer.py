@@ -0,0 +1,122 @@
+from datetime import date, datetime
+import importlib.util
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.db import init_db
+from robotics_ai_digest.storage.models import Article, ArticleSummary
+from robotics_ai_digest.storage.repository import save_ai_summary
+from robotics_ai_digest.storage.stats import get_stats_by_source, rebuild_stats
+from robotics_ai_digest.storage.trending import get_trending_terms
+from robotics_ai_digest.transfer import export_articles, import_articles, iter_import_records
+
+
+def _articles(count=5):  # noqa: ANN001, ANN202
+    return [
+        {
+            "title": f"Humanoid robot update {index}",
+            "link": f"https://example.com/{index}",
+            "guid": f"guid-{index}",
+            "published": f"2025-02-{10 + index:02d}T09:00:00+00:00",
+            "summary": 'Gripper, policy, "quoted" text\nover two lines',
+            "source": "Feed A" if index % 2 else "Feed B",
+        }
+        for index in range(count)
+    ]
+
+
+SUMMARIES = {"https://example.com/0": ("AI summary.", ["One", "Two"], 100, 20, 0.001)}
+
+
+@pytest.mark.parametrize("name", ["export.ndjson", "export.csv.gz"])
+def test_export_import_round_trip(tmp_path, seeded_db, name):
+    source = seeded_db(_articles(), summaries=SUMMARIES, path=tmp_path / "source.db")
+    out = tmp_path / name
+    with source() as session:
+        result = export_articles(session, out)
+    assert result.rows == 5
+    assert result.watermark is not None and result.watermark.tzinfo is not None
+
+    target = init_db(str(tmp_path / "target.db"))
+    with target() as session:
+        imported = import_articles(session, iter_import_records(out), batch_size=2)
+        assert (imported.new, imported.duplicates, imported.summaries) == (5, 0, 1)
+        summary = session.scalars(select(ArticleSummary)).one()
+        assert json.loads(summary.bullets_ai) == ["One", "Two"]
+        assert summary.cost_usd == pytest.approx(0.001)
+        article = session.scalars(select(Article).where(Article.link == summary.article.link)).one()
+        assert article.summary == 'Gripper, policy, "quoted" text\nover two lines'
+        assert article.guid == "guid-0"
+
+        # Aggregates are updated incrementally and match a full rebuild.
+        incremental = get_stats_by_source(session)
+        rebuild_stats(session)
+        assert get_stats_by_source(session) == incremental
+        assert get_trending_terms(session, end=date(2025, 2, 14), days=7, min_count=1)
+
+        again = import_articles(session, iter_import_records(out))
+        assert (again.new, again.duplicates, again.summaries) == (0, 5, 0)
+        assert session.scalar(select(func.count()).select_from(Article)) == 5
+
+
+def test_import_adds_missing_summaries_to_stored_articles(tmp_path, seeded_db):
+    source = seeded_db(_articles(), summaries=SUMMARIES, path=tmp_path / "source.db")
+    out = tmp_path / "export.ndjson"
+    with source() as session:
+        export_articles(session, out)
+
+    target = seeded_db(_articles(), summaries=SUMMARIES, path=tmp_path / "target.db")
+    with target() as session:
+        session.execute(ArticleSummary.__table__.delete())
+        session.commit()
+        rebuild_stats(session)
+        imported = import_articles(session, iter_import_records(out))
+        assert (imported.new, imported.summaries) == (0, 1)
+        assert sum(row.summarized for row in get_stats_by_source(session)) == 1
+
+
+def test_cli_export_since_watermark(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    session_factory = seeded_db(_articles(3), summaries=SUMMARIES, path=db_path)
+    watermark = tmp_path / "export.watermark"
+    first = tmp_path / "first.ndjson"
+    export = ["export", "--db", str(db_path), "--watermark-file", str(watermark)]
+
+    assert main([*export, "--out", str(first)]) == 0
+    assert "Exported 3 articles" in capsys.readouterr().out
+    assert len(first.read_text(encoding="utf-8").splitlines()) == 3
+
+    # Push every row before the watermark except one newly summarized article.
+    with session_factory() as session:
+        long_ago = datetime(2020, 1, 1)
+        session.execute(Article.__table__.update().values(created_at=long_ago))
+        session.execute(ArticleSummary.__table__.update().values(summarized_at=long_ago))
+        session.commit()
+        article_id = session.scalar(
+            select(Article.id).where(Article.link == "https://example.com/2")
+        )
+        save_ai_summary(session, article_id, "Later summary.", ["Point"])
+
+    second = tmp_path / "second.csv"
+    assert main([*export, "--out", str(second)]) == 0
+    output = capsys.readouterr().out
+    assert "Exported 1 articles" in output
+    rows = list(iter_import_records(second))
+    assert [row["link"] for row in rows] == ["https://example.com/2"]
+    assert rows[0]["summary_ai"] == "Later summary."
+
+    assert main(["import", "--db", str(tmp_path / "copy.db"), "--in", str(second)]) == 0
+    assert "1 new articles" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pyarrow") is not None, reason="pyarrow installed")
+def test_cli_parquet_without_pyarrow(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    seeded_db(_articles(1), summaries=SUMMARIES, path=db_path)
+    out = tmp_path / "export.parquet"
+    assert main(["export", "--db", str(db_path), "--out", str(out)]) == 1
+    assert "pip install" in capsys.readouterr().out
+    assert not out.exists()
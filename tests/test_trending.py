@@ -0,0 +1,81 @@
+from datetime import date
+import json
+
+from sqlalchemy import select
+
+from robotics_ai_digest.cli import main
+from robotics_ai_digest.storage.models import DailyTermCount
+from robotics_ai_digest.storage.trending import (
+    extract_terms,
+    get_trending_terms,
+    rebuild_trending,
+)
+
+
+BASELINE = [
+    {
+        "title": f"Gripper benchmark {day}",
+        "link": f"https://example.com/gripper-{day}",
+        "published": f"2025-02-{day:02d}T09:00:00+00:00",
+        "source": "Feed A",
+    }
+    for day in range(3, 11)
+]
+RISING = [
+    {
+        "title": f"Humanoid {verb}",
+        "link": f"https://example.com/humanoid-{verb}",
+        "published": "2025-02-10T12:00:00+00:00",
+        "summary": "Trained with a diffusion policy." if verb in ("walks", "runs") else None,
+        "source": "Feed B",
+    }
+    for verb in ("walks", "runs", "jumps", "dances")
+]
+
+
+def test_extract_terms_keeps_words_acronyms_and_adjacent_pairs():
+    terms = extract_terms("Diffusion Policy for humanoid robots via VLA", "AI in 2025")
+
+    assert {"diffusion", "policy", "diffusion policy", "humanoid robots", "vla", "ai"} <= terms
+    assert not {"for", "via", "2025", "policy for", "in"} & terms
+
+
+def test_trending_terms_rank_rising_topics_from_ingest_time_counts(seeded_db):
+    session_factory = seeded_db(BASELINE, RISING)
+
+    with session_factory() as session:
+        terms = get_trending_terms(session, date(2025, 2, 10), limit=20)
+        counts = {term.term: term.count for term in terms}
+        assert terms[0].term == "humanoid"
+        assert counts["humanoid"] == 4
+        assert counts["diffusion policy"] == 2
+        # Single mentions are noise, and one gripper article a day is its usual rate.
+        assert "walks" not in counts
+        assert "gripper" not in counts
+
+        snapshot = select(DailyTermCount.day, DailyTermCount.term, DailyTermCount.count)
+        snapshot = snapshot.order_by(DailyTermCount.day, DailyTermCount.term)
+        incremental = list(session.execute(snapshot))
+        rebuild_trending(session)
+        assert list(session.execute(snapshot)) == incremental
+
+
+def test_digest_trending_section_is_opt_in(tmp_path, seeded_db, capsys):
+    db_path = tmp_path / "digest.db"
+    out_dir = tmp_path / "out"
+    seeded_db(BASELINE, RISING, path=db_path)
+    args = ["digest", "--db", str(db_path), "--date", "2025-02-10", "--out", str(out_dir)]
+
+    assert main([*args, "--trending", "3", "--format", "md,json"]) == 0
+    markdown = (out_dir / "digest_2025-02-10.md").read_text(encoding="utf-8")
+    assert "## Trending\n\n- " in markdown
+    assert "- humanoid: 4 articles (+4)" in markdown
+    assert markdown.index("## Trending") < markdown.index("## Feed B")
+    feed = json.loads((out_dir / "digest_2025-02-10.json").read_text(encoding="utf-8"))
+    assert [term["term"] for term in feed["_trending"]["terms"]][:1] == ["humanoid"]
+
+    assert main([*args, "--force"]) == 0
+    assert "## Trending" not in (out_dir / "digest_2025-02-10.md").read_text(encoding="utf-8")
+
+    assert main(["trending", "--db", str(db_path), "--date", "2025-02-10", "--limit", "2"]) == 0
+    assert "Trending 2025-02-10..2025-02-10: 2 terms" in capsys.readouterr().out